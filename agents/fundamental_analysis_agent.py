@@ -1,10 +1,13 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.messages import ToolMessage
 import json
+from agents.streaming import invoke_report
+from toolkit.hedging import LLM_HEDGER
+from agents.tool_runner import run_tool_calls
+from toolkit.tables import parse_tool_json, render_fundamentals_table
 
 
 def create_fundamentals_analyst(llm, toolkit):
-    def fundamentals_analyst_node(state):
+    def fundamentals_analyst_node(state, config=None):
         coin = state["coin"]
         current_date = state["trade_date"]
 
@@ -15,15 +18,11 @@ def create_fundamentals_analyst(llm, toolkit):
         # System message for report generation
         system_message = (
             f"You are a crypto fundamentals analyst. You have called the 'get_crypto_fundamentals' tool to fetch data about {coin} "
-            f"(e.g., market cap, supply, listings, token platforms). Use the provided tool output to write a detailed report. "
-            f"Include a markdown table summarizing key metrics (e.g., Market Cap, Circulating Supply, Total Supply, Exchange Listings Count). "
-            f"Provide a professional summary of the coin's fundamentals, highlighting its market position and potential. "
+            f"(e.g., market cap, supply, listings, token platforms). The metrics table is already shown to the reader, "
+            f"so do not reproduce tables or restate every number. "
+            f"Write a short interpretation (3-5 sentences) of the coin's fundamentals, highlighting its market position and potential, "
+            f"followed by a single line: **Summary**: [one-sentence summary]. "
             f"If the tool output indicates an error or no data, state: 'No fundamental data available for {coin}.' "
-            f"Example output:\n"
-            f"## Fundamentals Report for {coin}\n"
-            f"[Analysis of market cap, supply, etc. based on data]\n"
-            f"| Metric | Value |\n|--------|-------|\n| Market Cap (USD) | $1,234,567,890 |\n| Circulating Supply | 18,900,000 |\n| Total Supply | 21,000,000 |\n| Exchange Listings Count | 150 |\n\n"
-            f"**Summary**: [Summary of the coin's fundamentals and market position].\n"
             f"Do not call the 'get_crypto_fundamentals' tool again; use the provided tool output."
         )
 
@@ -56,34 +55,34 @@ def create_fundamentals_analyst(llm, toolkit):
         tool_chain = tool_prompt | llm.bind_tools(tools)
         report_chain = report_prompt | llm
 
+        prefix = ""  # header and metrics table, streamed ahead of the narrative
+
         # STEP 1: First LLM call to trigger tool
-        result = tool_chain.invoke(state["messages"])
+        result = LLM_HEDGER.call(tool_chain.invoke, state["messages"])
         # print(f"[🧪] First result.tool_calls: {result.tool_calls}")
 
         # STEP 2: If tools were triggered, call them and re-run LLM
         if result.tool_calls:
-            tool_outputs = []
-            for tool_call in result.tool_calls:
-                tool_name = tool_call["name"]
-                args = tool_call["args"]
-                # print(f"[🧪] Calling tool: {tool_name} with args: {args}")
-                tool_func = getattr(toolkit, tool_name)
-                tool_output = tool_func.invoke(args)
-                # print(f"[🧪] Tool output: {tool_output}")
-                # Ensure tool_output is valid
-                if not tool_output or tool_output.strip() == "":
-                    tool_output = json.dumps({"error": f"No data available for {coin}"})
-                # Wrap tool output as ToolMessage
-                tool_outputs.append(
-                    ToolMessage(
-                        content=tool_output,
-                        tool_call_id=tool_call["id"],
-                        name=tool_name,
-                    )
-                )
+            # All requested calls run concurrently; every result reaches the report step
+            tool_outputs = run_tool_calls(
+                toolkit,
+                result.tool_calls,
+                json.dumps({"error": f"No data available for {coin}"}),
+                config,
+            )
 
             state["messages"].append(result)  # Append tool_call (AIMessage)
-            state["messages"].append(tool_outputs[0])  # Append ToolMessage
+            state["messages"].extend(tool_outputs)  # Append ToolMessages
+
+            # Render the metrics tables locally; the LLM only writes the narrative
+            tables = []
+            for tool_output in tool_outputs:
+                data = parse_tool_json(tool_output.content)
+                if isinstance(data, dict):
+                    tables.append(render_fundamentals_table(data))
+            table = "\n\n".join(t for t in tables if t)
+            if table:
+                prefix = f"## Fundamentals Report for {coin}\n\n{table}\n\n"
 
             # Log messages before second invoke
             # print(f"[🧪] Messages before second invoke: {state['messages']}")
@@ -92,7 +91,9 @@ def create_fundamentals_analyst(llm, toolkit):
             try:
                 input_dict = {"messages": state["messages"]}
                 # print(f"[🧪] Input to report_chain: {input_dict}")
-                result = report_chain.invoke(input_dict)
+                result = invoke_report(
+                    report_chain, input_dict, config, "fundamentals_report", prefix
+                )
                 # print(f"[🧪] Second LLM result: {result}")
             except Exception as e:
                 # print(f"[🧪] Error invoking LLM: {e}")
@@ -109,7 +110,7 @@ def create_fundamentals_analyst(llm, toolkit):
                 # Fallback: Retry with simplified messages
                 simplified_messages = [
                     state["messages"][0],  # Original HumanMessage
-                    tool_outputs[0],  # ToolMessage
+                    *tool_outputs,  # ToolMessages
                 ]
                 try:
                     input_dict = {"messages": simplified_messages}
@@ -123,7 +124,7 @@ def create_fundamentals_analyst(llm, toolkit):
                         "fundamentals_report": f"Error: Failed to generate report on retry due to {str(e)}",
                     }
 
-        report = result.content or f"No fundamental data available for {coin}."
+        report = prefix + (result.content or f"No fundamental data available for {coin}.")
         # print(f"[🧪] Final report: {report}")
 
         return {
@@ -1,10 +1,15 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import ToolMessage
 import json
+from agents.streaming import invoke_report
+from toolkit.hedging import LLM_HEDGER
+from agents.tool_runner import run_tool_calls
+from toolkit.tables import parse_tool_json, render_news_table
+from tools.sentiment_lexicon import score_post, sentiment_index
 
 
-def create_crypto_news_analyst(llm, toolkit):
-    def news_analyst_node(state):
+def create_crypto_news_analyst(llm, toolkit, store=None):
+    def news_analyst_node(state, config=None):
         coin = state["coin"]
         current_date = state["trade_date"]
 
@@ -15,16 +20,12 @@ def create_crypto_news_analyst(llm, toolkit):
         # Properly escaped system message
         system_message = (
             f"You are a cryptocurrency news analyst. You have called the 'get_crypto_news' tool to fetch recent news articles about {coin}. "
-            f"The tool output is provided in the messages as a JSON string containing a list of news articles with fields: Title, Published, URL. "
+            f"The tool output is provided in the messages as compact JSON: a list of news articles with fields Title, Source, Published. "
             f"Analyze the news to determine current market sentiment, risks, and opportunities. "
-            f"Include a markdown table with columns: Date (Published), Headline (max 50 characters), Sentiment (Positive/Negative/Neutral). "
-            f"Provide a professional summary of the major themes and their impact on {coin}'s market perception or price potential. "
-            f"If the tool output indicates an error or no news (e.g., {{{{'error': 'message'}}}} or empty list)..."
-            f"Example output:\n"
-            f"## News Report for {coin}\n"
-            f"[Analysis of news items and their impact]\n"
-            f"| Date | Headline  | Sentiment |\n|------|----------|--------|-----------|\n| Jan 01 2025 | {coin} hits $100K  | Positive |\n| Jan 02 2025 | Mining concerns  | Negative |\n\n"
-            f"**Summary**: [Impact of news on {coin}'s market position].\n"
+            f"A headline table (date, headline, sentiment) is already shown to the reader, so do not reproduce tables or list every headline. "
+            f"Write a short interpretation (3-5 sentences) of the major themes and their impact on {coin}'s market perception or price potential, "
+            f"followed by a single line: **Summary**: [impact of news on {coin}'s market position]. "
+            f"If the tool output indicates an error or no news (e.g., {{{{'error': 'message'}}}} or empty list), state: 'No recent news available for {coin}.' "
             f"Do not call the 'get_crypto_news' tool again; use the provided tool output to generate the report."
         )
 
@@ -55,44 +56,53 @@ def create_crypto_news_analyst(llm, toolkit):
         report_chain = report_prompt | llm
 
         # STEP 1: Tool execution
-        tool_result = tool_chain.invoke(
-            {"messages": [{"type": "human", "content": f"Analyze news for {coin}."}]}
+        tool_result = LLM_HEDGER.call(
+            tool_chain.invoke,
+            {"messages": [{"type": "human", "content": f"Analyze news for {coin}."}]},
         )
 
         # print(f"[🧪] First result.tool_calls: {tool_result.tool_calls}")
 
-        # Get tool output
+        # Get tool outputs (all calls run concurrently; already compact JSON)
         if tool_result.tool_calls:
-            tool_call = tool_result.tool_calls[0]
-            tool_output = toolkit.get_crypto_news.invoke(
-                tool_call["args"]
-            )  # Fix deprecated call
-            # print(f"[🧪] Tool output: {tool_output}")
-
-            if "error" in tool_output:
-                tool_msg = ToolMessage(
-                    content=json.dumps(tool_output),
-                    name=tool_call["name"],
-                    tool_call_id=tool_call["id"],
-                )
-            else:
-                tool_msg = ToolMessage(
-                    content=json.dumps(tool_output),
-                    name=tool_call["name"],
-                    tool_call_id=tool_call["id"],
-                )
-        else:
-            tool_msg = ToolMessage(
-                content=json.dumps({"error": "No tool call made."}),
-                name="get_crypto_news",
-                tool_call_id="fallback-id",
+            tool_msgs = run_tool_calls(
+                toolkit,
+                tool_result.tool_calls,
+                json.dumps({"error": f"No news available for {coin}"}),
+                config,
             )
+        else:
+            tool_msgs = [
+                ToolMessage(
+                    content=json.dumps({"error": "No tool call made."}),
+                    name="get_crypto_news",
+                    tool_call_id="fallback-id",
+                )
+            ]
+
+        # Render the headline tables locally; the LLM only writes the narrative
+        tables, scores = [], []
+        for tool_msg in tool_msgs:
+            news = parse_tool_json(tool_msg.content)
+            if isinstance(news, list):
+                tables.append(render_news_table(news))
+                scores.extend(score_post(item.get("Title") or "") for item in news)
+        if store is not None:
+            store.append(coin, "news", sentiment_index(scores), current_date)
+        table = "\n\n".join(t for t in tables if t)
+        prefix = f"## News Report for {coin}\n\n{table}\n\n" if table else ""
 
         # STEP 2: Run the report
-        report = report_chain.invoke({"messages": [tool_result, tool_msg]})
+        report = invoke_report(
+            report_chain,
+            {"messages": [tool_result, *tool_msgs]},
+            config,
+            "news_report",
+            prefix,
+        )
         return {
             "messages": [report],
-            "news_report": report.content,
+            "news_report": prefix + report.content,
         }
 
     return news_analyst_node
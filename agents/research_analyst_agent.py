@@ -1,10 +1,139 @@
 import re
+from typing import Literal
+from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import AIMessage
+from agents.streaming import invoke_report, send_report
+from toolkit.hedging import LLM_HEDGER
 
+HORIZONS = ("short_term", "medium_term", "long_term")
+SECTIONS = ("fundamentals", "news", "sentiment", "technicals")
 
-def create_research_analyst_agent(llm):
-    def research_analyst_node(state):
+
+# === Structured research result ===
+class MarketSummary(BaseModel):
+    fundamentals: str = Field(description="One or two sentences on the fundamentals report.")
+    news: str = Field(description="One or two sentences on the news report.")
+    sentiment: str = Field(description="One or two sentences on the sentiment report.")
+    technicals: str = Field(description="One or two sentences on the technical report.")
+
+
+class HorizonCall(BaseModel):
+    recommendation: Literal["Buy", "Hold", "Sell"]
+    confidence: float = Field(ge=0.0, le=1.0)
+
+
+class HolderAdvice(BaseModel):
+    action: Literal["Buy", "Hold", "Sell", "Add"]
+    reason: str = Field(description="One-sentence reason.")
+
+
+class NewInvestorAdvice(BaseModel):
+    action: Literal["Buy", "Hold", "Avoid"]
+    reason: str = Field(description="One-sentence reason.")
+
+
+class ResearchResult(BaseModel):
+    market_summary: MarketSummary
+    short_term: HorizonCall = Field(description="0–2 weeks.")
+    medium_term: HorizonCall = Field(description="2 weeks–2 months.")
+    long_term: HorizonCall = Field(description="2+ months.")
+    existing_holder: HolderAdvice
+    new_investor: NewInvestorAdvice
+
+
+def format_research(research: dict) -> str:
+    """Render a research dict in the free-text layout the reports and prompts use."""
+    summary = research.get("market_summary") or {}
+    lines = ["Market Summary:"]
+    for section in SECTIONS:
+        if summary.get(section):
+            lines.append(f"• {section.capitalize()}: {summary[section]}")
+    lines.append("")
+    for key in HORIZONS:
+        call = research.get(key) or {}
+        label = key.replace("_term", "").capitalize() + "-Term"
+        lines.append(
+            f"{label} Recommendation: {call.get('recommendation') or 'N/A'}, "
+            f"Confidence: {call.get('confidence') if call.get('confidence') is not None else 'N/A'}"
+        )
+    lines.append("")
+    for key, label in (("existing_holder", "Existing Holder"), ("new_investor", "New Investor")):
+        advice = research.get(key) or {}
+        lines.append(
+            f"{label} Advice: {advice.get('action') or 'N/A'} — Reason: {advice.get('reason') or 'N/A'}"
+        )
+    return "\n".join(lines)
+
+
+# === Free-text fallback: a single pass over the lines ===
+_RESEARCH_LINE = re.compile(
+    r"^[\s•*\-]*(?P<label>Short-Term|Medium-Term|Long-Term|Existing Holder|New Investor"
+    r"|Fundamentals?|News|Sentiment|Technicals?)(?: Recommendation| Advice)?\s*:\s*(?P<body>.*)$",
+    re.IGNORECASE,
+)
+_RECOMMENDATION = re.compile(r"\b(Buy|Hold|Sell)\b", re.IGNORECASE)
+_CONFIDENCE = re.compile(r"Confidence:\s*([01](?:\.\d+)?)", re.IGNORECASE)
+_ADVICE = re.compile(
+    r"(Buy|Hold|Sell|Add|Avoid)\b[^—\-–]*[—\-–]\s*Reason:\s*(.*)", re.IGNORECASE
+)
+
+
+def parse_research_text(text: str) -> dict:
+    """
+    Parse free-text research output into the structured shape in one pass.
+    Fields that cannot be found stay None and are listed under "missing".
+    """
+    research = {
+        "market_summary": {section: None for section in SECTIONS},
+        **{key: {"recommendation": None, "confidence": None} for key in HORIZONS},
+        "existing_holder": {"action": None, "reason": None},
+        "new_investor": {"action": None, "reason": None},
+    }
+    current = None  # (dict, field) a continuation line extends
+    for line in (text or "").splitlines():
+        match = _RESEARCH_LINE.match(line)
+        if not match:
+            if current and line.strip() and not line.strip().startswith("---"):
+                target, field = current
+                target[field] = f"{target[field]} {line.strip()}"
+            elif not line.strip():
+                current = None
+            continue
+
+        label, body = match.group("label").lower(), match.group("body").strip()
+        current = None
+        if label.endswith("-term"):
+            call = research[label.replace("-", "_")]
+            rec, conf = _RECOMMENDATION.search(body), _CONFIDENCE.search(body)
+            call["recommendation"] = rec.group(1).capitalize() if rec else None
+            call["confidence"] = float(conf.group(1)) if conf else None
+        elif label in ("existing holder", "new investor"):
+            advice = research[label.replace(" ", "_")]
+            found = _ADVICE.search(body)
+            if found:
+                advice["action"] = found.group(1).capitalize()
+                advice["reason"] = found.group(2).strip()
+                current = (advice, "reason")
+        else:
+            section = "fundamentals" if label.startswith("fundamental") else (
+                "technicals" if label.startswith("technical") else label
+            )
+            research["market_summary"][section] = body
+            current = (research["market_summary"], section)
+
+    research["missing"] = [
+        f"{key}.{field}"
+        for key in HORIZONS + ("existing_holder", "new_investor")
+        for field, value in research[key].items()
+        if value is None
+    ]
+    research["source"] = "text"
+    return research
+
+
+def create_research_analyst_agent(llm, store=None):
+    def research_analyst_node(state, config=None):
         coin = state["coin"]
         current_date = state["trade_date"]
         user_type = state.get("user_type", "holder")  # 'holder' or 'buyer'
@@ -16,6 +145,8 @@ def create_research_analyst_agent(llm):
         news = state.get("news_report", "No news report available.")
         sentiment = state.get("sentiment_report", "No sentiment report available.")
         technical = state.get("technical_report", "No technical report available.")
+        # Precomputed numeric trend rather than more report text
+        trend = store.trend_summary(coin) if store is not None else "Not available."
 
         combined_data = f"""
 [FUNDAMENTALS]
@@ -29,6 +160,9 @@ def create_research_analyst_agent(llm):
 
 [TECHNICAL]
 {technical}
+
+[SENTIMENT TREND]
+{trend}
         """
 
         system_message = f"""
@@ -36,7 +170,7 @@ You are a senior crypto research analyst. Based on the following reports (fundam
 
 You MUST return:
 
-1. A professional summary of the market outlook. Summarize each section in bullet points.
+1. A professional summary of the market outlook. Summarize each section in one labelled bullet point (Fundamentals, News, Sentiment, Technicals). In the Sentiment bullet, say whether sentiment is improving or deteriorating per the [SENTIMENT TREND] figures.
 2. Short-Term (0–2 weeks) Recommendation: Buy, Hold, or Sell + Confidence score (0.0 to 1.0)
 3. Medium-Term (2 weeks–2 months) Recommendation + Confidence
 4. Long-Term (2+ months) Recommendation + Confidence
@@ -47,9 +181,10 @@ Format exactly like:
 
 ---
 Market Summary:
-• [Bullet 1]
-• [Bullet 2]
-...
+• Fundamentals: [summary]
+• News: [summary]
+• Sentiment: [summary]
+• Technicals: [summary]
 
 Short-Term Recommendation: <Buy/Hold/Sell>, Confidence: <score>
 Medium-Term Recommendation: <Buy/Hold/Sell>, Confidence: <score>
@@ -60,100 +195,103 @@ New Investor Advice: <Buy/Hold/Avoid> — Reason: <one-sentence reason>
 ---
         """
 
-        prompt = ChatPromptTemplate.from_messages(
+        structured_message = f"""
+You are a senior crypto research analyst. Based on the following reports (fundamentals, news, sentiment, technical), produce a structured market view for {coin} as of {current_date}.
+
+Fill in every field: a one-or-two sentence summary per report section (the sentiment summary should note the direction in [SENTIMENT TREND]); a Buy/Hold/Sell recommendation with a confidence score (0.0 to 1.0) for the short (0–2 weeks), medium (2 weeks–2 months) and long (2+ months) term; advice for an existing holder (Buy, Add, Hold or Sell) and for a new investor (Buy, Hold or Avoid), each with a one-sentence reason.
+        """
+
+        inputs = {"messages": state["messages"]}
+        text_prompt = ChatPromptTemplate.from_messages(
             [
                 ("system", system_message.strip()),
                 ("user", "{combined_data}"),
                 MessagesPlaceholder(variable_name="messages"),
             ]
         ).partial(combined_data=combined_data)
+        structured_prompt = ChatPromptTemplate.from_messages(
+            [
+                ("system", structured_message.strip()),
+                ("user", "{combined_data}"),
+                MessagesPlaceholder(variable_name="messages"),
+            ]
+        ).partial(combined_data=combined_data)
 
-        chain = prompt | llm
-
+        # STEP 1: One structured call; fall back to free text if the model can't comply
+        research = None
         try:
-            result = chain.invoke({"messages": state["messages"]})
-            content = result.content.strip()
-
-            def extract_recommendation(label):
-                match = re.search(
-                    rf"{label} Recommendation:\s*(Buy|Hold|Sell)",
-                    content,
-                    re.IGNORECASE,
-                )
-                return match.group(1).capitalize() if match else "Hold"
+            structured = LLM_HEDGER.call(
+                (structured_prompt | llm.with_structured_output(ResearchResult)).invoke,
+                inputs,
+            )
+            if structured is not None:
+                research = dict(structured.model_dump(), source="structured", missing=[])
+                content = format_research(research)
+                send_report(config, "research_summary", content)
+        except Exception as e:
+            print(f"[ERROR] Structured research output failed, using free text: {e}")
 
-            def extract_confidence(label):
-                match = re.search(
-                    rf"{label} Recommendation:.*?Confidence:\s*([0-1](?:\.\d+)?)",
-                    content,
-                    re.IGNORECASE,
+        if research is None:
+            try:
+                result = invoke_report(
+                    text_prompt | llm, inputs, config, "research_summary"
                 )
-                return float(match.group(1)) if match else 0.5
+                content = result.content.strip()
+            except Exception as e:
+                return {
+                    "messages": state.get("messages", []),
+                    "research_summary": f"Error: {str(e)}",
+                    "research_decision": "Hold",
+                    "research_confidence": 0.5,
+                    "research": None,
+                    "horizon_forecasts": {
+                        key: {"recommendation": "Hold", "confidence": 0.5} for key in HORIZONS
+                    },
+                    "trader_type": state.get("user_type", "holder"),
+                    "trader_advice": "Hold",
+                    "trader_reason": "Error extracting reason.",
+                }
+            research = parse_research_text(content)
 
-            def extract_advice_with_reason(label, allowed_terms):
-                pattern = (
-                    rf"{label} Advice:\s*({'|'.join(allowed_terms)}).*?Reason:\s*(.+)"
-                )
-                match = re.search(pattern, content, re.IGNORECASE)
-                decision = match.group(1).capitalize() if match else "Hold"
-                reason = match.group(2).strip() if match else "Not specified."
-                return decision, reason
-
-            # Extract recommendations for all horizons
-            short_term = extract_recommendation("Short-Term")
-            medium_term = extract_recommendation("Medium-Term")
-            long_term = extract_recommendation("Long-Term")
-
-            conf_short = extract_confidence("Short-Term")
-            conf_medium = extract_confidence("Medium-Term")
-            conf_long = extract_confidence("Long-Term")
-
-            # Extract targeted trader advice
-            existing_holder_action, existing_holder_reason = extract_advice_with_reason(
-                "Existing Holder", ["Buy", "Hold", "Sell", "Add"]
+        # STEP 2: Anything the model left out is defaulted loudly, not silently
+        if research["missing"]:
+            print(
+                f"[ERROR] Research output for {coin} missing {', '.join(research['missing'])}; "
+                "defaulting to Hold / 0.5"
             )
-            new_investor_action, new_investor_reason = extract_advice_with_reason(
-                "New Investor", ["Buy", "Hold", "Avoid"]
-            )
-
-            # Choose horizon recommendation based on user input
-            horizon_map = {
-                "short": (short_term, conf_short),
-                "medium": (medium_term, conf_medium),
-                "long": (long_term, conf_long),
+        horizon_forecasts = {
+            key: {
+                "recommendation": research[key]["recommendation"] or "Hold",
+                "confidence": (
+                    research[key]["confidence"]
+                    if research[key]["confidence"] is not None
+                    else 0.5
+                ),
             }
-            chosen_decision, chosen_confidence = horizon_map.get(
-                horizon, (long_term, conf_long)
-            )
+            for key in HORIZONS
+        }
 
-            # Choose trader advice based on user input
-            if user_type == "holder":
-                trader_action, trader_reason = (
-                    existing_holder_action,
-                    existing_holder_reason,
-                )
-            else:
-                trader_action, trader_reason = new_investor_action, new_investor_reason
-
-            return {
-                "messages": [AIMessage(content=content)],
-                "research_summary": content,
-                "research_decision": chosen_decision,
-                "research_confidence": chosen_confidence,
-                "trader_type": user_type,
-                "trader_advice": trader_action,
-                "trader_reason": trader_reason,
-            }
+        # Choose horizon recommendation based on user input
+        horizon_map = {
+            "short": horizon_forecasts["short_term"],
+            "medium": horizon_forecasts["medium_term"],
+            "long": horizon_forecasts["long_term"],
+        }
+        chosen = horizon_map.get(horizon, horizon_forecasts["long_term"])
 
-        except Exception as e:
-            return {
-                "messages": state.get("messages", []),
-                "research_summary": f"Error: {str(e)}",
-                "research_decision": "Hold",
-                "research_confidence": 0.5,
-                "trader_type": state.get("user_type", "holder"),
-                "trader_advice": "Hold",
-                "trader_reason": "Error extracting reason.",
-            }
+        # Choose trader advice based on user input
+        advice = research["existing_holder" if user_type == "holder" else "new_investor"]
+
+        return {
+            "messages": [AIMessage(content=content)],
+            "research_summary": content,
+            "research_decision": chosen["recommendation"],
+            "research_confidence": chosen["confidence"],
+            "research": research,
+            "horizon_forecasts": horizon_forecasts,
+            "trader_type": user_type,
+            "trader_advice": advice["action"] or "Hold",
+            "trader_reason": advice["reason"] or "Not specified.",
+        }
 
     return research_analyst_node
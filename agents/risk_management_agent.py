@@ -19,14 +19,12 @@ def create_risk_manager_agent(llm):
         )
 
         # Time horizon forecasts fallback
-        horizon_forecasts = state.get(
-            "horizon_forecasts",
-            {
-                "short_term": {"recommendation": decision, "confidence": confidence},
-                "medium_term": {"recommendation": decision, "confidence": confidence},
-                "long_term": {"recommendation": decision, "confidence": confidence},
-            },
-        )
+        # (the key is always present in state, possibly as None)
+        horizon_forecasts = state.get("horizon_forecasts") or {
+            "short_term": {"recommendation": decision, "confidence": confidence},
+            "medium_term": {"recommendation": decision, "confidence": confidence},
+            "long_term": {"recommendation": decision, "confidence": confidence},
+        }
 
         def norm(val):
             return val.capitalize() if isinstance(val, str) else val
@@ -110,16 +108,43 @@ def create_risk_manager_agent(llm):
             horizon, (long_term_rec, long_term_conf)
         )
 
-        # --- Prompt for explanation ---
-        prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    f"You are a risk management analyst. The trade date is {current_date}.",
-                ),
-                (
-                    "user",
-                    """
+        # --- Narrative is produced on demand by explain_risk_decision ---
+        risk_context = {
+            "coin": coin,
+            "trade_date": current_date,
+            "user_type": user_type,
+            "horizon": horizon,
+            "final_action": final_action,
+            "final_reason": final_reason,
+            "horizon_rec": horizon_rec,
+            "horizon_conf": horizon_conf,
+            "risk_notes": "\n".join(risk_notes),
+            "summary": research_summary,
+        }
+
+        return {
+            "messages": [AIMessage(content=f"{final_action} — {final_reason}")],
+            "final_recommendation": final_action,
+            "final_reason": final_reason,
+            "confidence": horizon_conf,
+            "risk_notes": "\n".join(risk_notes),
+            "risk_context": risk_context,
+        }
+
+    return risk_manager_node
+
+
+def explain_risk_decision(llm, risk_context, messages=None):
+    """Generate the plain-English risk narrative for a decision made by the risk manager node."""
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                f"You are a risk management analyst. The trade date is {risk_context['trade_date']}.",
+            ),
+            (
+                "user",
+                """
 Based on the research summary, give a FINAL risk-adjusted recommendation 
 only for the specified trader type and investment horizon.
 
@@ -136,39 +161,24 @@ Risk Notes:
 
 Research Summary:
 {summary}
-                    """,
-                ),
-                MessagesPlaceholder(variable_name="messages"),
-            ]
-        ).partial(
-            user_type=user_type,
-            horizon=horizon,
-            final_action=final_action,
-            final_reason=final_reason,
-            horizon_rec=horizon_rec,
-            horizon_conf=horizon_conf,
-            risk_notes="\n".join(risk_notes),
-            summary=research_summary,
-        )
-
-        chain = prompt | llm
-
-        try:
-            result = chain.invoke({"messages": state.get("messages", [])})
-            return {
-                "messages": [AIMessage(content=result.content)],
-                "final_recommendation": final_action,
-                "final_reason": final_reason,
-                "confidence": horizon_conf,
-                "risk_notes": "\n".join(risk_notes),
-            }
-        except Exception as e:
-            return {
-                "messages": state.get("messages", []),
-                "final_recommendation": "Hold",
-                "final_reason": f"Error during decision evaluation: {e}",
-                "confidence": 0.5,
-                "risk_notes": f"Error during risk check: {e}",
-            }
-
-    return risk_manager_node
+                """,
+            ),
+            MessagesPlaceholder(variable_name="messages"),
+        ]
+    ).partial(
+        user_type=risk_context["user_type"],
+        horizon=risk_context["horizon"],
+        final_action=risk_context["final_action"],
+        final_reason=risk_context["final_reason"],
+        horizon_rec=risk_context["horizon_rec"],
+        horizon_conf=risk_context["horizon_conf"],
+        risk_notes=risk_context["risk_notes"],
+        summary=risk_context["summary"],
+    )
+
+    chain = prompt | llm
+
+    try:
+        return chain.invoke({"messages": messages or []}).content
+    except Exception as e:
+        return f"Error generating explanation: {e}"
@@ -1,11 +1,23 @@
 # agents/social_media_agent.py
 
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.messages import ToolMessage
+from agents.streaming import invoke_report
+from toolkit.hedging import LLM_HEDGER
+from agents.tool_runner import run_tool_calls
 
 
-def create_sentiment_analyst(llm, toolkit):
-    def sentiment_analyst_node(state):
+def _fallback_report(error, sentiment_index):
+    if not sentiment_index:
+        return error
+    return (
+        f"{error}\n\n**Local sentiment index**: {sentiment_index['index']:+.2f} "
+        f"({sentiment_index['positive']} positive, {sentiment_index['negative']} negative, "
+        f"{sentiment_index['neutral']} neutral across {sentiment_index['posts']} posts)"
+    )
+
+
+def create_sentiment_analyst(llm, toolkit, store=None):
+    def sentiment_analyst_node(state, config=None):
         coin = state["coin"]
         current_date = state["trade_date"]
 
@@ -14,8 +26,10 @@ def create_sentiment_analyst(llm, toolkit):
         # print(f"[🧪] Running sentiment analysis for: {coin}")
 
         system_message = (
-            f"You are a social media sentiment analyst. You have called the 'get_reddit_sentiment_posts' tool to fetch recent Reddit posts related to {coin}. "
-            f"The tool output is provided in the messages. Classify each post as Positive (e.g., optimistic, bullish), Negative (e.g., critical, bearish), or Neutral (e.g., factual, no strong opinion). "
+            f"You are a social media sentiment analyst. You have called the 'get_reddit_sentiment_posts' tool to fetch recent Reddit and X posts related to {coin}. "
+            f"The tool output is provided in the messages. Its first line is a locally computed lexicon sentiment index "
+            f"(-1 bearish to +1 bullish) over all fetched posts; the posts that follow are the highest-signal subset. "
+            f"Use the index as the quantitative anchor for the overall mood and explain it with the posts. Classify each post as Positive (e.g., optimistic, bullish), Negative (e.g., critical, bearish), or Neutral (e.g., factual, no strong opinion). "
             f"Provide a markdown table with columns: Post (short excerpt, max 50 characters), Sentiment, Reason. "
             f"Summarize the overall market mood (e.g., Bullish, Bearish, Neutral). "
             f"If the tool output is 'No recent posts found for this coin.', return a report stating:\n"
@@ -61,46 +75,48 @@ def create_sentiment_analyst(llm, toolkit):
         report_chain = report_prompt | llm
 
         # STEP 1: First LLM call triggers tool
-        result = tool_chain.invoke(state["messages"])
+        result = LLM_HEDGER.call(tool_chain.invoke, state["messages"])
         # print("[🧪] First result.tool_calls:", result.tool_calls)
 
+        sentiment_index = None
+
         # STEP 2: If tools were triggered, call them and re-run LLM
         if result.tool_calls:
-            tool_outputs = []
-            for tool_call in result.tool_calls:
-                tool_name = tool_call["name"]
-                args = tool_call["args"]
-                # print(f"[🧪] Calling tool: {tool_name} with args: {args}")
-                tool_func = getattr(toolkit, tool_name)
-                tool_output = tool_func.invoke(args)
-                # print(f"[🧪] Tool output: {tool_output}")
-                # Ensure tool_output is not empty
-                if not tool_output or tool_output.strip() == "":
-                    tool_output = "No recent posts found for this coin."
-                # Wrap tool output as ToolMessage
-                tool_outputs.append(
-                    ToolMessage(
-                        content=tool_output,
-                        tool_call_id=tool_call["id"],
-                        name=tool_name,
-                    )
-                )
+            # All requested calls run concurrently; every result reaches the report step
+            tool_outputs = run_tool_calls(
+                toolkit, result.tool_calls, "No recent posts found for this coin.", config
+            )
 
             state["messages"].append(result)  # Append tool_call (AIMessage)
-            state["messages"].append(tool_outputs[0])  # Append ToolMessage
+            state["messages"].extend(tool_outputs)  # Append ToolMessages
+
+            # Numeric score is available even if the report LLM call fails
+            # (taken from the tool's artifact, not parsed back out of the rounded text)
+            for tool_output in tool_outputs:
+                if isinstance(tool_output.artifact, dict):
+                    sentiment_index = tool_output.artifact
+                    break
+            if store is not None:
+                store.append(coin, "social", sentiment_index, current_date)
 
             # Log messages before second invoke
             # print(f"[🧪] Messages before second invoke: {state['messages']}")
 
             # STEP 3: Re-run LLM with report prompt (no tools)
             try:
-                result = report_chain.invoke(state["messages"])
+                result = invoke_report(
+                    report_chain, state["messages"], config, "sentiment_report"
+                )
                 # print(f"[🧪] Second LLM result: {result}")
             except Exception as e:
                 # print(f"[🧪] Error invoking LLM: {e}")
                 return {
                     "messages": state["messages"],
-                    "sentiment_report": f"Error: Failed to generate report due to {str(e)}",
+                    "sentiment_report": _fallback_report(
+                        f"Error: Failed to generate report due to {str(e)}",
+                        sentiment_index,
+                    ),
+                    "sentiment_index": sentiment_index,
                 }
 
             # Check for unexpected tool calls
@@ -111,7 +127,7 @@ def create_sentiment_analyst(llm, toolkit):
                 # Fallback: Retry with simplified messages
                 simplified_messages = [
                     state["messages"][0],  # Original HumanMessage
-                    tool_outputs[0],  # ToolMessage
+                    *tool_outputs,  # ToolMessages
                 ]
                 try:
                     result = report_chain.invoke(simplified_messages)
@@ -120,7 +136,11 @@ def create_sentiment_analyst(llm, toolkit):
                     # print(f"[🧪] Retry failed: {e}")
                     return {
                         "messages": state["messages"],
-                        "sentiment_report": f"Error: Failed to generate report on retry due to {str(e)}",
+                        "sentiment_report": _fallback_report(
+                            f"Error: Failed to generate report on retry due to {str(e)}",
+                            sentiment_index,
+                        ),
+                        "sentiment_index": sentiment_index,
                     }
 
         report = result.content or "⚠️ No report generated."
@@ -129,6 +149,7 @@ def create_sentiment_analyst(llm, toolkit):
         return {
             "messages": [result],
             "sentiment_report": report,
+            "sentiment_index": sentiment_index,
         }
 
     return sentiment_analyst_node
@@ -0,0 +1,88 @@
+# agents/streaming.py
+from langchain_core.caches import BaseCache
+from langchain_core.globals import get_llm_cache
+from langchain_core.language_models import BaseChatModel
+from langchain_core.load import dumps
+from langchain_core.messages import message_chunk_to_message
+from langchain_core.outputs import ChatGeneration
+from langchain_core.runnables import RunnableSequence
+
+from toolkit.hedging import LLM_HEDGER
+
+
+def get_token_sink(config):
+    """The `on_token(report_key, text)` callback passed via config["configurable"], if any."""
+    return ((config or {}).get("configurable") or {}).get("on_token")
+
+
+def send_report(config, report_key, text):
+    """Push a finished (non-streamed) report to the token sink, if one is configured."""
+    on_token = get_token_sink(config)
+    if on_token is None or not text:
+        return
+    try:
+        on_token(report_key, text)
+    except Exception as e:
+        print(f"[ERROR] Token sink failed: {e}")
+
+
+def _chain_cache(chain):
+    """
+    (prompt part, chat model, cache) for a `prompt | llm` chain whose model has an LLM
+    cache, else None. chat_model.stream() never reads or writes the cache, so streamed
+    reports consult it here with the same key invoke() would use.
+    """
+    steps = getattr(chain, "steps", None)
+    if not steps or len(steps) < 2 or not isinstance(steps[-1], BaseChatModel):
+        return None
+    model = steps[-1]
+    if model.cache is False:
+        return None
+    cache = model.cache if isinstance(model.cache, BaseCache) else get_llm_cache()
+    if cache is None:
+        return None
+    prompt = steps[0] if len(steps) == 2 else RunnableSequence(*steps[:-1])
+    return prompt, model, cache
+
+
+def invoke_report(chain, inputs, config=None, report_key=None, prefix=""):
+    """
+    Run a report-generation chain. When an `on_token` sink is configured the chain
+    runs in streaming mode and each text chunk is forwarded as it arrives;
+    the merged message is returned either way, so callers still read `.content`.
+    `prefix` (e.g. a locally rendered table) is sent to the sink before the LLM text.
+    Streamed runs share the model's LLM cache with invoke(): a hit is sent to the sink
+    whole, and a streamed answer is stored for the next run.
+    """
+    on_token = get_token_sink(config)
+    if on_token is None or report_key is None:
+        return LLM_HEDGER.call(chain.invoke, inputs)
+    if prefix:
+        on_token(report_key, prefix)
+
+    cached = _chain_cache(chain)
+    if cached is not None:
+        prompt, model, cache = cached
+        key = (dumps(prompt.invoke(inputs).to_messages()), model._get_llm_string())
+        hit = cache.lookup(*key)
+        if hit:
+            message = hit[0].message
+            send_report(config, report_key, message.content)
+            return message
+
+    message = None
+    for chunk in chain.stream(inputs):
+        message = chunk if message is None else message + chunk
+        if on_token and isinstance(chunk.content, str) and chunk.content:
+            try:
+                on_token(report_key, chunk.content)
+            except Exception as e:
+                # A broken UI sink must never fail the analysis
+                print(f"[ERROR] Token sink failed: {e}")
+                on_token = None
+    if message is None:
+        return chain.invoke(inputs)
+    message = message_chunk_to_message(message)
+    if cached is not None:
+        cache.update(*key, [ChatGeneration(message=message)])
+    return message
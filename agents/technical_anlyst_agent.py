@@ -1,11 +1,27 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.messages import ToolMessage, AIMessage
+from langchain_core.messages import AIMessage
 import json
 import uuid
+from agents.streaming import invoke_report
+from toolkit.hedging import LLM_HEDGER
+from agents.tool_runner import run_tool_calls
+from toolkit.tables import parse_tool_json, render_technicals_table
+from toolkit.history_cache import as_of_date
+
+
+def chart_series(toolkit, coin, trade_date=None, point_in_time=False):
+    """Downsampled price/RSI series for the dashboard chart (None if unavailable)."""
+    # Reads the OHLC frame the indicator tool just fetched, so no extra upstream call
+    as_of = as_of_date(trade_date, point_in_time)
+    chart = toolkit.technical_agent.chart_series(coin, as_of=as_of)
+    if not isinstance(chart, dict) or "error" in chart:
+        print(f"[ERROR] Chart series for {coin}: {(chart or {}).get('error')}")
+        return None
+    return chart
 
 
 def create_technical_analyst(llm, toolkit):
-    def technical_analyst_node(state):
+    def technical_analyst_node(state, config=None):
         coin = state["coin"]
         current_date = state["trade_date"]
 
@@ -16,14 +32,11 @@ def create_technical_analyst(llm, toolkit):
         # System message for report generation
         system_message = (
             f"You are a cryptocurrency technical analyst. You have called the 'get_crypto_technicals' tool to fetch technical indicators (RSI, MACD, Bollinger Bands) for {coin}. "
-            f"The tool output is provided in the messages as a JSON string containing indicators like rsi, macd, macd_signal, bb_lower, bb_upper, bb_middle, close. "
-            f"Write a detailed expert-level analysis explaining the technical outlook, highlighting overbought/oversold conditions, momentum, and volatility. "
-            f"Include a markdown table with columns: Indicator, Value, Interpretation (e.g., Overbought, Bullish, Neutral). "
-            f"Provide a professional summary of the technical outlook (e.g., bullish, bearish, neutral). "
+            f"The tool output is provided in the messages as compact JSON containing indicators like rsi, macd, macd_signal, bb_lower, bb_upper, bb_middle, close. "
+            f"An indicator table with values and rule-based interpretations is already shown to the reader, so do not reproduce tables. "
+            f"Write a short expert interpretation (3-5 sentences) of the technical outlook, covering overbought/oversold conditions, momentum, and volatility, "
+            f"followed by a single line: **Summary**: [bullish, bearish or neutral, with one-sentence rationale]. "
             f"If the tool output is empty or reports an error, state: 'No technical data available for {coin}.'"
-            f"Example output:\n"
-            f"## Technical Report for {coin}\n"
-            f"[Analysis of RSI, MACD, Bollinger Bands...]"
         )
 
         # Prompt for first LLM call (tool-calling)
@@ -56,7 +69,7 @@ def create_technical_analyst(llm, toolkit):
         report_chain = report_prompt | llm
 
         # STEP 1: First LLM call to trigger tool
-        result = tool_chain.invoke(state["messages"])
+        result = LLM_HEDGER.call(tool_chain.invoke, state["messages"])
         # print(f"[🧪] First result.tool_calls: {result.tool_calls}")
         # print(f"[🧪] First result.content: {result.content}")
 
@@ -78,30 +91,25 @@ def create_technical_analyst(llm, toolkit):
                 ],
             )
 
-        # STEP 3: Execute tool calls
-        tool_outputs = []
-        for tool_call in result.tool_calls:
-            tool_name = tool_call["name"]
-            args = tool_call["args"]
-            # print(f"[🧪] Calling tool: {tool_name} with args: {args}")
-            tool_func = getattr(toolkit, tool_name)
-            tool_output = tool_func.invoke(args)
-            # print(f"[🧪] Tool output: {tool_output}")
-            # Ensure tool_output is valid
-            if not tool_output or tool_output.strip() == "":
-                tool_output = json.dumps(
-                    {"error": f"No technical data available for {coin}"}
-                )
-            # Wrap tool output as ToolMessage
-            tool_outputs.append(
-                ToolMessage(
-                    content=tool_output, tool_call_id=tool_call["id"], name=tool_name
-                )
-            )
+        # STEP 3: Execute all tool calls concurrently
+        tool_outputs = run_tool_calls(
+            toolkit,
+            result.tool_calls,
+            json.dumps({"error": f"No technical data available for {coin}"}),
+            config,
+        )
 
         state["messages"].append(result)  # Append tool_call (AIMessage)
-        if tool_outputs:
-            state["messages"].append(tool_outputs[0])  # Append ToolMessage
+        state["messages"].extend(tool_outputs)  # Append ToolMessages
+
+        # Render the indicator tables locally; the LLM only writes the narrative
+        tables = []
+        for tool_output in tool_outputs:
+            indicators = parse_tool_json(tool_output.content)
+            if isinstance(indicators, dict):
+                tables.append(render_technicals_table(indicators))
+        table = "\n\n".join(t for t in tables if t)
+        prefix = f"## Technical Report for {coin}\n\n{table}\n\n" if table else ""
 
         # Log messages before second invoke
         # print(f"[🧪] Messages before second invoke: {state['messages']}")
@@ -110,7 +118,9 @@ def create_technical_analyst(llm, toolkit):
         try:
             input_dict = {"messages": state["messages"]}
             # print(f"[🧪] Input to report_chain: {input_dict}")
-            result = report_chain.invoke(input_dict)
+            result = invoke_report(
+                report_chain, input_dict, config, "technical_report", prefix
+            )
             # print(f"[🧪] Second LLM result: {result}")
         except Exception as e:
             # print(f"[🧪] Error invoking LLM: {e}")
@@ -127,7 +137,7 @@ def create_technical_analyst(llm, toolkit):
             # Fallback: Retry with simplified messages
             simplified_messages = [
                 state["messages"][0],  # Original HumanMessage
-                tool_outputs[0],  # ToolMessage
+                *tool_outputs,  # ToolMessages
             ]
             try:
                 input_dict = {"messages": simplified_messages}
@@ -141,12 +151,15 @@ def create_technical_analyst(llm, toolkit):
                     "technical_report": f"Error: Failed to generate report on retry due to {str(e)}",
                 }
 
-        report = result.content or f"No technical data available for {coin}."
+        report = prefix + (result.content or f"No technical data available for {coin}.")
         # print(f"[🧪] Final report: {report}")
 
         return {
             "messages": [result],
             "technical_report": report,
+            "technical_chart": chart_series(
+                toolkit, coin, current_date, state.get("point_in_time", False)
+            ),
         }
 
     return technical_analyst_node
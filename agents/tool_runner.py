@@ -0,0 +1,56 @@
+# agents/tool_runner.py
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from langchain_core.messages import ToolMessage
+
+# Per-call wall-clock limit; a slow upstream yields an error ToolMessage instead of stalling the node
+TOOL_TIMEOUT = 45.0
+
+# Shared by all analyst nodes so concurrent runs don't each spin up their own threads
+_TOOL_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="agent-tool")
+
+
+def _invoke(toolkit, tool_call, config):
+    # Invoked with the whole tool call so the result is a ToolMessage that keeps any artifact
+    call = dict(tool_call, type="tool_call")
+    return getattr(toolkit, tool_call["name"]).invoke(call, config=config)
+
+
+def run_tool_calls(toolkit, tool_calls, fallback, config=None, timeout=TOOL_TIMEOUT) -> list:
+    """
+    Execute every tool call concurrently against `toolkit` and return one ToolMessage
+    per call, in order. `fallback` replaces empty outputs; failures and timeouts
+    become an error payload. Tools with response_format="content_and_artifact" keep
+    their artifact (data for the agent, never sent to the LLM) on the message.
+    """
+    tool_config = toolkit.runnable_config(config)
+    # copy_context keeps each call in this run's metrics trace
+    futures = [
+        _TOOL_POOL.submit(copy_context().run, _invoke, toolkit, tool_call, tool_config)
+        for tool_call in tool_calls
+    ]
+    deadline = time.monotonic() + timeout
+
+    messages = []
+    for tool_call, future in zip(tool_calls, futures):
+        artifact = None
+        try:
+            message = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            output, artifact = message.content, message.artifact
+        except Exception as e:
+            print(f"[ERROR] Tool {tool_call['name']} failed: {e!r}")
+            output = json.dumps({"error": f"{tool_call['name']} unavailable: {e!r}"})
+        if not output or not str(output).strip():
+            output = fallback
+        messages.append(
+            ToolMessage(
+                content=output,
+                tool_call_id=tool_call["id"],
+                name=tool_call["name"],
+                artifact=artifact,
+            )
+        )
+    return messages
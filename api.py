@@ -0,0 +1,231 @@
+# api.py
+"""
+HTTP API for the trading pipeline.
+
+    uvicorn api:create_app --factory --port 8000
+
+POST /analyses                  submit {"coin", "trade_date"?, "trader_position"?, "duration"?, "refresh"?}
+GET  /analyses/{id}             job status and progress
+GET  /analyses/{id}/result      structured output (202 while the job is still running)
+GET  /analyses/{id}/events      Server-Sent Events: one "node" event per finished graph node,
+                                then a final "done" or "error" event
+GET  /healthz, GET /metrics     liveness and Prometheus metrics
+
+Pipeline runs are blocking, so they go to a bounded JobManager thread pool; handlers only
+read job snapshots and never block the event loop. When the queue is full, submissions
+get 503 with Retry-After.
+"""
+import asyncio
+import json
+import os
+from datetime import datetime
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from toolkit.jobs import ACTIVE, JobManager, JobQueueFull
+from toolkit.metrics import REGISTRY
+
+TRADER_POSITIONS = ("new_buyer", "existing_buyer")
+DURATIONS = ("short_term", "medium_term", "long_term")
+
+# How often an open event stream checks its job for new node completions
+EVENT_POLL_SECONDS = 0.25
+RETRY_AFTER_SECONDS = 5
+
+
+def _default_runner(**kwargs):
+    # Imported on first use: loading the graph builds the LLM client and toolkit
+    from main_runner import run_trading_pipeline
+
+    return run_trading_pipeline(**kwargs)
+
+
+def _json(payload, status_code=200, headers=None) -> Response:
+    return Response(
+        json.dumps(payload, default=str),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
+def _error(message, status_code, headers=None) -> Response:
+    return _json({"error": message}, status_code, headers)
+
+
+def _status(job) -> dict:
+    """The public view of a job snapshot (no result body, no internal key)."""
+    links = {
+        "self": f"/analyses/{job['id']}",
+        "result": f"/analyses/{job['id']}/result",
+        "events": f"/analyses/{job['id']}/events",
+    }
+    return {
+        "id": job["id"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "progress": job["progress"],
+        "error": job["error"],
+        "request": job["meta"],
+        "submitted_at": job["submitted_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "links": links,
+    }
+
+
+def _parse_submission(body) -> dict:
+    """Validate a submission body into run_trading_pipeline kwargs (ValueError if invalid)."""
+    if not isinstance(body, dict):
+        raise ValueError("Body must be a JSON object")
+    coin = body.get("coin")
+    if not isinstance(coin, str) or not coin.strip():
+        raise ValueError("'coin' is required")
+    trader_position = body.get("trader_position", "existing_buyer")
+    if trader_position not in TRADER_POSITIONS:
+        raise ValueError(f"'trader_position' must be one of {', '.join(TRADER_POSITIONS)}")
+    duration = body.get("duration", "short_term")
+    if duration not in DURATIONS:
+        raise ValueError(f"'duration' must be one of {', '.join(DURATIONS)}")
+    trade_date = body.get("trade_date")
+    if trade_date is not None:
+        try:
+            datetime.strptime(trade_date, "%Y-%m-%d")
+        except (TypeError, ValueError):
+            raise ValueError("'trade_date' must be YYYY-MM-DD")
+    refresh = body.get("refresh", False)
+    if not isinstance(refresh, bool):
+        raise ValueError("'refresh' must be true or false")
+    return {
+        "coin": coin.strip(),
+        "trade_date": trade_date,
+        "trader_position": trader_position,
+        "duration": duration,
+        "use_cache": not refresh,
+    }
+
+
+def _sse(event, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def create_app(runner=None, max_workers=None, max_queue=None) -> Starlette:
+    """
+    Build the API around `runner` (default: main_runner.run_trading_pipeline), called as
+    `runner(coin=..., trade_date=..., trader_position=..., duration=..., use_cache=...,
+    on_token=..., on_progress=...)`. Pass a stub runner to serve the API without any upstream.
+    """
+    jobs = JobManager(
+        runner or _default_runner,
+        max_workers=max_workers or int(os.getenv("NEUTROFI_API_WORKERS", "4")),
+        max_queue=max_queue or int(os.getenv("NEUTROFI_API_QUEUE", "32")),
+    )
+
+    async def submit(request):
+        try:
+            kwargs = _parse_submission(await request.json())
+        except json.JSONDecodeError:
+            return _error("Body must be valid JSON", 400)
+        except ValueError as e:
+            return _error(str(e), 400)
+
+        # Identical requests while one is queued or running share its job; a refresh
+        # never joins a job that may return the cached result
+        key = (
+            kwargs["coin"].lower(),
+            kwargs["trade_date"],
+            kwargs["trader_position"],
+            kwargs["duration"],
+            kwargs["use_cache"],
+        )
+        meta = {k: kwargs[k] for k in ("coin", "trade_date", "trader_position", "duration")}
+        try:
+            job_id = jobs.submit(key=key, meta=meta, **kwargs)
+        except JobQueueFull as e:
+            return _error(str(e), 503, {"Retry-After": str(RETRY_AFTER_SECONDS)})
+        job = jobs.get(job_id)
+        return _json(_status(job), 202, {"Location": f"/analyses/{job_id}"})
+
+    async def status(request):
+        job = jobs.get(request.path_params["job_id"])
+        if job is None:
+            return _error("Unknown or expired job", 404)
+        return _json(_status(job))
+
+    async def result(request):
+        job = jobs.get(request.path_params["job_id"])
+        if job is None:
+            return _error("Unknown or expired job", 404)
+        if job["status"] in ACTIVE:
+            return _json(_status(job), 202, {"Retry-After": "1"})
+        if job["status"] == "error":
+            return _error(job["error"], 500)
+        return _json(job["result"])
+
+    async def events(request):
+        job_id = request.path_params["job_id"]
+        if jobs.get(job_id) is None:
+            return _error("Unknown or expired job", 404)
+
+        async def stream():
+            sent = 0
+            while True:
+                job = jobs.get(job_id)
+                if job is None:
+                    yield _sse("error", {"error": "Job expired"})
+                    return
+                for event in job["events"][sent:]:
+                    yield _sse("node", event)
+                sent = len(job["events"])
+                if job["status"] not in ACTIVE:
+                    yield _sse(job["status"], _status(job))
+                    return
+                if await request.is_disconnected():
+                    return
+                await asyncio.sleep(EVENT_POLL_SECONDS)
+
+        return StreamingResponse(
+            stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    async def health(request):
+        counts = jobs.stats()
+        active = sum(counts.get(s, 0) for s in ACTIVE)
+        return _json(
+            {
+                "status": "ok",
+                "jobs": counts,
+                "accepting": active < jobs.max_queue,
+                "queue": {"active": active, "max": jobs.max_queue},
+            }
+        )
+
+    async def metrics(request):
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+    app = Starlette(
+        routes=[
+            Route("/analyses", submit, methods=["POST"]),
+            Route("/analyses/{job_id}", status),
+            Route("/analyses/{job_id}/result", result),
+            Route("/analyses/{job_id}/events", events),
+            Route("/healthz", health),
+            Route("/metrics", metrics),
+        ]
+    )
+    app.state.jobs = jobs
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        create_app(),
+        host=os.getenv("NEUTROFI_API_HOST", "127.0.0.1"),
+        port=int(os.getenv("NEUTROFI_API_PORT", "8000")),
+    )
@@ -1,15 +1,7 @@
 import streamlit as st
-from pathlib import Path
-from base64 import b64encode
+from ui_helpers import embed_image, load_css
 
-# === Helper: embed local image if exists === 
-def embed_image(path: Path) -> str:
-    if path.exists():
-        data = path.read_bytes()
-        return f"data:image/png;base64,{b64encode(data).decode()}"
-    return ""
-
-faviconimg = embed_image(Path("assets/Neulogo.png"))
+faviconimg = embed_image("assets/Neulogo.png")
 
 # === Page configuration ===
 st.set_page_config(
@@ -18,9 +10,8 @@ st.set_page_config(
     layout="wide",
 )
 
-# === Load external CSS === 
-with open("assets/style.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+# === Load external CSS (cached per process) === 
+st.markdown(load_css("assets/style.css"), unsafe_allow_html=True)
 
 
 
@@ -30,7 +21,7 @@ with st.container(key="page"):
 
     # Navigation
     with st.container(key="nav"):
-        logo_data = embed_image(Path("assets/Neulogo.png"))
+        logo_data = faviconimg
 
         st.markdown(
             """
@@ -0,0 +1,166 @@
+# backtest.py
+"""
+Replay the pipeline over historical trade dates and score its calls against what the
+price did next.
+
+    python backtest.py --coins btc eth sol --start 2025-01-06 --end 2025-06-30 --every 7 -w 4
+    python backtest.py --coins btc eth sol --start 2025-01-06 --end 2025-06-30 --every 7 --score-only
+
+Runs go through batch.py (process pool, JSONL output, resume) with point_in_time set, so
+the data tools return history as of each trade date. Each forward window scores the
+research call for the horizon covering it (7d -> short term, 30d -> medium, 90d -> long).
+Price history and LLM outputs are cached on disk, so rescoring or rerunning a backtest
+does not call upstream again.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+
+from batch import DURATIONS, TRADER_POSITIONS, run_batch
+from toolkit.history_cache import DEFAULT_HISTORY_PATH, SETTLED_AFTER, HistoryCache, end_of_day
+from toolkit.scoring import forward_returns, horizon_matrices, research_horizon, score
+from tools.technical import TechnicalAnalystAgent
+
+DEFAULT_HORIZONS = (7, 30, 90)
+
+# Historical prompts never change, so their LLM responses are kept in a separate, long-lived cache
+BACKTEST_LLM_CACHE = ".neutrofi_cache/backtest_llm.sqlite"
+BACKTEST_LLM_TTL = 365 * 86400
+
+
+def date_grid(start: str, end: str, every: int) -> list:
+    first = datetime.strptime(start, "%Y-%m-%d").date()
+    last = datetime.strptime(end, "%Y-%m-%d").date()
+    if last >= datetime.now(timezone.utc).date():
+        raise ValueError("--end must be before today; live dates are not point-in-time")
+    days = (last - first).days
+    return [(first + timedelta(days=d)).isoformat() for d in range(0, days + 1, every)]
+
+
+def load_results(path, trader_position, duration) -> list:
+    """Successful runs for this trader position and duration from a batch JSONL file."""
+    results = []
+    with open(path) as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if (
+                isinstance(result, dict)
+                and "error" not in result
+                and result.get("trader_position") == trader_position
+                and result.get("horizon") == duration
+            ):
+                results.append(result)
+    return results
+
+
+def price_series(coins, dates, horizons) -> dict:
+    """
+    Price history covering every trade date plus the longest horizon, per coin, cut at
+    the last settled day. The range is the requested window, so its history-cache key is
+    the same on every rescore; a window still in progress is refetched until it settles.
+    """
+    # A standalone CoinGecko client: importing the graph would need a working LLM
+    load_dotenv()
+    agent = TechnicalAnalystAgent(
+        os.getenv("COINGECKO_API_KEY"),
+        history=HistoryCache(os.getenv("NEUTROFI_HISTORY_CACHE", DEFAULT_HISTORY_PATH)),
+    )
+    start = end_of_day(date.fromisoformat(dates[0])) - 2 * 86400
+    end = end_of_day(date.fromisoformat(dates[-1])) + max(horizons) * 86400
+    settled_ms = (time.time() - SETTLED_AFTER) * 1000
+
+    series = {}
+    for coin in coins:
+        prices = agent.price_history(coin, start, end)
+        if isinstance(prices, dict):
+            print(f"[ERROR] No price history for {coin}: {prices.get('error')}")
+            continue
+        series[coin] = [p for p in prices if p[0] <= settled_ms]
+    return series
+
+
+def print_report(report: dict):
+    for horizon, stats in report.items():
+        print(f"\n=== {horizon} forward, {stats['research_horizon']} calls ({stats['scored']} scored) ===")
+        print(f"Hit rate: {stats['hit_rate']}   directional (Buy/Sell): {stats['directional_hit_rate']}")
+        print(f"Mean return of following the calls: {stats['strategy_return']}")
+        for label, row in stats["by_decision"].items():
+            print(f"  {label:<5} n={row['count']:<4} hit={row['hit_rate']}  mean return={row['mean_return']}")
+        calibration = stats["calibration"]
+        print(f"Calibration: Brier {calibration['brier']}, ECE {calibration['ece']}")
+        for b in calibration["bins"]:
+            print(
+                f"  confidence {b['range'][0]:.1f}–{b['range'][1]:.1f}: n={b['count']:<4} "
+                f"mean={b['mean_confidence']:.2f} hit={b['hit_rate']:.2f}"
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest NeutroFi calls over historical trade dates.")
+    parser.add_argument("--coins", nargs="+", required=True)
+    parser.add_argument("--start", required=True, help="First trade date, YYYY-MM-DD")
+    parser.add_argument("--end", required=True, help="Last trade date, YYYY-MM-DD (before today)")
+    parser.add_argument("--every", type=int, default=7, help="Days between trade dates")
+    parser.add_argument("--horizons", type=int, nargs="+", default=list(DEFAULT_HORIZONS), help="Forward windows in days")
+    parser.add_argument("--trader-position", choices=TRADER_POSITIONS, default="existing_buyer")
+    parser.add_argument("--duration", choices=DURATIONS, default="short_term")
+    parser.add_argument("--hold-band", type=float, default=0.05, help="Hold is right if |return| stays within this")
+    parser.add_argument("--bins", type=int, default=5, help="Confidence bins for calibration")
+    parser.add_argument("-o", "--output", default="backtest.jsonl", help="Run results (JSONL, resumable)")
+    parser.add_argument("--report", help="Also write the full score report as JSON")
+    parser.add_argument("-w", "--workers", type=int, default=2)
+    parser.add_argument("--score-only", action="store_true", help="Rescore existing results without running")
+    args = parser.parse_args(argv)
+
+    try:
+        dates = date_grid(args.start, args.end, args.every)
+    except ValueError as e:
+        parser.error(str(e))
+    coins = [c.strip().lower() for c in args.coins]
+
+    failures = 0
+    if not args.score_only:
+        # Workers inherit these before they import the graph
+        os.environ.setdefault("NEUTROFI_LLM_CACHE", BACKTEST_LLM_CACHE)
+        os.environ.setdefault("NEUTROFI_LLM_CACHE_TTL", str(BACKTEST_LLM_TTL))
+        pairs = [(coin, d) for d in dates for coin in coins]
+        failures = run_batch(
+            pairs,
+            args.output,
+            args.trader_position,
+            args.duration,
+            workers=args.workers,
+            quiet=True,
+            point_in_time=True,
+        )
+
+    if not os.path.exists(args.output):
+        parser.error(f"{args.output} not found; run without --score-only first")
+    results = load_results(args.output, args.trader_position, args.duration)
+    decisions, confidence = horizon_matrices(results, coins, dates, args.horizons)
+    series = price_series(coins, dates, args.horizons)
+    start_times = [end_of_day(date.fromisoformat(d)) * 1000 for d in dates]
+    returns = forward_returns(series, coins, start_times, args.horizons)
+
+    report = score(
+        decisions, confidence, returns, args.horizons, coins, hold_band=args.hold_band, bins=args.bins
+    )
+    for horizon in args.horizons:
+        report[f"{horizon}d"]["research_horizon"] = research_horizon(horizon)
+    print_report(report)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
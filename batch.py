@@ -0,0 +1,191 @@
+# batch.py
+"""
+Run the pipeline over every (coin, trade_date) pair and stream results to JSONL.
+
+    python batch.py --coins btc eth sol --dates 2025-08-01 2025-08-05 -o results.jsonl
+    python batch.py --coins-file coins.txt --dates-file dates.txt --workers 4 --quiet
+
+Each line of the output is one run's structured output, or {"coin", "trade_date", ..., "error"}
+for a failed run. Rerunning with the same output file skips pairs already written
+successfully, so an interrupted batch resumes where it stopped.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+TRADER_POSITIONS = ("new_buyer", "existing_buyer")
+DURATIONS = ("short_term", "medium_term", "long_term")
+
+# Set per worker process by _init_worker
+_pipeline = None
+_verbose = True
+
+
+def _init_worker(quiet: bool):
+    """Import the graph (LLM client, toolkit, caches) once per worker, before any job arrives."""
+    global _pipeline, _verbose
+    from main_runner import run_trading_pipeline
+
+    _pipeline, _verbose = run_trading_pipeline, not quiet
+
+
+def _run_one(coin, trade_date, trader_position, duration, use_cache, point_in_time):
+    start = time.perf_counter()
+    try:
+        result = _pipeline(
+            coin=coin,
+            trade_date=trade_date,
+            trader_position=trader_position,
+            duration=duration,
+            use_cache=use_cache,
+            verbose=_verbose,
+            point_in_time=point_in_time,
+        )
+    except Exception as e:
+        result = {
+            "coin": coin,
+            "trade_date": trade_date,
+            "trader_position": trader_position,
+            "horizon": duration,
+            "error": f"{type(e).__name__}: {e}",
+        }
+    result["batch_seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def _read_list(values, path):
+    """Items from the command line plus a file (one per line; blank lines and # comments skipped)."""
+    items = list(values or [])
+    if path:
+        with open(path) as f:
+            items += [line.split("#", 1)[0].strip() for line in f]
+    return [item for item in items if item]
+
+
+def _run_key(result) -> tuple:
+    return (
+        result["coin"].strip().lower(),
+        result["trade_date"],
+        result["trader_position"],
+        result["horizon"],
+    )
+
+
+def load_completed(path) -> set:
+    """
+    Keys of successful runs already in `path`. A trailing partial line (the writer was
+    killed mid-write) is truncated so appending resumes on a clean line.
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, "rb") as f:
+        data = f.read()
+    complete = data[: data.rfind(b"\n") + 1]
+    if len(complete) != len(data):
+        with open(path, "r+b") as f:
+            f.truncate(len(complete))
+
+    done = set()
+    for line in complete.splitlines():
+        try:
+            result = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(result, dict) and "error" not in result:
+            done.add(_run_key(result))
+    return done
+
+
+def run_batch(
+    pairs, output, trader_position, duration, workers=2, quiet=False, use_cache=True, point_in_time=False
+) -> int:
+    """
+    Run every (coin, trade_date) pair not already in `output`; returns the number of failures.
+    point_in_time=True runs each pair on history as of its trade date (see run_trading_pipeline).
+    """
+    done = load_completed(output)
+    todo = [
+        (coin, date)
+        for coin, date in pairs
+        if (coin.strip().lower(), date, trader_position, duration) not in done
+    ]
+    print(f"[batch] {len(pairs) - len(todo)} of {len(pairs)} runs already in {output}", file=sys.stderr)
+    if not todo:
+        return 0
+
+    failures = 0
+    with open(output, "a") as out, ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(quiet,)
+    ) as pool:
+        futures = {
+            pool.submit(
+                _run_one, coin, date, trader_position, duration, use_cache, point_in_time
+            ): (coin, date)
+            for coin, date in todo
+        }
+        for i, future in enumerate(as_completed(futures), 1):
+            coin, date = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:  # worker process died
+                result = {
+                    "coin": coin,
+                    "trade_date": date,
+                    "trader_position": trader_position,
+                    "horizon": duration,
+                    "error": f"{type(e).__name__}: {e}",
+                }
+            # One line per finished run, flushed so a crash never loses completed work
+            out.write(json.dumps(result, default=str) + "\n")
+            out.flush()
+
+            if "error" in result:
+                failures += 1
+                outcome = f"ERROR {result['error']}"
+            else:
+                outcome = f"{result.get('final_decision')} ({result.get('batch_seconds')}s)"
+            print(f"[batch] {i}/{len(todo)} {coin} {date}: {outcome}", file=sys.stderr)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the NeutroFi pipeline over coins × trade dates.")
+    parser.add_argument("--coins", nargs="*", help="Coins to analyse (e.g. btc eth)")
+    parser.add_argument("--coins-file", help="File with one coin per line")
+    parser.add_argument("--dates", nargs="*", help="Trade dates, YYYY-MM-DD (default: today)")
+    parser.add_argument("--dates-file", help="File with one trade date per line")
+    parser.add_argument("--trader-position", choices=TRADER_POSITIONS, default="existing_buyer")
+    parser.add_argument("--duration", choices=DURATIONS, default="short_term")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="JSONL file to append to")
+    parser.add_argument("-w", "--workers", type=int, default=2, help="Worker processes")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Turn off the per-run report dump")
+    parser.add_argument("--no-cache", action="store_true", help="Force fresh LLM calls and results")
+    parser.add_argument(
+        "--point-in-time", action="store_true", help="Use data as of each (past) trade date instead of live data"
+    )
+    args = parser.parse_args(argv)
+
+    coins = _read_list(args.coins, args.coins_file)
+    dates = _read_list(args.dates, args.dates_file) or [time.strftime("%Y-%m-%d", time.gmtime())]
+    if not coins:
+        parser.error("no coins given (--coins or --coins-file)")
+
+    pairs = list(dict.fromkeys((coin, date) for date in dates for coin in coins))
+    failures = run_batch(
+        pairs,
+        args.output,
+        args.trader_position,
+        args.duration,
+        workers=args.workers,
+        quiet=args.quiet,
+        use_cache=not args.no_cache,
+        point_in_time=args.point_in_time,
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,11 @@ from agents.social_media_agent import create_sentiment_analyst
 from agents.research_analyst_agent import create_research_analyst_agent
 from agents.risk_management_agent import create_risk_manager_agent
 from toolkit.crypto_toolkit import MyCryptoToolKit
+from toolkit.llm_cache import SQLiteLLMCache, DEFAULT_CACHE_PATH
+from toolkit.metrics import LLMMetricsCallback, record_node, start_metrics_server, timed
+from toolkit.hedging import configure_hedging
+from toolkit.sentiment_store import SentimentStore, DEFAULT_STORE_PATH
+from toolkit.history_cache import HistoryCache, DEFAULT_HISTORY_PATH, as_of_date
 from dotenv import load_dotenv
 import os
 
@@ -25,16 +30,27 @@ REDDIT_USER_AGENT = "sentiment"
 # 🔧 LLM
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+# Identical prompts within the TTL (same coin, date and tool data) are served from disk
+llm_cache = SQLiteLLMCache(
+    os.getenv("NEUTROFI_LLM_CACHE", DEFAULT_CACHE_PATH),
+    ttl=int(os.getenv("NEUTROFI_LLM_CACHE_TTL", str(6 * 3600))),
+)
+
 try:
     llm = ChatGoogleGenerativeAI(
         model="gemini-1.5-flash",
         google_api_key=GEMINI_KEY,
         temperature=0.3,
+        cache=llm_cache,
+        callbacks=[LLMMetricsCallback()],
     )
 except Exception as e:
     print(f"[ERROR] Failed to initialize Gemini LLM: {e}")
     exit(1)
 
+# 📈 Per-run sentiment aggregates (news and social), for trend charts and the research prompt
+sentiment_store = SentimentStore(os.getenv("NEUTROFI_SENTIMENT_DB", DEFAULT_STORE_PATH))
+
 # 🧰 TOOLKIT
 try:
     toolkit = MyCryptoToolKit(
@@ -43,103 +59,161 @@ try:
         reddit_id=REDDIT_CLIENT_ID,
         reddit_secret=REDDIT_SECRET,
         reddit_agent=REDDIT_USER_AGENT,
+        use_news_aggregator=os.getenv("NEUTROFI_NEWS_AGGREGATOR") == "1",
+        news_background_refresh=os.getenv("NEUTROFI_NEWS_REFRESHER") == "1",
+        # Settled price history and daily snapshots for past trade dates, kept on disk
+        history=HistoryCache(os.getenv("NEUTROFI_HISTORY_CACHE", DEFAULT_HISTORY_PATH)),
     )
 except Exception as e:
     print(f"[ERROR] Failed to initialize toolkit: {e}")
     exit(1)
 
 
+# 📈 Prometheus scrape endpoint (opt-in)
+if os.getenv("NEUTROFI_METRICS_PORT"):
+    start_metrics_server(int(os.getenv("NEUTROFI_METRICS_PORT")))
+
+
+# 🏁 Hedged LLM and data-tool requests (opt-in): duplicate calls slower than the
+# recent p95 (NEUTROFI_HEDGE_PERCENTILE), capped at NEUTROFI_HEDGE_BUDGET of calls
+if os.getenv("NEUTROFI_HEDGE") == "1":
+    configure_hedging(
+        enabled=True,
+        percentile=float(os.getenv("NEUTROFI_HEDGE_PERCENTILE", "0.95")),
+        budget=float(os.getenv("NEUTROFI_HEDGE_BUDGET", "0.05")),
+    )
+
+
 # Define state schema
 class AgentState(TypedDict):
     coin: str
     trade_date: str
+    point_in_time: bool  # Historical data as of trade_date (backtests) instead of live data
     user_type: str  # "new_buyer" or "existing_buyer"
     horizon: str  # "short_term", "mid_term", "long_term"
     messages: List[BaseMessage]
     news_report: Optional[str]
     fundamentals_report: Optional[str]
     technical_report: Optional[str]
+    technical_chart: Optional[dict]  # Downsampled price/Bollinger/RSI series for the dashboard
     sentiment_report: Optional[str]
+    sentiment_index: Optional[dict]  # Local lexicon aggregate over all fetched posts
     research_summary: Optional[str]
     research_decision: Optional[str]
     research_confidence: Optional[float]
+    research: Optional[dict]  # Structured research result (see agents/research_analyst_agent.py)
+    horizon_forecasts: Optional[dict]  # Per-horizon recommendation and confidence from research
     risk_notes: Optional[str]
     horizon: Optional[dict]  # Time horizon forecasts,
     final_reason: Optional[str]  # Reason for final decision,
     confidence: Optional[float]  # Confidence score for final decision
     final_recommendation: Optional[str]
+    risk_context: Optional[dict]  # Inputs for the on-demand risk narrative
 
 
 # Initialize graph
 workflow = StateGraph(AgentState)
 
 
+def run_toolkit(config):
+    """The run's toolkit from config["configurable"]["toolkit"]; the process default otherwise."""
+    return ((config or {}).get("configurable") or {}).get("toolkit") or toolkit
+
+
+def live_store(state):
+    """The sentiment store for live runs; point-in-time runs neither record nor read trends."""
+    live = as_of_date(state["trade_date"], state.get("point_in_time")) is None
+    return sentiment_store if live else None
+
+
 # Define nodes with message reset
-def news_node(state):
+def news_node(state, config=None):
     state["messages"] = [
         HumanMessage(content=f"Fetch and analyze recent news for {state['coin']}.")
     ]
-    return create_crypto_news_analyst(llm, toolkit)(state)
+    return create_crypto_news_analyst(llm, run_toolkit(config), live_store(state))(state, config)
 
 
-def fundamentals_node(state):
+def fundamentals_node(state, config=None):
     state["messages"] = [
         HumanMessage(content=f"Fetch and analyze fundamentals for {state['coin']}.")
     ]
-    return create_fundamentals_analyst(llm, toolkit)(state)
+    return create_fundamentals_analyst(llm, run_toolkit(config))(state, config)
 
 
-def technical_node(state):
+def technical_node(state, config=None):
     state["messages"] = [
         HumanMessage(
             content=f"Fetch and analyze technical indicators for {state['coin']}."
         )
     ]
-    return create_technical_analyst(llm, toolkit)(state)
+    return create_technical_analyst(llm, run_toolkit(config))(state, config)
 
 
-def sentiment_node(state):
+def sentiment_node(state, config=None):
     state["messages"] = [
         HumanMessage(
             content=f"Fetch and analyze social media sentiment for {state['coin']}."
         )
     ]
-    return create_sentiment_analyst(llm, toolkit)(state)
+    return create_sentiment_analyst(llm, run_toolkit(config), live_store(state))(state, config)
 
 
-def research_node(state):
+def research_node(state, config=None):
     state["messages"] = [
         HumanMessage(content=f"Generate research report for {state['coin']}.")
     ]
-    return create_research_analyst_agent(llm)(state)
+    return create_research_analyst_agent(llm, live_store(state))(state, config)
 
 
-def risk_node(state):
+def risk_node(state, config=None):
     state["messages"] = [
         HumanMessage(content=f"Conduct risk analysis for {state['coin']}.")
     ]
     return create_risk_manager_agent(llm)(state)
 
 
+def instrumented(name, node):
+    """
+    Record each node's wall time in the run trace and the process-wide histogram,
+    then report completion to config["configurable"]["on_node"], if set.
+    """
+
+    def run(state, config=None):
+        with timed(record_node, name):
+            result = node(state, config)
+        on_node = ((config or {}).get("configurable") or {}).get("on_node")
+        if on_node is not None:
+            on_node(name)
+        return result
+
+    return run
+
+
 # === Build Graph ===
-def trading_graph(llm, toolkit):
+def trading_graph(llm, toolkit, with_risk=True):
+    """Full pipeline; with_risk=False stops after research (the user-independent part)."""
     workflow = StateGraph(AgentState)
 
     # Add nodes
-    workflow.add_node("news", news_node)
-    workflow.add_node("fundamentals", fundamentals_node)
-    workflow.add_node("technical", technical_node)
-    workflow.add_node("sentiment", sentiment_node)
-    workflow.add_node("research", research_node)
-    workflow.add_node("risk", risk_node)
+    workflow.add_node("news", instrumented("news", news_node))
+    workflow.add_node("fundamentals", instrumented("fundamentals", fundamentals_node))
+    workflow.add_node("technical", instrumented("technical", technical_node))
+    workflow.add_node("sentiment", instrumented("sentiment", sentiment_node))
+    workflow.add_node("research", instrumented("research", research_node))
+    if with_risk:
+        workflow.add_node("risk", instrumented("risk", risk_node))
 
     # Edges (sequential)
     workflow.add_edge("news", "fundamentals")
     workflow.add_edge("fundamentals", "technical")
     workflow.add_edge("technical", "sentiment")
     workflow.add_edge("sentiment", "research")
-    workflow.add_edge("research", "risk")
-    workflow.add_edge("risk", END)
+    if with_risk:
+        workflow.add_edge("research", "risk")
+        workflow.add_edge("risk", END)
+    else:
+        workflow.add_edge("research", END)
 
     # Set entry point
     workflow.set_entry_point("news")
@@ -148,3 +222,4 @@ def trading_graph(llm, toolkit):
 
 
 graph = trading_graph(llm, toolkit)
+analysis_graph = trading_graph(llm, toolkit, with_risk=False)
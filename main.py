@@ -4,6 +4,7 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage
 
 from toolkit.crypto_toolkit import MyCryptoToolKit
+from toolkit.llm_cache import SQLiteLLMCache
 from agents.news_agent import create_crypto_news_analyst
 from agents.fundamental_analysis_agent import create_fundamentals_analyst
 from agents.technical_anlyst_agent import create_technical_analyst
@@ -22,6 +23,7 @@ llm = ChatGoogleGenerativeAI(
     model="gemini-1.5-flash",
     google_api_key=GEMINI_KEY,
     temperature=0.3,
+    cache=SQLiteLLMCache(),
 )
 
 # 🧰 TOOLKIT
@@ -1,6 +1,50 @@
-from graph import graph  # make sure this imports your compiled LangGraph
-from datetime import datetime
+from graph import analysis_graph, instrumented, risk_node, llm, llm_cache  # compiled LangGraph pieces
+from agents.risk_management_agent import explain_risk_decision
+from toolkit.llm_cache import bypass_llm_cache
+from toolkit.metrics import current_trace, trace_run
+from toolkit.hedging import hedging_stats
+from toolkit.singleflight import SingleFlight
+from toolkit.result_cache import ResultCache
+from contextlib import nullcontext
+from datetime import datetime, timezone
+import os
 import re
+import time
+
+# Concurrent runs for the same (coin, trade_date, use_cache) share one analysis
+_pipeline_flight = SingleFlight("pipeline")
+
+# Finished results shared by every caller in the process (and across processes with NEUTROFI_RESULT_CACHE)
+result_cache = ResultCache(
+    ttl=int(os.getenv("NEUTROFI_RESULT_TTL", "900")),
+    path=os.getenv("NEUTROFI_RESULT_CACHE"),
+)
+
+
+# Graph nodes in run order, for progress reporting
+PIPELINE_STAGES = ("news", "fundamentals", "technical", "sentiment", "research", "risk")
+
+
+def _run_analysis(state, use_cache, on_token=None, on_node=None, toolkit=None):
+    """News → research: everything that doesn't depend on the trader's position."""
+    configurable = {
+        k: v
+        for k, v in (("on_token", on_token), ("on_node", on_node), ("toolkit", toolkit))
+        if v
+    }
+    # point_in_time with a past trade_date switches the data tools to history
+    configurable["trade_date"] = state["trade_date"]
+    configurable["point_in_time"] = state["point_in_time"]
+    config = {"configurable": configurable}
+    with nullcontext() if use_cache else bypass_llm_cache():
+        return analysis_graph.invoke(state, config=config)
+
+
+def _lead_analysis(*args):
+    """_run_analysis for the flight leader; followers also get its trace so far."""
+    shared_state = _run_analysis(*args)
+    trace = current_trace()
+    return shared_state, trace, trace.to_dict()
 
 
 def run_trading_pipeline(
@@ -8,46 +52,130 @@ def run_trading_pipeline(
     trade_date: str = None,
     trader_position: str = "existing_buyer",
     duration: str = "short_term",
+    use_cache: bool = True,
+    explain: bool = False,
+    on_token=None,
+    on_progress=None,
+    toolkit=None,
+    verbose: bool = True,
+    point_in_time: bool = False,
 ):
+    """
+    Run the full analysis for one coin and return the structured output.
+    `on_token(report_key, text)` receives report tokens as they stream (e.g. "news_report");
+    `on_progress(stage, fraction)` is called as each graph node finishes.
+    Concurrent identical runs share one analysis: every caller gets the node progress,
+    and the report tokens too when the first caller streams them.
+    A result for the same (coin, trader_position, duration, trade_date) younger than the
+    result cache TTL is returned as is; use_cache=False forces a fresh run and replaces it.
+    `toolkit` runs the tools against a specific MyCryptoToolKit (keys, clients, HTTP pool)
+    instead of the process default; such runs are isolated and skip the shared result cache.
+    verbose=False drops the report dump on stdout (batch runs); errors are still printed.
+    point_in_time=True (backtests) makes the data tools return history as of a past
+    trade_date; otherwise every run uses live data, whatever its trade_date.
+    """
     if trade_date is None:
-        trade_date = datetime.today().strftime("%Y-%m-%d")
+        # Same UTC calendar as the point-in-time check
+        trade_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    cache_key = ResultCache.key(coin, trader_position, duration, trade_date, point_in_time)
+    shared = toolkit is None
+    if use_cache and shared:
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            if explain and not cached.get("explanation"):
+                cached = save_explanation(cached, explain_decision(cached))
+            cached["cached"] = True
+            if on_progress:
+                on_progress("cached", 1.0)
+            return cached
 
     state = {
         "coin": coin,
         "trade_date": trade_date,
+        "point_in_time": point_in_time,
         "user_type": trader_position,
         "horizon": duration,
         "messages": [],
         "news_report": None,
         "fundamentals_report": None,
         "technical_report": None,
+        "technical_chart": None,
         "sentiment_report": None,
+        "sentiment_index": None,
         "research_summary": None,
+        "research": None,
+        "horizon_forecasts": None,
         "risk_notes": None,
         "final_recommendation": None,
         "research_decision": None,
         "research_confidence": None,
         "final_reason": None,
         "confidence": None,
+        "risk_context": None,
     }
 
-    print(
-        f"\n🚀 Starting pipeline for: {coin} ({trader_position}, {duration}) on {trade_date}\n"
-    )
-    final_state = graph.invoke(state)
+    if verbose:
+        print(
+            f"\n🚀 Starting pipeline for: {coin} ({trader_position}, {duration}) on {trade_date}\n"
+        )
+    def on_node(name):
+        on_progress(name, (PIPELINE_STAGES.index(name) + 1) / len(PIPELINE_STAGES))
+
+    def listener(kind, *event):
+        if kind == "token" and on_token:
+            on_token(*event)
+        elif kind == "node" and on_progress:
+            on_node(*event)
+
+    # A refresh must not join a cached-LLM run already in flight
+    flight_key = (coin.lower(), trade_date, point_in_time, id(toolkit), use_cache)
+
+    with trace_run() as trace:
+        # use_cache=False forces fresh LLM calls for this run only. The leader's node and
+        # token events reach every caller's listener; reports stream only if the leader
+        # has a token sink, since streamed calls are not hedged
+        shared_state, leader_trace, analysis_trace = _pipeline_flight.do(
+            flight_key,
+            _lead_analysis,
+            state,
+            use_cache,
+            (lambda *e: _pipeline_flight.emit(flight_key, "token", *e)) if on_token else None,
+            lambda name: _pipeline_flight.emit(flight_key, "node", name),
+            toolkit,
+            listener=listener,
+        )
+        # Followers share the leader's analysis and add its trace to theirs (marked
+        # shared_analysis); risk rules apply per caller
+        follower = leader_trace is not trace
+        if follower:
+            trace.merge(analysis_trace)
+        final_state = dict(shared_state, user_type=trader_position, horizon=duration)
+        final_state.update(instrumented("risk", risk_node)(final_state))
+        if on_progress:
+            on_node("risk")
 
     # === Build structured output ===
     structured_output = {
         "coin": coin,
         "trade_date": trade_date,
+        "point_in_time": point_in_time,
         "final_decision": final_state.get("final_recommendation", ""),
         "research_summary": final_state.get("research_summary", ""),
+        "research": final_state.get("research"),
         "risk_notes": final_state.get("risk_notes", ""),
 
         "trader_position": final_state.get("user_type", trader_position),
         "horizon": final_state.get("horizon", duration),
         "confidence":  final_state.get("confidence"),
         "final_reason": final_state.get("final_reason"),
+        "sentiment_index": final_state.get("sentiment_index"),
+        "risk_context": final_state.get("risk_context"),
+        "chart": final_state.get("technical_chart"),
+        "explanation": None,
+        "trace": dict(trace.to_dict(), shared_analysis=follower),
+        "generated_at": time.time(),
+        "cached": False,
 
         "reports": {
             "news": {"raw": final_state.get("news_report", "")},
@@ -58,23 +186,64 @@ def run_trading_pipeline(
         },
     }
 
+    # The LLM narrative is off the critical path; generate it only when asked
+    if explain:
+        structured_output["explanation"] = explain_decision(structured_output)
+
+    if shared:
+        result_cache.put(cache_key, structured_output, structured_output["generated_at"])
+
     # === Keep old prints for CLI debugging ===
-    print("\n✅ Final Decision Output\n")
-    print("📰 News Report:\n", final_state.get("news_report", "N/A"))
-    print("\n📊 Fundamentals Report:\n", final_state.get("fundamentals_report", "N/A"))
-    print("\n📉 Technical Report:\n", final_state.get("technical_report", "N/A"))
-    print("\n💬 Sentiment Report:\n", final_state.get("sentiment_report", "N/A"))
-    print("\n🔬 Research Summary:\n", final_state.get("research_summary", "N/A"))
-    # print("\n⚠️ Risk Notes:\n", final_state.get("risk_notes", "N/A"))
-    print("\n📈 Final Decision:\n", final_state.get("final_recommendation", "N/A"))
-    print("\n Horizon Forecast:\n", final_state.get("horizon", "N/A"))
-    print("\n Confidence Score:\n", final_state.get("confidence", "N/A"))
-    print("\n Reasons for Decision:\n", final_state.get("final_reason", "N/A"))
-    print("\n✅ Pipeline complete.")
+    if verbose:
+        print("\n✅ Final Decision Output\n")
+        print("📰 News Report:\n", final_state.get("news_report", "N/A"))
+        print("\n📊 Fundamentals Report:\n", final_state.get("fundamentals_report", "N/A"))
+        print("\n📉 Technical Report:\n", final_state.get("technical_report", "N/A"))
+        print("\n💬 Sentiment Report:\n", final_state.get("sentiment_report", "N/A"))
+        print("\n🔬 Research Summary:\n", final_state.get("research_summary", "N/A"))
+        # print("\n⚠️ Risk Notes:\n", final_state.get("risk_notes", "N/A"))
+        print("\n📈 Final Decision:\n", final_state.get("final_recommendation", "N/A"))
+        print("\n Horizon Forecast:\n", final_state.get("horizon", "N/A"))
+        print("\n Confidence Score:\n", final_state.get("confidence", "N/A"))
+        print("\n Reasons for Decision:\n", final_state.get("final_reason", "N/A"))
+        print("\n LLM Cache:\n", llm_cache.stats())
+        if hedging_stats():
+            print("\n Hedging:\n", hedging_stats())
+        print("\n✅ Pipeline complete.")
 
     return structured_output
 
 
+def explain_decision(structured_output: dict) -> str:
+    """The risk manager's narrative for a finished run; `structured_output` is not modified."""
+    if structured_output.get("explanation"):
+        return structured_output["explanation"]
+    risk_context = structured_output.get("risk_context")
+    if not risk_context:
+        return "No risk context available for this run."
+    return explain_risk_decision(llm, risk_context)
+
+
+def save_explanation(structured_output: dict, explanation: str) -> dict:
+    """
+    A copy of the result carrying `explanation`. If the result cache still holds this
+    run, the narrative is stored there too, so later cache hits do not regenerate it.
+    """
+    updated = dict(structured_output, explanation=explanation)
+    cache_key = ResultCache.key(
+        updated["coin"],
+        updated["trader_position"],
+        updated["horizon"],
+        updated["trade_date"],
+        updated.get("point_in_time", False),
+    )
+    current = result_cache.get(cache_key)
+    if current is not None and current.get("generated_at") == updated.get("generated_at"):
+        current["explanation"] = explanation
+        result_cache.put(cache_key, current, current["generated_at"])
+    return updated
+
+
 if __name__ == "__main__":
     # Modify this line to run for different coins or dates
     run_trading_pipeline(
@@ -1,20 +1,16 @@
 import streamlit as st
-from pathlib import Path
-from base64 import b64encode
+import altair as alt
+import pandas as pd
+import os
 import time
-import re
 from html import escape
-from main_runner import run_trading_pipeline
+from main_runner import run_trading_pipeline, explain_decision, save_explanation
+from graph import sentiment_store
+from toolkit.jobs import ACTIVE, JobManager, JobQueueFull
+from agents.research_analyst_agent import parse_research_text
+from ui_helpers import embed_image, load_css
 
-
-# === Helper: embed local image if exists ===
-def embed_image(path: Path) -> str:
-    if path.exists():
-        data = path.read_bytes()
-        return f"data:image/png;base64,{b64encode(data).decode()}"
-    return ""
-
-faviconimg = embed_image(Path("assets/Neulogo.png"))
+faviconimg = embed_image("assets/Neulogo.png")
 
 # === Page configuration ===
 st.set_page_config(
@@ -24,11 +20,8 @@ st.set_page_config(
     layout="centered",
 )
 
-# === Load external CSS ===
-with open("assets/form.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-with open("assets/style.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+# === Load external CSS (cached per process) ===
+st.markdown(load_css("assets/form.css", "assets/style.css"), unsafe_allow_html=True)
 
 
 # === Maps(Label -> token) ===
@@ -50,6 +43,30 @@ TOKEN_MAP = {
 }
 
 
+COIN_OPTIONS = [
+    "Bitcoin", "Ethereum", "Ripple", "Tether", "Binance coin", "Solana",
+    "USD Coin", "Dogecoin", "TRON", "Cardano", "Hyperliquid (HYPE)", "Stellar",
+    "Sui", "Chainlink", "Hedera", "Bitcoin cash", "Avalanche", "Wrapped Bitcoin",
+    "Toncoin", "Polkadot",
+]
+
+# Coins per comparison; they run concurrently on the shared job pool
+MAX_COMPARE = 5
+
+
+# === Background jobs (one pool per server process, shared by every session) ===
+@st.cache_resource
+def get_job_manager() -> JobManager:
+    return JobManager(
+        run_trading_pipeline,
+        # Enough workers for one full comparison to run side by side
+        max_workers=int(os.getenv("NEUTROFI_JOB_WORKERS", str(MAX_COMPARE))),
+        max_queue=int(os.getenv("NEUTROFI_JOB_QUEUE", "16")),
+    )
+
+jobs = get_job_manager()
+
+
 # === Session State ===
 if "show_results" not in st.session_state:
     st.session_state.show_results = False
@@ -59,6 +76,30 @@ if "user_inputs" not in st.session_state:
     st.session_state.user_inputs = {}
 if "fade_class" not in st.session_state:
     st.session_state.fade_class = "form-container"
+if "job_id" not in st.session_state:
+    st.session_state.job_id = None
+if "compare_jobs" not in st.session_state:
+    st.session_state.compare_jobs = {}  # coin label -> job id
+
+# The job id lives in the URL, so a reload or a new session picks the analysis back up
+if st.session_state.job_id is None and "job" in st.query_params:
+    resumed = jobs.get(st.query_params["job"])
+    if resumed is None:
+        del st.query_params["job"]
+    else:
+        st.session_state.job_id = resumed["id"]
+        st.session_state.user_inputs = resumed["meta"]
+        if resumed["status"] == "done":
+            st.session_state.analysis_data = resumed["result"]
+            st.session_state.show_results = True
+if not st.session_state.compare_jobs and "compare" in st.query_params:
+    for compare_id in st.query_params["compare"].split(","):
+        resumed = jobs.get(compare_id)
+        if resumed is not None:
+            st.session_state.compare_jobs[resumed["meta"]["coin"]] = compare_id
+            st.session_state.user_inputs = resumed["meta"]
+    if not st.session_state.compare_jobs:
+        del st.query_params["compare"]
 
 # === Reset Function ===
 def reset_form():
@@ -66,43 +107,338 @@ def reset_form():
     st.session_state.analysis_data = None
     st.session_state.fade_class = "form-container"
     st.session_state.user_inputs = {}
+    st.session_state.job_id = None
+    st.session_state.compare_jobs = {}
+    st.query_params.pop("job", None)
+    st.query_params.pop("compare", None)
+
+# === Live report streaming ===
+LIVE_REPORTS = {
+    "news_report": "News",
+    "fundamentals_report": "Fundamentals",
+    "technical_report": "Technical",
+    "sentiment_report": "Sentiment",
+    "research_summary": "Overall Summary",
+}
+
+@st.fragment(run_every=1.0)
+def job_progress(job_id: str):
+    """Poll the background job; partial reports fill in until the result is ready."""
+    job = jobs.get(job_id)
+    if job is None:
+        st.warning("This analysis has expired. Please run it again.")
+        st.button("🔄 Back to the form", on_click=reset_form)
+        return
+    if job["status"] == "error":
+        st.error(f"Analysis failed: {job['error']}")
+        st.button("🔄 Try again", on_click=reset_form)
+        return
+    if job["status"] == "done":
+        st.session_state.analysis_data = job["result"]
+        st.session_state.show_results = True
+        st.rerun()
+
+    if job["status"] == "queued":
+        st.info("Neu is busy with other analyses; yours will start shortly.")
+    st.progress(
+        job["progress"],
+        text=f"🔍 Give it a minute, Neu is analysing the market for you ({job['stage'] or 'starting'})",
+    )
+    # Only the selected report is drawn on each poll
+    choice = st.radio(
+        "Report",
+        list(LIVE_REPORTS),
+        format_func=LIVE_REPORTS.get,
+        horizontal=True,
+        label_visibility="collapsed",
+        key="live_tab",
+    )
+    st.markdown(job["partial"].get(choice) or "_Waiting for this report…_")
+
+def format_age(generated_at) -> str:
+    if not generated_at:
+        return "just now"
+    seconds = max(0, time.time() - generated_at)
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min ago"
+    return f"{int(seconds // 3600)} h {int(seconds % 3600 // 60)} min ago"
 
 # === Run Analysis Function ===
-def run_analysis(coin_label: str, trader_label: str, horizon_label: str):
+def run_analysis(coin_label: str, trader_label: str, horizon_label: str, refresh: bool = False):
     # Map inputs to internal tokens
     norm_trader = TRADER_MAP.get(trader_label, "existing_buyer")
     norm_horizon = HORIZON_MAP.get(horizon_label, "short_term")
+    user_inputs = {
+        "coin": coin_label,
+        "trader": trader_label,
+        "horizon": horizon_label,
+    }
+
+    # Identical analyses already in flight are shared rather than queued twice;
+    # a refresh never joins a job that may return the cached result
+    try:
+        job_id = jobs.submit(
+            key = (coin_label.lower(), norm_trader, norm_horizon, not refresh),
+            meta = user_inputs,
+            coin = coin_label,
+            trader_position = norm_trader,
+            duration = norm_horizon,
+            use_cache = not refresh,  # cached results from any session are reused unless refreshing
+        )
+    except JobQueueFull:
+        st.warning("Neu is handling too many analyses right now. Please try again in a moment.")
+        return
 
     # Trigger fade-out animation
     st.session_state.fade_class = "form-container fade-out"
-    st.session_state.animating = True
+    st.session_state.job_id = job_id
+    st.session_state.user_inputs = user_inputs
+    st.session_state.analysis_data = None
+    st.session_state.show_results = False
+    st.query_params["job"] = job_id
+    st.rerun()
 
-    with st.spinner("🔍 Give it a minute, Neu is analysing the market for you"):
-        time.sleep(0.6)  # Simulate processing delay
-        data = run_trading_pipeline(
-            coin = coin_label,
-            trader_position = norm_trader,
-            duration = norm_horizon
+
+def run_comparison(coin_labels: list, trader_label: str, horizon_label: str, refresh: bool = False):
+    norm_trader = TRADER_MAP.get(trader_label, "existing_buyer")
+    norm_horizon = HORIZON_MAP.get(horizon_label, "short_term")
+    requests = [
+        (
+            (coin.lower(), norm_trader, norm_horizon, not refresh),
+            {"coin": coin, "trader": trader_label, "horizon": horizon_label},
+            {
+                "coin": coin,
+                "trader_position": norm_trader,
+                "duration": norm_horizon,
+                "use_cache": not refresh,
+            },
         )
+        for coin in coin_labels
+    ]
+    # All or nothing, so a busy server never leaves a half-started comparison
+    try:
+        job_ids = jobs.submit_many(requests)
+    except JobQueueFull:
+        st.warning("Neu is handling too many analyses right now. Please try again in a moment.")
+        return
+
+    st.session_state.compare_jobs = dict(zip(coin_labels, job_ids))
+    st.session_state.user_inputs = requests[0][1]
+    st.query_params["compare"] = ",".join(job_ids)
+    st.rerun()
+
+
+# === Verdict styling ===
+def decision_class_for(decision: str) -> str:
+    norm = (decision or "").strip().lower()
+    if "buy" in norm:
+        return "status-buy"
+    if "hold" in norm:
+        return "status-hold"
+    if "sell" in norm:
+        return "status-sell"
+    return "status-neutral"
+
+def conf_class_for(conf_val) -> str:
+    if conf_val is None:
+        return "conf-unknown"
+    if conf_val < 0.5:
+        return "conf-low"
+    if conf_val < 0.7:
+        return "conf-mid"
+    return "conf-high"
+
+
+# === Comparison grid ===
+def render_compare_card(coin: str, job):
+    if job is None:
+        st.markdown(f"**{escape(coin)}**")
+        st.caption("This analysis has expired.")
+        return
+    if job["status"] in ACTIVE:
+        st.markdown(f"**{escape(coin)}**")
+        st.progress(job["progress"], text=job["stage"] or job["status"])
+        return
+    if job["status"] == "error":
+        st.markdown(f"**{escape(coin)}**")
+        st.error(job["error"])
+        return
+
+    data = job["result"]
+    decision = str(data.get("final_decision") or "N/A")
+    try:
+        conf_val = float(data.get("confidence"))
+    except (TypeError, ValueError):
+        conf_val = None
+    st.markdown(
+        f"""
+        <div class="decision-card {decision_class_for(decision)}">
+          <h5>{escape(coin)}</h5>
+          <p class="result-text text-color">{escape(decision)}</p>
+          <p class="result-text {conf_class_for(conf_val)}">Confidence {'N/A' if conf_val is None else f'{conf_val:.2f}'}</p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
 
-        if not isinstance(data, dict):
-            st.error(f"Unexpected backend output type: {type(data)}. Expected dict.")
-            st.stop()
+    # Key indicators straight from the structured output
+    research = data.get("research") or {}
+    for key, label in (("short_term", "Short"), ("medium_term", "Medium"), ("long_term", "Long")):
+        call = research.get(key) or {}
+        if call.get("recommendation"):
+            conf = call.get("confidence")
+            st.caption(f"{label} term: {call['recommendation']}" + (f" ({conf:.2f})" if conf is not None else ""))
+    index = data.get("sentiment_index")
+    if index:
+        st.caption(f"Sentiment index: {index['index']:+.2f} across {index['posts']} posts")
+
+def render_compare_grid(snapshots: dict):
+    columns = st.columns(min(3, len(snapshots)))
+    for i, (coin, job) in enumerate(snapshots.items()):
+        with columns[i % len(columns)]:
+            render_compare_card(coin, job)
+
+@st.fragment(run_every=1.0)
+def compare_progress(job_ids: dict):
+    """Poll every coin's job; cards fill in as each analysis finishes."""
+    snapshots = {coin: jobs.get(job_id) for coin, job_id in job_ids.items()}
+    render_compare_grid(snapshots)
+    if all(job is None or job["status"] not in ACTIVE for job in snapshots.values()):
+        st.rerun()  # stop polling; the full rerun renders the finished grid once
+
+
+# === Results fragments: interactions rerun only the fragment, not the page ===
+REPORT_TABS = {
+    "News": "news",
+    "Fundamentals": "fundamentals",
+    "Technical": "technical",
+    "Chart": "chart",
+    "Sentiment": "sentiment",
+    "Overall Summary": "overall",
+}
 
-        st.session_state.analysis_data = data
-        st.session_state.user_inputs = {
-            "coin": coin_label,
-            "trader": trader_label,
-            "horizon": horizon_label,
-        }
-        st.session_state.show_results = True
-        st.session_state.animating = False
-        st.rerun()
+@st.cache_data(show_spinner=False, max_entries=64)
+def parse_overall_text(raw: str) -> dict:
+    return parse_research_text(raw)
+
+def parse_overall(data: dict) -> dict:
+    """Structured research from the pipeline; free text is parsed once (and cached) as a fallback."""
+    return data.get("research") or parse_overall_text(data["reports"]["overall"]["raw"])
+
+def price_chart(chart: dict):
+    """Close with Bollinger Bands over RSI; the series arrive already downsampled server-side."""
+    if not chart:
+        st.info("No price history available for this run.")
+        return
+    price = pd.DataFrame(chart["price"])
+    price["time"] = pd.to_datetime(price.pop("x"), unit="ms")
+    rsi = pd.DataFrame(chart["rsi"])
+    rsi["time"] = pd.to_datetime(rsi.pop("x"), unit="ms")
+
+    x = alt.X("time:T", title=None)
+    band = alt.Chart(price).mark_area(opacity=0.15).encode(
+        x=x, y=alt.Y("bb_lower:Q", title="Price (USD)", scale=alt.Scale(zero=False)), y2="bb_upper:Q"
+    )
+    lines = alt.Chart(price).transform_fold(
+        ["close", "bb_middle", "bb_upper", "bb_lower"], as_=["series", "value"]
+    ).mark_line(strokeWidth=1.5).encode(
+        x=x, y=alt.Y("value:Q", scale=alt.Scale(zero=False)), color=alt.Color("series:N", title=None)
+    )
+    rsi_line = alt.Chart(rsi).mark_line(strokeWidth=1.5).encode(
+        x=x, y=alt.Y("rsi:Q", title="RSI (14)", scale=alt.Scale(domain=[0, 100]))
+    )
+    levels = alt.Chart(pd.DataFrame({"level": [30, 70]})).mark_rule(strokeDash=[4, 4]).encode(y="level:Q")
+
+    st.altair_chart((band + lines).properties(height=280), use_container_width=True)
+    st.altair_chart((rsi_line + levels).properties(height=140), use_container_width=True)
+    st.caption(f"{len(price)} of {chart.get('source_points', len(price))} points shown")
+
+
+@st.cache_data(show_spinner=False, ttl=60)
+def sentiment_history(coin: str, days: int = 30) -> list:
+    return sentiment_store.series(coin, days=days)
+
+
+def sentiment_trend_chart(coin: str):
+    """Lexicon index per run for news and social posts over the last 30 days."""
+    rows = sentiment_history(coin)
+    if len(rows) < 2:
+        st.caption("The sentiment trend appears once this coin has been analysed a few times.")
+        return
+    history = pd.DataFrame(rows)
+    history["time"] = pd.to_datetime(history["recorded_at"], unit="s")
+    line = alt.Chart(history).mark_line(point=True, strokeWidth=1.5).encode(
+        x=alt.X("time:T", title=None),
+        y=alt.Y("index:Q", title="Sentiment index", scale=alt.Scale(domain=[-1, 1])),
+        color=alt.Color("source:N", title=None),
+        tooltip=["source", "time", "index", "positive", "negative", "neutral", "volume"],
+    )
+    zero = alt.Chart(pd.DataFrame({"level": [0]})).mark_rule(strokeDash=[4, 4]).encode(y="level:Q")
+    st.markdown("#### Sentiment trend (30 days)")
+    st.altair_chart((line + zero).properties(height=220), use_container_width=True)
+
+
+@st.fragment
+def report_tabs(data: dict):
+    """Only the selected report is rendered; switching reports reruns just this fragment."""
+    choice = st.radio(
+        "Report", list(REPORT_TABS), horizontal=True, label_visibility="collapsed", key="report_tab"
+    )
+    report = REPORT_TABS[choice]
+    if report == "chart":
+        price_chart(data.get("chart"))
+        return
+    if report != "overall":
+        st.markdown(data["reports"][report]["raw"])
+        if report == "sentiment":
+            sentiment_trend_chart(data.get("coin", ""))
+        return
+
+    parsed = parse_overall(data)
+
+    # Optional: wrap with a class to target CSS tweaks
+    st.markdown("<div class='report-overall'>", unsafe_allow_html=True)
+
+    # Market Summary (major header; one paragraph per section)
+    st.markdown("#### Market Summary")
+    for section in ["fundamentals", "news", "sentiment", "technicals"]:
+        if parsed["market_summary"].get(section):
+            st.markdown(f"**{section.capitalize()}:** {parsed['market_summary'][section]}")
+
+@st.fragment
+def explain_panel(data: dict):
+    # Risk narrative is an extra LLM call, so it is only generated on request
+    with st.expander("Why this verdict?"):
+        if data.get("explanation"):
+            st.markdown(data["explanation"])
+        elif st.button("Explain this recommendation", key="explain_btn"):
+            with st.spinner("Neu is writing up the reasoning"):
+                explanation = explain_decision(data)
+            # Kept on this session's copy (and the result cache), never on the shared job result
+            st.session_state.analysis_data = save_explanation(data, explanation)
+            st.markdown(explanation)
 
 
 # === PAGE TITLE ===
-# === FORM or RESULTS ===
-if not st.session_state.show_results:
+# === COMPARISON, FORM, PROGRESS or RESULTS ===
+if st.session_state.compare_jobs:
+    inputs = st.session_state.user_inputs
+    st.markdown(f"#### Neu's Verdicts · {escape(inputs.get('horizon', ''))}")
+    snapshots = {
+        coin: jobs.get(job_id) for coin, job_id in st.session_state.compare_jobs.items()
+    }
+    if any(job is not None and job["status"] in ACTIVE for job in snapshots.values()):
+        compare_progress(st.session_state.compare_jobs)
+    else:
+        render_compare_grid(snapshots)
+    st.button("🔄 New analysis", use_container_width=True, on_click=reset_form)
+
+elif st.session_state.job_id and not st.session_state.show_results:
+    job_progress(st.session_state.job_id)
+
+elif not st.session_state.show_results:
     fade_class = st.session_state.fade_class if "fade_class" in st.session_state else "form-container"
 
     st.markdown(
@@ -116,16 +452,20 @@ if not st.session_state.show_results:
     )
 
     st.markdown(f"<div class='{fade_class}'>", unsafe_allow_html=True)
+    compare_mode = st.toggle("Compare several coins", key="compare_mode")
     with st.form("analysis_form", clear_on_submit=False):
-        coin_label = st.selectbox(
-            "🪙 What cryptocurrency are interested in today",
-            [
-                "Bitcoin", "Ethereum", "Ripple", "Tether", "Binance coin", "Solana",
-                "USD Coin", "Dogecoin", "TRON", "Cardano", "Hyperliquid (HYPE)", "Stellar", 
-                "Sui", "Chainlink", "Hedera", "Bitcoin cash", "Avalanche", "Wrapped Bitcoin", 
-                "Toncoin", "Polkadot",
-            ]
-        )
+        if compare_mode:
+            coin_labels = st.multiselect(
+                f"🪙 Pick up to {MAX_COMPARE} cryptocurrencies to compare",
+                COIN_OPTIONS,
+                default=COIN_OPTIONS[:3],
+                max_selections=MAX_COMPARE,
+            )
+        else:
+            coin_label = st.selectbox(
+                "🪙 What cryptocurrency are interested in today",
+                COIN_OPTIONS,
+            )
 
         trader = st.radio(
             "What describes you best?",
@@ -140,7 +480,12 @@ if not st.session_state.show_results:
 
 
         submit = st.form_submit_button("Run Analytics", use_container_width=True)
-        if submit:
+        if submit and compare_mode:
+            if coin_labels:
+                run_comparison(coin_labels, trader, duration)
+            else:
+                st.warning("Pick at least one coin to compare.")
+        elif submit:
             run_analysis(coin_label, trader, duration)
 
     st.markdown("</div>", unsafe_allow_html=True)
@@ -160,6 +505,15 @@ else:
     if coin_name:
         st.markdown(f"#### Neu's Verdict for {coin_name}")
 
+    # How old the result is, with an explicit refresh for a fresh run
+    age_col, refresh_col = st.columns([3, 1])
+    with age_col:
+        st.caption(f"Analysis from {format_age(data.get('generated_at'))}")
+    with refresh_col:
+        refresh = st.button("↻ Refresh", key="refresh_btn", use_container_width=True)
+    if refresh:
+        run_analysis(inputs["coin"], inputs["trader"], inputs["horizon"], refresh=True)
+
     final_decision = _coerce_text(data.get("final_decision", "No decision made"))
     horizon_token = data.get("horizon")
     confidence = data.get("confidence")
@@ -182,30 +536,10 @@ else:
     except Exception:
         conf_val = None
 
-    # ---- classes for decision (buy/hold/sell/neutral) ----
-    fd_norm = final_decision.strip().lower()
-    if "buy" in fd_norm:
-        decision_class = "status-buy"
-    elif "hold" in fd_norm:
-        decision_class = "status-hold"
-    elif "sell" in fd_norm:
-        decision_class = "status-sell"
-    else:
-        decision_class = "status-neutral"
-
-    
-    # ---- classes for confidence bands ----
-    if conf_val is None:
-        conf_class = "conf-unknown"
-        conf_display = "N/A"
-    else:
-        conf_display = f"{conf_val:.2f}"
-        if conf_val < 0.5:
-            conf_class = "conf-low"
-        elif conf_val < 0.7:
-            conf_class = "conf-mid"
-        else:
-            conf_class = "conf-high"
+    # ---- classes for decision (buy/hold/sell/neutral) and confidence bands ----
+    decision_class = decision_class_for(final_decision)
+    conf_class = conf_class_for(conf_val)
+    conf_display = "N/A" if conf_val is None else f"{conf_val:.2f}"
 
     final_reason = _coerce_text(data.get("final_reason") or "No reason provided")
 
@@ -241,89 +575,8 @@ else:
     
     st.markdown(cards_html, unsafe_allow_html=True)
 
-
-    SECTION_NAMES = r"(Fundamentals?|News|Sentiment|Technicals?)"
-    def _canon(name: str) -> str:
-        n = name.strip().lower()
-        if n.startswith("fundamental"):
-            return "Fundamentals"
-        if n.startswith("technical"):
-            return "Technicals"
-        if n.startswith("news"):
-            return "News"
-        return "Sentiment"
-
-    def parse_overall(raw: str):
-        out = {"summaries": {}, "recs": {}, "advice": {}}
-        text = (raw or "").strip()
-
-        # --- Market Summary body ---
-        ms = re.search(
-            r"Market Summary:\s*(.*?)(?:\n{2,}|(?:Short|Medium|Long)[^\n]*Recommendation:|Existing Holder Advice:|New Investor Advice:|$)",
-            text, re.IGNORECASE | re.DOTALL
-        )
-        if ms:
-            body = ms.group(1).strip()
-            body = re.sub(r"[•*\-]\s*", "", body)  # drop bullets
-
-            for m in re.finditer(
-                rf"{SECTION_NAMES}:\s*(.*?)(?=(?:\s*{SECTION_NAMES}:)|(?:\s*(?:Short|Medium|Long)[^\n]*Recommendation:)|\s*Existing Holder Advice:|\s*New Investor Advice:|$)",
-                body, re.IGNORECASE | re.DOTALL
-            ):
-                name = _canon(m.group(1))
-                content = re.sub(r"\s+", " ", m.group(2)).strip()
-                if content:
-                    out["summaries"][name] = content
-
-        # --- Advice blocks ---
-        m = re.search(r"Existing Holder Advice:\s*([A-Za-z ]+)\s*[—\-–]\s*Reason:\s*(.*?)(?=New Investor Advice:|$)",
-                      text, re.IGNORECASE | re.DOTALL)
-        if m:
-            out["advice"]["existing"] = {
-                "action": m.group(1).strip(),
-                "reason": re.sub(r"\s+", " ", m.group(2)).strip()
-            }
-
-        m = re.search(r"New Investor Advice:\s*([A-Za-z ]+)\s*[—\-–]\s*Reason:\s*(.*)$",
-                      text, re.IGNORECASE | re.DOTALL)
-        if m:
-            out["advice"]["new"] = {
-                "action": m.group(1).strip(),
-                "reason": re.sub(r"\s+", " ", m.group(2)).strip()
-            }
-
-        return out
-
-
-    # Tab Bar for Reports
-    tab_labels = ["News", "Fundamentals", "Technical", "Sentiment", "Overall Summary"]
-    tabs = st.tabs(tab_labels)
-
-    with tabs[0]:
-        st.markdown(data["reports"]["news"]["raw"])
-
-    with tabs[1]:
-        st.markdown(data["reports"]["fundamentals"]["raw"])
-
-    with tabs[2]:
-        st.markdown(data["reports"]["technical"]["raw"])
-
-    with tabs[3]:
-        st.markdown(data["reports"]["sentiment"]["raw"])
-
-    with tabs[4]:
-        overall_raw = data["reports"]["overall"]["raw"]
-        parsed = parse_overall(overall_raw)
-
-        # Optional: wrap with a class to target CSS tweaks
-        st.markdown("<div class='report-overall'>", unsafe_allow_html=True)
-
-        # Market Summary (major header; one paragraph per section)
-        st.markdown("#### Market Summary")
-        for section in ["Fundamentals", "News", "Sentiment", "Technicals"]:
-            if section in parsed["summaries"]:
-                st.markdown(f"**{section}:** {parsed['summaries'][section]}")
-
+    explain_panel(data)
+    report_tabs(data)
 
     # Try Another Coin Button
     st.button("🔄 Try another coin", use_container_width=True, on_click=reset_form)
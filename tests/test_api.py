@@ -0,0 +1,142 @@
+# tests/test_api.py
+import threading
+
+import pytest
+from starlette.testclient import TestClient
+
+import api
+from api import create_app
+
+
+class StubRunner:
+    """Stands in for run_trading_pipeline; blocks until released so jobs stay active."""
+
+    def __init__(self, block=False):
+        self.calls = []
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def __call__(self, on_token=None, on_progress=None, **kwargs):
+        self.calls.append(kwargs)
+        self.release.wait(5)
+        on_progress("market_analyst", 0.5)
+        on_progress("research_manager", 1.0)
+        return {"coin": kwargs["coin"], "decision": "HOLD"}
+
+
+@pytest.fixture
+def blocked():
+    runner = StubRunner(block=True)
+    with TestClient(create_app(runner=runner, max_workers=1, max_queue=2)) as client:
+        yield client, runner
+        runner.release.set()
+
+
+def _wait_done(client, job_id):
+    for event in _events(client, job_id):
+        pass
+    return client.get(f"/analyses/{job_id}").json()
+
+
+def _events(client, job_id):
+    with client.stream("GET", f"/analyses/{job_id}/events") as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        name = None
+        for line in response.iter_lines():
+            if line.startswith("event: "):
+                name = line[len("event: "):]
+            elif line.startswith("data: "):
+                yield name, line[len("data: "):]
+
+
+def test_submit_returns_202_and_location():
+    with TestClient(create_app(runner=StubRunner(), max_workers=1, max_queue=2)) as client:
+        response = client.post("/analyses", json={"coin": "bitcoin", "duration": "long_term"})
+        assert response.status_code == 202
+        job = response.json()
+        assert response.headers["location"] == f"/analyses/{job['id']}"
+        assert job["request"]["coin"] == "bitcoin" and job["request"]["duration"] == "long_term"
+        assert _wait_done(client, job["id"])["status"] == "done"
+        assert client.get(f"/analyses/{job['id']}/result").json()["decision"] == "HOLD"
+
+
+def test_identical_active_submissions_share_a_job(blocked):
+    client, runner = blocked
+    first = client.post("/analyses", json={"coin": "bitcoin"}).json()
+    second = client.post("/analyses", json={"coin": "Bitcoin"}).json()
+    assert first["id"] == second["id"]
+
+
+def test_refresh_never_joins_a_cached_job(blocked):
+    client, runner = blocked
+    cached = client.post("/analyses", json={"coin": "bitcoin"}).json()
+    fresh = client.post("/analyses", json={"coin": "bitcoin", "refresh": True}).json()
+    assert cached["id"] != fresh["id"]
+    runner.release.set()
+    _wait_done(client, fresh["id"])
+    assert sorted(call["use_cache"] for call in runner.calls) == [False, True]
+
+
+@pytest.mark.parametrize("refresh", ["false", "true", 0, 1, None])
+def test_refresh_must_be_a_json_boolean(refresh):
+    with TestClient(create_app(runner=StubRunner(), max_workers=1, max_queue=2)) as client:
+        response = client.post("/analyses", json={"coin": "bitcoin", "refresh": refresh})
+        assert response.status_code == 400
+        assert "refresh" in response.json()["error"]
+
+
+def test_invalid_bodies_are_rejected():
+    with TestClient(create_app(runner=StubRunner(), max_workers=1, max_queue=2)) as client:
+        assert client.post("/analyses", content=b"{not json").status_code == 400
+        assert client.post("/analyses", json={"duration": "short_term"}).status_code == 400
+        assert client.post("/analyses", json={"coin": "btc", "trade_date": "19-10-2026"}).status_code == 400
+
+
+def test_full_queue_returns_503_with_retry_after(blocked):
+    client, runner = blocked
+    assert client.post("/analyses", json={"coin": "bitcoin"}).status_code == 202
+    assert client.post("/analyses", json={"coin": "ethereum"}).status_code == 202
+    response = client.post("/analyses", json={"coin": "solana"})
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(api.RETRY_AFTER_SECONDS)
+    # A duplicate of an active job still fits: it shares the existing one
+    assert client.post("/analyses", json={"coin": "bitcoin"}).status_code == 202
+
+
+def test_unknown_job_is_404():
+    with TestClient(create_app(runner=StubRunner(), max_workers=1, max_queue=2)) as client:
+        for path in ("/analyses/nope", "/analyses/nope/result", "/analyses/nope/events"):
+            assert client.get(path).status_code == 404
+
+
+def test_result_is_202_while_running(blocked):
+    client, runner = blocked
+    job = client.post("/analyses", json={"coin": "bitcoin"}).json()
+    assert client.get(f"/analyses/{job['id']}/result").status_code == 202
+
+
+def test_events_stream_nodes_in_order_then_status(monkeypatch):
+    monkeypatch.setattr(api, "EVENT_POLL_SECONDS", 0.01)
+    with TestClient(create_app(runner=StubRunner(), max_workers=1, max_queue=2)) as client:
+        job = client.post("/analyses", json={"coin": "bitcoin"}).json()
+        names = [name for name, _ in _events(client, job["id"])]
+    assert names == ["node", "node", "done"]
+
+
+def test_healthz_reports_queue(blocked):
+    client, runner = blocked
+    client.post("/analyses", json={"coin": "bitcoin"})
+    health = client.get("/healthz").json()
+    assert health["status"] == "ok"
+    assert health["queue"] == {"active": 1, "max": 2}
+    assert health["accepting"] is True
+
+
+def test_metrics_are_prometheus_text():
+    with TestClient(create_app(runner=StubRunner(), max_workers=1, max_queue=2)) as client:
+        client.post("/analyses", json={"coin": "bitcoin"})
+        response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "neutrofi_jobs_total" in response.text
@@ -0,0 +1,48 @@
+# tests/test_history_cache.py
+from datetime import date, datetime, timedelta, timezone
+
+from toolkit.history_cache import HistoryCache, as_of_date, end_of_day
+
+
+def _utc_today():
+    return datetime.now(timezone.utc).date()
+
+
+def test_as_of_date_needs_the_point_in_time_flag():
+    past = (_utc_today() - timedelta(days=30)).isoformat()
+    assert as_of_date(past, point_in_time=True) == date.fromisoformat(past)
+    # A past date alone no longer switches a run to history
+    assert as_of_date(past, point_in_time=False) is None
+
+
+def test_as_of_date_today_is_live():
+    assert as_of_date(_utc_today().isoformat(), point_in_time=True) is None
+    assert as_of_date(None, point_in_time=True) is None
+    assert as_of_date("not-a-date", point_in_time=True) is None
+
+
+def test_end_of_day_is_utc():
+    assert end_of_day(date(2025, 1, 1)) == datetime(2025, 1, 1, 23, 59, 59, tzinfo=timezone.utc).timestamp()
+
+
+def test_history_cache_stores_only_settled_non_errors():
+    cache = HistoryCache(":memory:")
+    calls = []
+
+    def fetch(value):
+        def run():
+            calls.append(value)
+            return value
+        return run
+
+    settled = end_of_day(date(2024, 1, 1))
+    assert cache.get_or_fetch("a", fetch([1, 2]), settled) == [1, 2]
+    assert cache.get_or_fetch("a", fetch([3]), settled) == [1, 2]
+
+    cache.get_or_fetch("err", fetch({"error": "boom"}), settled)
+    cache.get_or_fetch("err", fetch({"error": "boom"}), settled)
+
+    recent = datetime.now(timezone.utc).timestamp()
+    cache.get_or_fetch("live", fetch([4]), recent)
+    cache.get_or_fetch("live", fetch([5]), recent)
+    assert calls == [[1, 2], {"error": "boom"}, {"error": "boom"}, [4], [5]]
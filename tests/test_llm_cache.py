@@ -0,0 +1,103 @@
+# tests/test_llm_cache.py
+import warnings
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, Generation
+
+import toolkit.llm_cache as llm_cache
+from toolkit.llm_cache import SQLiteLLMCache, bypass_llm_cache
+
+LLM = "gemini-2.5-flash|temperature=0"
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache.time, "time", clock)
+    return clock
+
+
+def _gen(text, input_tokens=0, output_tokens=0):
+    usage = {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+    return ChatGeneration(message=AIMessage(content=text, usage_metadata=usage))
+
+
+def test_round_trip_without_beta_warning():
+    cache = SQLiteLLMCache(":memory:")
+    cache.update("prompt", LLM, [Generation(text="plain"), _gen("chat")])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        hit = cache.lookup("prompt", LLM)
+    assert hit[0].text == "plain"
+    assert hit[1].message.content == "chat"
+
+
+def test_key_normalises_whitespace_and_includes_the_model():
+    cache = SQLiteLLMCache(":memory:")
+    cache.update("Analyse  btc\n\nnews ", LLM, [Generation(text="cached")])
+    assert cache.lookup("Analyse btc news", LLM)[0].text == "cached"
+    assert cache.lookup("Analyse btc news", "gemini-2.5-pro|temperature=0") is None
+    assert cache.lookup("Analyse eth news", LLM) is None
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = SQLiteLLMCache(":memory:", ttl=60)
+    cache.update("prompt", LLM, [Generation(text="cached")])
+    clock.now += 59
+    assert cache.lookup("prompt", LLM) is not None
+    clock.now += 2
+    assert cache.lookup("prompt", LLM) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_evicted_past_the_cap(clock):
+    cache = SQLiteLLMCache(":memory:", max_entries=2)
+    for name in ("a", "b"):
+        cache.update(name, LLM, [Generation(text=name)])
+        clock.now += 1
+    cache.lookup("a", LLM)  # "b" is now the least recently used
+    clock.now += 1
+    cache.update("c", LLM, [Generation(text="c")])
+
+    assert cache.stats()["entries"] == 2
+    assert cache.lookup("b", LLM) is None
+    assert cache.lookup("a", LLM) is not None and cache.lookup("c", LLM) is not None
+
+
+def test_bypass_skips_lookup_and_store():
+    cache = SQLiteLLMCache(":memory:")
+    cache.update("prompt", LLM, [Generation(text="cached")])
+    with bypass_llm_cache():
+        assert cache.lookup("prompt", LLM) is None
+        cache.update("other", LLM, [Generation(text="fresh")])
+    assert cache.lookup("prompt", LLM) is not None
+    assert cache.lookup("other", LLM) is None
+
+
+def test_stats_count_hits_misses_and_saved_tokens():
+    cache = SQLiteLLMCache(":memory:")
+    cache.lookup("prompt", LLM)
+    cache.update("prompt", LLM, [_gen("answer", input_tokens=120, output_tokens=30)])
+    cache.lookup("prompt", LLM)
+    cache.lookup("prompt", LLM)
+
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1
+    assert stats["hit_rate"] == round(2 / 3, 3)
+    assert stats["saved_input_tokens"] == 240 and stats["saved_output_tokens"] == 60
+    assert stats["entries"] == 1
+
+
+def test_persists_across_instances(tmp_path):
+    path = str(tmp_path / "llm.sqlite")
+    SQLiteLLMCache(path).update("prompt", LLM, [Generation(text="cached")])
+    assert SQLiteLLMCache(path).lookup("prompt", LLM)[0].text == "cached"
@@ -0,0 +1,95 @@
+# tests/test_newstool.py
+from pathlib import Path
+
+import pytest
+
+from tools.newstool import (
+    COVERAGE_BONUS,
+    NewsAggregator,
+    canonical_url,
+    parse_feed,
+    title_fingerprint,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+FEEDS = {"Example": str(FIXTURES / "feed_rss.xml"), "Other": str(FIXTURES / "feed_atom.xml")}
+
+
+def test_parse_rss():
+    items = parse_feed((FIXTURES / "feed_rss.xml").read_bytes(), "Example")
+    assert [i["Title"] for i in items] == [
+        "Ethereum upgrade goes live on mainnet",
+        "Bitcoin ETF inflows hit a monthly high",
+        "Stablecoin bill clears committee",
+    ]
+    assert items[0]["Published"] == "Aug 05 2025 14:30 UTC"
+    assert items[1]["Published"] == "Aug 05 2025 09:00 UTC"  # dc:date
+    assert all(i["Source"] == "Example" for i in items)
+
+
+def test_parse_atom():
+    items = parse_feed((FIXTURES / "feed_atom.xml").read_bytes(), "Other")
+    assert [i["URL"] for i in items] == [
+        "https://other.example.org/news/ethereum-upgrade",
+        "https://other.example.org/news/eth-staking",
+    ]
+    assert items[1]["Published"] == "Aug 03 2025 10:00 UTC"  # offset normalised to UTC
+
+
+def test_parse_invalid_feed():
+    assert parse_feed(b"<rss><channel>", "Broken") == []
+
+
+def test_canonical_url_and_fingerprint():
+    assert canonical_url("http://www.Example.com/eth-upgrade/?utm_source=rss&id=3#top") == (
+        "https://example.com/eth-upgrade?id=3"
+    )
+    assert title_fingerprint("Ethereum upgrade goes live on mainnet") == title_fingerprint(
+        "Mainnet goes live: Ethereum upgrade"
+    )
+
+
+@pytest.mark.parametrize("coin", ["eth", "ETH", "ethereum"])
+def test_fetch_matches_symbol_and_name(coin):
+    news = NewsAggregator(feeds=FEEDS).fetch(coin)
+    titles = [i["Title"] for i in news]
+    # The two outlets' upgrade stories are one item; "ETH" and "Ethereum" headlines both match
+    assert len(titles) == 2
+    assert any("Ethereum upgrade" in t for t in titles)
+    assert "ETH staking queue grows" in titles
+    assert not any("Bitcoin" in t or "Stablecoin" in t for t in titles)
+
+
+def test_fetch_without_matches():
+    assert "error" in NewsAggregator(feeds=FEEDS).fetch("dogecoin")
+
+
+def _item(title, url, ts):
+    return {"Title": title, "Source": "x", "Published": "", "URL": url, "_ts": ts}
+
+
+def test_dedupe_collapses_url_and_title_duplicates():
+    items = [
+        _item("Bitcoin hits new high", "https://a.com/btc-high?utm_medium=x", 100.0),
+        _item("Bitcoin hits new high", "https://b.com/other-path", 90.0),
+        _item("Different story", "https://www.a.com/btc-high/", 80.0),
+    ]
+    ranked = NewsAggregator._dedupe(items)
+    assert len(ranked) == 1
+    # The newest copy represents the story
+    assert ranked[0]["_ts"] == 100.0
+
+
+def test_ranking_by_recency_and_coverage():
+    widely_covered = [
+        _item("Solana outage resolved", f"https://outlet{i}.com/sol", 1000.0) for i in range(3)
+    ]
+    newer_single = _item("Cardano governance vote", "https://a.com/ada", 1000.0 + COVERAGE_BONUS)
+    newest_single = _item("Polkadot parachain launch", "https://a.com/dot", 1000.0 + 3 * COVERAGE_BONUS)
+
+    ranked = NewsAggregator._dedupe([newer_single, *widely_covered, newest_single])
+    assert [i["Title"] for i in ranked] == [
+        "Polkadot parachain launch",
+        "Solana outage resolved",  # two extra outlets outrank one extra bonus of recency
+        "Cardano governance vote",
+    ]
@@ -0,0 +1,61 @@
+# tests/test_scoring.py
+import numpy as np
+import pytest
+
+from toolkit.scoring import DAY_MS, decision_matrix, forward_returns, horizon_matrices, research_horizon, score
+
+COINS = ["btc", "eth"]
+DATES = ["2025-01-06", "2025-01-13"]
+
+
+def _result(coin, trade_date, short, medium, long):
+    research = {
+        key: {"recommendation": rec, "confidence": conf}
+        for key, (rec, conf) in zip(("short_term", "medium_term", "long_term"), (short, medium, long))
+    }
+    # The risk node's final decision must not be what gets scored
+    return {"coin": coin, "trade_date": trade_date, "final_decision": "Buy", "confidence": 0.99, "research": research}
+
+
+RESULTS = [
+    _result("btc", "2025-01-06", ("Buy", 0.8), ("Hold", 0.6), ("Sell", 0.7)),
+    _result("eth", "2025-01-13", ("Sell", 0.65), ("Buy", 0.55), (None, None)),
+    {"coin": "btc", "trade_date": "2025-01-13", "research": None},  # failed research
+]
+
+
+@pytest.mark.parametrize(
+    "days, horizon",
+    [(1, "short_term"), (7, "short_term"), (14, "short_term"), (30, "medium_term"), (60, "medium_term"), (90, "long_term")],
+)
+def test_research_horizon(days, horizon):
+    assert research_horizon(days) == horizon
+
+
+def test_decision_matrix_reads_the_research_call():
+    decisions, confidence = decision_matrix(RESULTS, COINS, DATES, "short_term")
+    np.testing.assert_array_equal(decisions, [[1.0, np.nan], [np.nan, -1.0]])
+    np.testing.assert_array_equal(confidence, [[0.8, np.nan], [np.nan, 0.65]])
+
+    decisions, _ = decision_matrix(RESULTS, COINS, DATES, "long_term")
+    np.testing.assert_array_equal(decisions, [[-1.0, np.nan], [np.nan, np.nan]])
+
+
+def test_horizon_matrices_stack_one_matrix_per_window():
+    decisions, confidence = horizon_matrices(RESULTS, COINS, DATES, [7, 30, 90])
+    assert decisions.shape == confidence.shape == (3, 2, 2)
+    assert decisions[0, 0, 0] == 1.0 and decisions[1, 0, 0] == 0.0 and decisions[2, 0, 0] == -1.0
+
+
+def test_score_uses_each_windows_calls():
+    start = 1_736_208_000_000.0  # 2025-01-07 00:00 UTC
+    # BTC rises 10% over the first 7 days and falls back below the start by day 90
+    series = {"btc": [[start, 100.0], [start + 7 * DAY_MS, 110.0], [start + 90 * DAY_MS, 90.0]]}
+    returns = forward_returns(series, ["btc"], [start], [7, 90])
+    decisions, confidence = horizon_matrices(RESULTS[:1], ["btc"], DATES[:1], [7, 90])
+
+    report = score(decisions, confidence, returns, [7, 90], ["btc"])
+    assert report["7d"]["hit_rate"] == 1.0  # short-term Buy, price rose
+    assert report["90d"]["hit_rate"] == 1.0  # long-term Sell, price fell
+    assert report["7d"]["calibration"]["bins"][0]["mean_confidence"] == 0.8
+    assert report["90d"]["calibration"]["bins"][0]["mean_confidence"] == 0.7
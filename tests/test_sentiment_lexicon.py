@@ -0,0 +1,73 @@
+# tests/test_sentiment_lexicon.py
+import pytest
+
+from tools.sentiment_lexicon import (
+    NEUTRAL_BAND,
+    format_index_header,
+    prescore_posts,
+    score_post,
+    select_posts,
+    sentiment_index,
+)
+
+
+def test_scores_stay_in_range():
+    for text in ("moon moon moon 🚀🚀🚀 bullish!!!!", "scam rug pull crash dump rekt", ""):
+        assert -1.0 <= score_post(text) <= 1.0
+
+
+def test_polarity():
+    assert score_post("BTC is bullish, breakout incoming") > NEUTRAL_BAND
+    assert score_post("rug pull scam") < -NEUTRAL_BAND
+    assert abs(score_post("the weather is nice today")) <= NEUTRAL_BAND
+
+
+def test_negation_flips_polarity():
+    assert score_post("bullish") > 0
+    assert score_post("not bullish at all") < 0
+
+
+def test_intensifier_and_exclamation_amplify():
+    assert score_post("very bullish") > score_post("bullish")
+    assert score_post("bullish!!!") > score_post("bullish")
+
+
+def test_emoji_counts():
+    assert score_post("to the moon 🚀") > score_post("to the moon")
+
+
+def test_sentiment_index_counts():
+    result = sentiment_index([0.6, 0.2, -0.5, 0.0])
+    assert result == {
+        "index": pytest.approx(0.075),
+        "positive": 2,
+        "negative": 1,
+        "neutral": 1,
+        "posts": 4,
+    }
+
+
+def test_sentiment_index_empty():
+    assert sentiment_index([]) == {"index": 0.0, "positive": 0, "negative": 0, "neutral": 0, "posts": 0}
+
+
+def test_select_posts_prefers_on_topic():
+    posts = ["Solana rally looks strong", "Bitcoin rally looks strong"]
+    scores = [score_post(p) for p in posts]
+    assert select_posts(posts, scores, k=1, coin_terms=["bitcoin", "btc"]) == ["Bitcoin rally looks strong"]
+
+
+def test_select_posts_penalises_near_duplicates():
+    posts = ["Bitcoin rally looks strong", "Bitcoin rally looks strong!", "Bitcoin adoption keeps growing"]
+    scores = [score_post(p) for p in posts]
+    selected = select_posts(posts, scores, k=2, coin_terms=["bitcoin"], diversity=2.0)
+    assert "Bitcoin adoption keeps growing" in selected
+
+
+def test_prescore_keeps_full_precision_index():
+    posts = ["Bitcoin bullish breakout", "ETH crash dump", "cat pictures today"]
+    result = prescore_posts(posts, k=2, coin_terms=["bitcoin"])
+    assert result["posts"] == 3 and len(result["selected"]) == 2
+    assert result["index"] == round(sum(score_post(p) for p in posts) / 3, 4)
+    # Only the LLM-facing header is rounded
+    assert format_index_header(result).startswith(f"Sentiment index: {result['index']:+.2f} ")
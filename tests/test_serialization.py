@@ -0,0 +1,49 @@
+# tests/test_serialization.py
+import json
+from pathlib import Path
+
+import pytest
+
+from toolkit.serialization import TOOL_BUDGETS, encode_posts, encode_tool_result, estimate_tokens
+
+FIXTURES = Path(__file__).parent / "fixtures"
+TOOL_RESULTS = json.loads((FIXTURES / "tool_results.json").read_text())
+
+
+@pytest.mark.parametrize("tool_name", sorted(TOOL_RESULTS))
+def test_encoded_result_uses_fewer_tokens_than_json(tool_name):
+    data = TOOL_RESULTS[tool_name]
+    encoded = encode_tool_result(tool_name, data)
+    baseline = json.dumps(data, indent=2)
+    assert estimate_tokens(encoded) < estimate_tokens(baseline)
+    assert estimate_tokens(encoded) <= TOOL_BUDGETS[tool_name]
+
+
+def test_fundamentals_are_trimmed():
+    encoded = json.loads(encode_tool_result("get_crypto_fundamentals", TOOL_RESULTS["get_crypto_fundamentals"]))
+    assert "Token Platforms" not in encoded and encoded["Token Platforms Count"] == 6
+    assert len(encoded["Token Categories"]) == 5
+    assert "TVL (USD)" not in encoded and "Description" not in encoded
+
+
+def test_news_keeps_the_newest_items_within_budget():
+    news = TOOL_RESULTS["get_crypto_news"]
+    encoded = json.loads(encode_tool_result("get_crypto_news", news))
+    assert 0 < len(encoded) < len(news)
+    assert [item["Title"] for item in encoded] == [item["Title"] for item in news[: len(encoded)]]
+    assert all("URL" not in item for item in encoded)
+
+
+def test_errors_pass_through():
+    assert json.loads(encode_tool_result("get_crypto_news", {"error": "upstream down"})) == {
+        "error": "upstream down"
+    }
+
+
+def test_posts_stay_within_budget():
+    header = "Sentiment index: +0.12 (positive 3, negative 1, neutral 0, posts 4)"
+    posts = [f"post {i} " + "word " * 100 for i in range(50)]
+    encoded = encode_posts(header, posts)
+    assert encoded.startswith(header + "\n\n")
+    assert estimate_tokens(encoded) <= TOOL_BUDGETS["get_reddit_sentiment_posts"]
+    assert estimate_tokens(encoded) < estimate_tokens(json.dumps({"header": header, "posts": posts}, indent=2))
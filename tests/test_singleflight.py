@@ -0,0 +1,89 @@
+# tests/test_singleflight.py
+import threading
+import time
+
+import pytest
+
+from toolkit.metrics import RunTrace
+from toolkit.singleflight import SingleFlight
+
+
+def _lead(flight, key, started, release, events, result="shared"):
+    def work():
+        flight.emit(key, "node", "news")
+        started.set()
+        release.wait(5)
+        flight.emit(key, "node", "research")
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return flight.do(key, work, listener=lambda *e: events.append(e))
+
+
+def test_followers_get_the_leaders_events_including_earlier_ones():
+    flight = SingleFlight("test")
+    started, release = threading.Event(), threading.Event()
+    leader_events, follower_events, results = [], [], []
+
+    leader = threading.Thread(
+        target=lambda: results.append(_lead(flight, "k", started, release, leader_events))
+    )
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(
+        target=lambda: results.append(
+            flight.do("k", lambda: "not run", listener=lambda *e: follower_events.append(e))
+        )
+    )
+    follower.start()
+    while len(flight._calls["k"].listeners) < 2:  # follower has joined
+        time.sleep(0.001)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert results == ["shared", "shared"]
+    expected = [("node", "news"), ("node", "research")]
+    assert leader_events == expected and follower_events == expected
+
+
+def test_broken_listener_does_not_fail_the_call():
+    flight = SingleFlight("test")
+
+    def broken(*event):
+        raise RuntimeError("sink gone")
+
+    def work():
+        flight.emit("k", "node", "news")
+        return "ok"
+
+    assert flight.do("k", work, listener=broken) == "ok"
+
+
+def test_error_reaches_the_leader_and_emit_after_completion_is_a_no_op():
+    flight = SingleFlight("test")
+    started, release = threading.Event(), threading.Event()
+    release.set()
+    events = []
+    with pytest.raises(ValueError):
+        _lead(flight, "k", started, release, events, result=ValueError("upstream"))
+    flight.emit("k", "node", "late")
+    assert events == [("node", "news"), ("node", "research")]
+
+
+def test_trace_merge_adds_the_shared_analysis():
+    leader = RunTrace()
+    leader.nodes["news"] = 1.5
+    leader.llm_calls.append({"model": "m", "input_tokens": 10, "output_tokens": 5, "seconds": 1.0})
+    leader.cache["llm"] = {"hit": 1, "miss": 2}
+
+    follower = RunTrace()
+    follower.nodes["risk"] = 0.1
+    follower.cache["llm"] = {"hit": 1, "miss": 0}
+    follower.merge(leader.to_dict())
+
+    merged = follower.to_dict()
+    assert merged["nodes"] == {"risk": 0.1, "news": 1.5}
+    assert merged["llm_tokens"] == {"input": 10, "output": 5}
+    assert merged["cache"]["llm"] == {"hit": 2, "miss": 2}
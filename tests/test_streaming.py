@@ -0,0 +1,57 @@
+# tests/test_streaming.py
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.prompts import ChatPromptTemplate
+
+from agents.streaming import invoke_report
+from toolkit.llm_cache import SQLiteLLMCache
+
+INPUTS = {"coin": "btc", "question": "How is it doing?"}
+
+
+def _chain(cache):
+    # Answers "first answer", then "second answer": a repeated answer came from the cache
+    prompt = ChatPromptTemplate.from_messages([("system", "Report on {coin}."), ("human", "{question}")])
+    return prompt | FakeListChatModel(responses=["first answer", "second answer"], cache=cache)
+
+
+def _sink():
+    received = []
+    return received, {"configurable": {"on_token": lambda key, text: received.append((key, text))}}
+
+
+def test_streamed_report_is_cached_for_the_next_run():
+    cache = SQLiteLLMCache(":memory:")
+    chain = _chain(cache)
+    received, config = _sink()
+    first = invoke_report(chain, INPUTS, config, "news_report", "TABLE\n\n")
+    assert first.content == "first answer"
+    assert "".join(text for _, text in received) == "TABLE\n\nfirst answer"
+    assert cache.stats()["entries"] == 1
+
+    received, config = _sink()
+    second = invoke_report(chain, INPUTS, config, "news_report", "TABLE\n\n")
+    assert second.content == "first answer"
+    assert received == [("news_report", "TABLE\n\n"), ("news_report", "first answer")]
+    assert cache.stats()["hits"] == 1
+
+
+def test_streaming_and_invoke_share_cache_entries():
+    cache = SQLiteLLMCache(":memory:")
+    chain = _chain(cache)
+    assert chain.invoke(INPUTS).content == "first answer"
+
+    received, config = _sink()
+    assert invoke_report(chain, INPUTS, config, "news_report").content == "first answer"
+    assert received == [("news_report", "first answer")]
+
+    # Streamed on a miss, then served to invoke() from the cache
+    eth = {**INPUTS, "coin": "eth"}
+    assert invoke_report(chain, eth, _sink()[1], "news_report").content == "second answer"
+    assert chain.invoke(eth).content == "second answer"
+
+
+def test_uncached_model_still_streams():
+    received, config = _sink()
+    message = invoke_report(_chain(False), INPUTS, config, "news_report")
+    assert message.content == "first answer"
+    assert "".join(text for _, text in received) == "first answer"
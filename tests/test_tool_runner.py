@@ -0,0 +1,61 @@
+# tests/test_tool_runner.py
+import json
+import time
+
+from langchain_core.tools import tool
+
+from agents.tool_runner import run_tool_calls
+
+
+@tool(response_format="content_and_artifact")
+def scored_tool(coin: str) -> tuple:
+    """Text for the LLM plus an exact aggregate."""
+    return f"Sentiment index: +0.12 for {coin}", {"index": 0.1234, "posts": 3}
+
+
+@tool
+def text_tool(coin: str) -> str:
+    """Plain text output."""
+    return f"news for {coin}"
+
+
+@tool
+def empty_tool(coin: str) -> str:
+    """Returns nothing."""
+    return ""
+
+
+@tool
+def slow_tool(coin: str) -> str:
+    """Never answers within the test timeout."""
+    time.sleep(1.0)
+    return "late"
+
+
+class StubToolkit:
+    scored_tool, text_tool, empty_tool, slow_tool = scored_tool, text_tool, empty_tool, slow_tool
+
+    def runnable_config(self, config=None):
+        return dict(config or {})
+
+
+def _call(name, i=0):
+    return {"name": name, "args": {"coin": "btc"}, "id": f"call-{i}"}
+
+
+def test_artifacts_survive_and_order_is_kept():
+    messages = run_tool_calls(StubToolkit(), [_call("scored_tool", 0), _call("text_tool", 1)], "fallback")
+    assert [m.tool_call_id for m in messages] == ["call-0", "call-1"]
+    assert messages[0].content == "Sentiment index: +0.12 for btc"
+    assert messages[0].artifact == {"index": 0.1234, "posts": 3}
+    assert messages[1].content == "news for btc" and messages[1].artifact is None
+
+
+def test_empty_output_uses_fallback():
+    (message,) = run_tool_calls(StubToolkit(), [_call("empty_tool")], "fallback")
+    assert message.content == "fallback"
+
+
+def test_timeout_becomes_error_payload():
+    (message,) = run_tool_calls(StubToolkit(), [_call("slow_tool")], "fallback", timeout=0.05)
+    assert "error" in json.loads(message.content)
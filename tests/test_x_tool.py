@@ -0,0 +1,119 @@
+# tests/test_x_tool.py
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import toolkit.crypto_tools_wrapped as wrapped
+import tools.x_tool as x_tool
+from tools.x_tool import TwitterSentimentScraper
+
+TWEETS = [f"Tweet number {i} about bitcoin and the market today" for i in range(10)]
+
+
+class StubSearch:
+    """Stands in for snscrape's TwitterSearchScraper; counts the scrapes it serves."""
+
+    calls = 0
+    delay = 0.0
+
+    def __init__(self, query):
+        self.query = query
+        StubSearch.calls += 1
+
+    def get_items(self):
+        for text in TWEETS:
+            if StubSearch.delay:
+                time.sleep(StubSearch.delay)
+            yield SimpleNamespace(rawContent=text)
+
+
+@pytest.fixture
+def stub_snscrape(monkeypatch):
+    StubSearch.calls, StubSearch.delay = 0, 0.0
+    monkeypatch.setattr(x_tool, "sntwitter", SimpleNamespace(TwitterSearchScraper=StubSearch))
+    return StubSearch
+
+
+def test_fetch_posts_respects_limit(stub_snscrape):
+    scraper = TwitterSentimentScraper()
+    assert scraper.fetch_posts("btc", limit=3) == TWEETS[:3]
+
+
+def test_fetch_posts_is_cached_per_limit(stub_snscrape):
+    scraper = TwitterSentimentScraper()
+    scraper.fetch_posts("btc", since="2025-08-01", until="2025-08-08", limit=3)
+    scraper.fetch_posts("btc", since="2025-08-01", until="2025-08-08", limit=3)
+    assert stub_snscrape.calls == 1
+
+    # A larger limit is not served from the smaller cached fetch
+    posts = scraper.fetch_posts("btc", since="2025-08-01", until="2025-08-08", limit=8)
+    assert posts == TWEETS[:8]
+    assert stub_snscrape.calls == 2
+
+
+def test_timed_out_fetch_is_not_cached(stub_snscrape):
+    stub_snscrape.delay = 0.02
+    scraper = TwitterSentimentScraper()
+    partial = scraper.fetch_posts("btc", limit=10, timeout=0.05)
+    assert len(partial) < len(TWEETS)
+
+    stub_snscrape.delay = 0.0
+    assert scraper.fetch_posts("btc", limit=10, timeout=0.05) == TWEETS
+    assert stub_snscrape.calls == 2
+
+
+def test_missing_snscrape_fails_soft(monkeypatch):
+    monkeypatch.setattr(x_tool, "sntwitter", None)
+    assert TwitterSentimentScraper().fetch_posts("btc") == []
+
+
+class HungScraper:
+    """An X scraper whose scrape never returns until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def get_cleaned_posts(self, coin, limit=50, timeout=None):
+        self.release.wait()
+        return ["A late tweet that should never reach the caller"]
+
+
+class StubReddit:
+    def get_cleaned_posts(self, coin, limit=10):
+        return ["Bitcoin looks strong this week, buying more on the dip"]
+
+
+def test_hung_x_scrape_is_abandoned(monkeypatch):
+    monkeypatch.setattr(wrapped, "X_TIME_BUDGET", 0.1)
+    hung = HungScraper()
+    toolkit = SimpleNamespace(x_scraper=hung, reddit_scraper=StubReddit())
+    try:
+        start = time.monotonic()
+        output, index = wrapped._collect_social_posts(toolkit, "btc")
+        assert time.monotonic() - start < 1.0
+        assert "buying more on the dip" in output
+        assert "late tweet" not in output
+        assert index["posts"] == 1
+    finally:
+        hung.release.set()
+
+
+def test_x_is_skipped_while_every_slot_is_hung(monkeypatch):
+    monkeypatch.setattr(wrapped, "_x_slots", threading.BoundedSemaphore(1))
+    hung = HungScraper()
+    toolkit = SimpleNamespace(x_scraper=hung, reddit_scraper=StubReddit())
+    try:
+        assert wrapped._fetch_x_posts(toolkit, "btc") is not None
+        assert wrapped._fetch_x_posts(toolkit, "btc") is None
+    finally:
+        hung.release.set()
+
+    # The slot comes back once the scrape finally returns
+    future, deadline = None, time.monotonic() + 1.0
+    while future is None and time.monotonic() < deadline:
+        future = wrapped._fetch_x_posts(toolkit, "btc")
+        time.sleep(0.01)
+    assert future is not None
+    assert future.result(timeout=1.0) == ["A late tweet that should never reach the caller"]
@@ -1,38 +1,112 @@
+import requests
+from requests.adapters import HTTPAdapter
+
 from tools.news import FinanceNewsAnalystAgent
+from tools.news_index import NewsIndex
+from tools.newstool import NewsAggregator
 from tools.fundamentals import FundamentalAnalystAgent
 from tools.sentiment import RedditSentimentScraper
 from tools.technical import TechnicalAnalystAgent
+from tools.x_tool import TwitterSentimentScraper
+from toolkit.metrics import MeteredSession, record_cache
 
-# Import wrapped tools and the global reference
+# Import wrapped tools; they resolve their toolkit from the run config
 from toolkit.crypto_tools_wrapped import (
     get_crypto_news,
     get_crypto_fundamentals,
     get_crypto_technicals,
     get_reddit_sentiment_posts,
-    TOOLKIT_REF,
 )
 
 
+def http_session(pool_size=16):
+    """A requests.Session with a keep-alive connection pool of `pool_size` per host."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 class MyCryptoToolKit:
+    """
+    One tool context: API keys, clients, caches and an HTTP connection pool.
+    Tools run against the toolkit in config["configurable"]["toolkit"] (see
+    `runnable_config`), so several toolkits can serve concurrent runs in one process;
+    pass the same `session` to several toolkits to share a pool deliberately.
+    config["configurable"]["point_in_time"] with a past "trade_date" makes the tools return
+    point-in-time data.
+    """
+
     def __init__(
-        self, cryptopanic_key, coingecko_key, reddit_id, reddit_secret, reddit_agent
+        self,
+        cryptopanic_key,
+        coingecko_key,
+        reddit_id,
+        reddit_secret,
+        reddit_agent,
+        x_scraper=None,
+        news_refresh_interval=300,
+        news_background_refresh=False,
+        use_news_aggregator=False,
+        news_feeds=None,
+        session=None,
+        history=None,
     ):
+        self.session = session if session is not None else http_session()
+        self.history = history  # HistoryCache for point-in-time (backtest) data; None = no caching
+
         # Create agent instances
-        self.news_agent = FinanceNewsAnalystAgent(cryptopanic_key)
-        self.fundamental_agent = FundamentalAnalystAgent(coingecko_key)
-        self.technical_agent = TechnicalAnalystAgent(coingecko_key)
+        # Clients get metered views of the shared pool; tools/ never imports the metrics
+        self.news_agent = FinanceNewsAnalystAgent(
+            cryptopanic_key, session=MeteredSession(self.session, "cryptopanic")
+        )
+        self.news_index = NewsIndex(
+            self.news_agent, refresh_interval=news_refresh_interval, record_cache=record_cache
+        )
+        if news_background_refresh:
+            # Keep the index warm between runs; close() stops the thread
+            self.news_index.start()
+        # Optional multi-source news (CryptoPanic + RSS/Atom feeds)
+        self.news_aggregator = (
+            NewsAggregator(
+                cryptopanic=self.news_index.get_news,
+                feeds=news_feeds,
+                session=MeteredSession(self.session, "rss"),
+                record_cache=record_cache,
+            )
+            if use_news_aggregator
+            else None
+        )
+        self.fundamental_agent = FundamentalAnalystAgent(
+            coingecko_key, session=MeteredSession(self.session, "coingecko"), history=history
+        )
+        self.technical_agent = TechnicalAnalystAgent(
+            coingecko_key,
+            session=MeteredSession(self.session, "coingecko"),
+            history=history,
+            record_cache=record_cache,
+        )
         self.reddit_scraper = RedditSentimentScraper(
             reddit_id, reddit_secret, reddit_agent
         )
-
-        # Inject them into global context for tools
-        TOOLKIT_REF["news_agent"] = self.news_agent
-        TOOLKIT_REF["fundamental_agent"] = self.fundamental_agent
-        TOOLKIT_REF["technical_agent"] = self.technical_agent
-        TOOLKIT_REF["reddit_scraper"] = self.reddit_scraper
+        # Any object with get_cleaned_posts(coin, limit=, timeout=) works (e.g. a stub in tests)
+        self.x_scraper = (
+            x_scraper if x_scraper is not None else TwitterSentimentScraper(record_cache=record_cache)
+        )
 
         # Expose tools
         self.get_crypto_news = get_crypto_news
         self.get_crypto_fundamentals = get_crypto_fundamentals
         self.get_crypto_technicals = get_crypto_technicals
         self.get_reddit_sentiment_posts = get_reddit_sentiment_posts
+
+    def runnable_config(self, config=None) -> dict:
+        """`config` with this toolkit set as the tool context for the run."""
+        config = dict(config or {})
+        config["configurable"] = dict(config.get("configurable") or {}, toolkit=self)
+        return config
+
+    def close(self):
+        self.news_index.stop()
+        self.session.close()
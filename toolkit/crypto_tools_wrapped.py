@@ -1,9 +1,61 @@
 from pydantic import BaseModel
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
-import json
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from contextvars import copy_context
+from tools.news import COIN_SYMBOL_MAP
+from tools.sentiment import merge_posts
+from tools.sentiment_lexicon import prescore_posts, format_index_header
+from toolkit.serialization import encode_tool_result, encode_posts
+from toolkit.metrics import timed, record_tool
+from toolkit.singleflight import SingleFlight
+from toolkit.hedging import TOOL_HEDGERS
+from toolkit.history_cache import as_of_date
+from tools.newstool import PUBLISHED_FORMAT
 
-# Global reference to shared tool instances (agents/scrapers)
-TOOLKIT_REF = {}
+# Posts fetched per subreddit; all are scored locally, only the top-k reach the LLM
+REDDIT_FETCH_LIMIT = 50
+SENTIMENT_TOP_K = 20
+
+# X is a best-effort second source: hard item and wall-clock budgets
+X_ITEM_BUDGET = 100
+X_TIME_BUDGET = 8.0
+
+NO_POSTS = "No recent posts found for this coin."
+
+# X scrapes run on daemon threads the caller can abandon; snscrape has no request
+# timeout, so a hung scrape is left behind rather than blocking a shared worker.
+# At most this many may be in flight; past that, X is skipped until one finishes.
+X_MAX_INFLIGHT = 4
+_x_slots = threading.BoundedSemaphore(X_MAX_INFLIGHT)
+
+
+# Identical concurrent tool calls (same toolkit, tool and coin) share one upstream fetch
+_tool_flight = SingleFlight("tool")
+
+
+def toolkit_from(config):
+    """
+    The MyCryptoToolKit a tool call runs against, from config["configurable"]["toolkit"].
+    Each toolkit owns its clients, caches and HTTP pool, so runs with different
+    toolkits never share state.
+    """
+    toolkit = ((config or {}).get("configurable") or {}).get("toolkit")
+    if toolkit is None:
+        raise ValueError("No toolkit in config['configurable']['toolkit']")
+    return toolkit
+
+
+def as_of_from(config):
+    """
+    The run's point-in-time date from config["configurable"] (None = live): its
+    "trade_date", only when "point_in_time" is set.
+    """
+    configurable = (config or {}).get("configurable") or {}
+    return as_of_date(configurable.get("trade_date"), configurable.get("point_in_time"))
 
 
 # Input schema for all tools
@@ -12,31 +64,152 @@ class CoinInput(BaseModel):
 
 
 @tool(args_schema=CoinInput)
-def get_crypto_news(coin: str) -> str:
+def get_crypto_news(coin: str, config: RunnableConfig) -> str:
     """Return recent news articles related to a cryptocurrency coin."""
-    news = TOOLKIT_REF["news_agent"].fetch_news(currencies=coin)
-    return json.dumps(news, indent=2)
+    toolkit, as_of = toolkit_from(config), as_of_from(config)
+    with timed(record_tool, "get_crypto_news"):
+        return _tool_flight.do(
+            ("get_crypto_news", id(toolkit), coin.lower(), as_of),
+            TOOL_HEDGERS["get_crypto_news"].call,
+            _news,
+            toolkit,
+            coin,
+            as_of,
+        )
+
+
+def _news(toolkit, coin: str, as_of=None) -> str:
+    if toolkit.news_aggregator is not None:
+        news = toolkit.news_aggregator.fetch(coin)
+    else:
+        news = toolkit.news_index.get_news(coin)
+    if as_of is not None and isinstance(news, list):
+        # No archive to query: keep only what had been published by the trade date
+        news = [
+            item for item in news
+            if datetime.strptime(item["Published"], PUBLISHED_FORMAT).date() <= as_of
+        ] or {"error": f"No news for {coin} published by {as_of.isoformat()}"}
+    return encode_tool_result("get_crypto_news", news)
 
 
 @tool(args_schema=CoinInput)
-def get_crypto_fundamentals(coin: str) -> str:
+def get_crypto_fundamentals(coin: str, config: RunnableConfig) -> str:
     """Fetch raw fundamental data for a cryptocurrency coin."""
-    data = TOOLKIT_REF["fundamental_agent"].fetch_data(coin)
-    return json.dumps(data, indent=2)
+    toolkit, as_of = toolkit_from(config), as_of_from(config)
+    with timed(record_tool, "get_crypto_fundamentals"):
+        return _tool_flight.do(
+            ("get_crypto_fundamentals", id(toolkit), coin.lower(), as_of),
+            TOOL_HEDGERS["get_crypto_fundamentals"].call,
+            _fundamentals,
+            toolkit,
+            coin,
+            as_of,
+        )
+
+
+def _fundamentals(toolkit, coin: str, as_of=None) -> str:
+    data = toolkit.fundamental_agent.fetch_data(coin, as_of=as_of)
+    return encode_tool_result("get_crypto_fundamentals", data)
 
 
 @tool(args_schema=CoinInput)
-def get_crypto_technicals(coin: str) -> str:
+def get_crypto_technicals(coin: str, config: RunnableConfig) -> str:
     """Return technical indicators (RSI, MACD, Bollinger Bands) for a cryptocurrency coin."""
-    df = TOOLKIT_REF["technical_agent"].fetch_ohlc_data(coin)
+    toolkit, as_of = toolkit_from(config), as_of_from(config)
+    with timed(record_tool, "get_crypto_technicals"):
+        return _tool_flight.do(
+            ("get_crypto_technicals", id(toolkit), coin.lower(), as_of),
+            TOOL_HEDGERS["get_crypto_technicals"].call,
+            _technicals,
+            toolkit,
+            coin,
+            as_of,
+        )
+
+
+def _technicals(toolkit, coin: str, as_of=None) -> str:
+    df = toolkit.technical_agent.fetch_ohlc_data(coin, as_of=as_of)
     if isinstance(df, dict) and "error" in df:
-        return json.dumps(df)
-    indicators = TOOLKIT_REF["technical_agent"].compute_indicators(df)
-    return json.dumps(indicators, indent=2)
+        return encode_tool_result("get_crypto_technicals", df)
+    indicators = toolkit.technical_agent.compute_indicators(df)
+    return encode_tool_result("get_crypto_technicals", indicators)
 
 
-@tool(args_schema=CoinInput)
-def get_reddit_sentiment_posts(coin: str) -> str:
-    """Fetch cleaned Reddit posts about a cryptocurrency for sentiment analysis."""
-    cleaned_posts = TOOLKIT_REF["reddit_scraper"].get_cleaned_posts(coin)
-    return "\n\n".join(cleaned_posts[:20])
+def _fetch_x_posts(toolkit, coin: str):
+    """
+    Start the X scrape on a daemon thread; returns a future, or None if no scraper is
+    configured or every slot is held by a scrape that has not returned.
+    """
+    x_scraper = toolkit.x_scraper
+    if x_scraper is None:
+        return None
+    if not _x_slots.acquire(blocking=False):
+        print("[ERROR] X scrapes still running past their budget; skipping X posts")
+        return None
+
+    future = Future()
+    future.set_running_or_notify_cancel()
+
+    def run():
+        try:
+            future.set_result(
+                x_scraper.get_cleaned_posts(coin, limit=X_ITEM_BUDGET, timeout=X_TIME_BUDGET)
+            )
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            _x_slots.release()
+
+    # copy_context keeps the X fetch in this run's metrics trace
+    ctx = copy_context()
+    threading.Thread(target=ctx.run, args=(run,), name="x-scrape", daemon=True).start()
+    return future
+
+
+# The aggregate index dict travels as the ToolMessage artifact, so the agent reads the
+# exact numbers; only the LLM-facing text rounds them
+@tool(args_schema=CoinInput, response_format="content_and_artifact")
+def get_reddit_sentiment_posts(coin: str, config: RunnableConfig) -> tuple:
+    """Fetch cleaned Reddit and X posts about a cryptocurrency for sentiment analysis."""
+    toolkit = toolkit_from(config)
+    if as_of_from(config) is not None:
+        # Reddit and X only serve current posts; past runs get none rather than look-ahead
+        return NO_POSTS, None
+    with timed(record_tool, "get_reddit_sentiment_posts"):
+        return _tool_flight.do(
+            ("get_reddit_sentiment_posts", id(toolkit), coin.lower()),
+            _collect_social_posts,
+            toolkit,
+            coin,
+        )
+
+
+def _collect_social_posts(toolkit, coin: str) -> tuple:
+    """(tool output text, aggregate sentiment index dict or None)."""
+    deadline = time.monotonic() + X_TIME_BUDGET
+    x_future = _fetch_x_posts(toolkit, coin)
+
+    reddit_posts = toolkit.reddit_scraper.get_cleaned_posts(
+        coin, limit=REDDIT_FETCH_LIMIT
+    )
+
+    x_posts = []
+    if x_future is not None:
+        try:
+            # The budget is enforced here, whatever the scrape itself does
+            x_posts = x_future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except Exception as e:
+            # Timed out (the scrape is abandoned) or failed: carry on with Reddit alone
+            print(f"[ERROR] X posts unavailable: {e!r}")
+
+    cleaned_posts = merge_posts(
+        [p for p in reddit_posts if p != NO_POSTS],
+        [p for p in x_posts if p != "No recent tweets found for this coin."],
+    )
+    if not cleaned_posts:
+        return NO_POSTS, None
+
+    coin_terms = [coin, COIN_SYMBOL_MAP.get(coin.lower(), "")]
+    scored = prescore_posts(cleaned_posts, k=SENTIMENT_TOP_K, coin_terms=coin_terms)
+    index = {k: v for k, v in scored.items() if k != "selected"}
+    return encode_posts(format_index_header(scored), scored["selected"]), index
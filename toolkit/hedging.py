@@ -0,0 +1,173 @@
+# toolkit/hedging.py
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextvars import copy_context
+
+from toolkit.metrics import REGISTRY
+
+_HEDGERS = []
+
+
+class Hedger:
+    """
+    Hedged requests: if a call has not finished by the `percentile` of this hedger's
+    recent latencies, fire one duplicate and return whichever finishes first.
+
+    `budget` is the long-run fraction of calls allowed to hedge (token bucket, at most
+    `max_burst` back to back), so upstream quota use stays bounded. The loser is
+    cancelled if it has not started; a running loser finishes in the background and
+    its result is discarded. Disabled until `configure_hedging(enabled=True)`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        percentile: float = 0.95,
+        min_delay: float = 0.25,
+        min_samples: int = 20,
+        budget: float = 0.05,
+        max_burst: float = 3.0,
+        window: int = 200,
+        max_workers: int = 8,
+    ):
+        self.name = name
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.budget = budget
+        self.max_burst = max_burst
+        self.max_workers = max_workers
+        self.enabled = False
+
+        self._latencies = deque(maxlen=window)  # per attempt, successful only
+        self._observed = deque(maxlen=window)  # per call, as seen by the caller
+        self._credits = max_burst
+        self._calls = self._hedged = self._hedge_wins = self._skipped = 0
+        self._pool = None
+        self._lock = threading.Lock()
+        _HEDGERS.append(self)
+
+    def _delay(self):
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return max(self.min_delay, ordered[index])
+
+    def _take_credit(self) -> bool:
+        with self._lock:
+            if self._credits >= 1:
+                self._credits -= 1
+                self._hedged += 1
+                return True
+            self._skipped += 1
+            return False
+
+    def _submit(self, fn, args, kwargs):
+        start = time.perf_counter()
+
+        def _done(future):
+            if not future.cancelled() and future.exception() is None:
+                with self._lock:
+                    self._latencies.append(time.perf_counter() - start)
+
+        # copy_context keeps both attempts in the caller's metrics trace
+        future = self._pool.submit(copy_context().run, fn, *args, **kwargs)
+        future.add_done_callback(_done)
+        return future
+
+    def call(self, fn, *args, **kwargs):
+        if not self.enabled:
+            return fn(*args, **kwargs)
+
+        start = time.perf_counter()
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=f"hedge-{self.name}"
+                )
+            self._calls += 1
+            self._credits = min(self.max_burst, self._credits + self.budget)
+
+        primary = self._submit(fn, args, kwargs)
+        futures = [primary]
+        try:
+            delay = self._delay()
+            if delay is not None:
+                try:
+                    return primary.result(timeout=delay)
+                except FutureTimeout:
+                    # It may have finished just after the wait timed out
+                    if primary.done():
+                        return primary.result()
+                if self._take_credit():
+                    REGISTRY.inc("neutrofi_hedge_total", hedger=self.name, outcome="fired")
+                    futures.append(self._submit(fn, args, kwargs))
+                else:
+                    REGISTRY.inc("neutrofi_hedge_total", hedger=self.name, outcome="budget_exhausted")
+
+            pending, error = set(futures), None
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        error = future.exception()
+                        continue
+                    for loser in pending:
+                        loser.cancel()
+                    if future is not primary:
+                        REGISTRY.inc("neutrofi_hedge_total", hedger=self.name, outcome="won")
+                        with self._lock:
+                            self._hedge_wins += 1
+                    return future.result()
+            raise error
+        finally:
+            elapsed = time.perf_counter() - start
+            REGISTRY.observe("neutrofi_hedge_call_seconds", elapsed, hedger=self.name)
+            with self._lock:
+                self._observed.append(elapsed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            observed = sorted(self._observed)
+            calls, hedged = self._calls, self._hedged
+
+        def pct(p):
+            return round(observed[min(len(observed) - 1, int(p * len(observed)))], 3) if observed else None
+
+        return {
+            "calls": calls,
+            "hedged": hedged,
+            "hedge_rate": round(hedged / calls, 4) if calls else 0.0,
+            "hedge_wins": self._hedge_wins,
+            "budget_exhausted": self._skipped,
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "p99": pct(0.99),
+        }
+
+
+def configure_hedging(enabled=True, percentile=None, budget=None):
+    """Switch hedging on or off for every hedger, optionally overriding trigger and budget."""
+    for hedger in _HEDGERS:
+        hedger.enabled = enabled
+        if percentile is not None:
+            hedger.percentile = percentile
+        if budget is not None:
+            hedger.budget = budget
+
+
+def hedging_stats() -> dict:
+    return {h.name: h.stats() for h in _HEDGERS if h.enabled}
+
+
+# LLM chains (agents/*) and the CoinGecko/news-backed data tools
+LLM_HEDGER = Hedger("llm", min_delay=1.0)
+TOOL_HEDGERS = {
+    name: Hedger(name)
+    for name in ("get_crypto_news", "get_crypto_fundamentals", "get_crypto_technicals")
+}
@@ -0,0 +1,78 @@
+# toolkit/history_cache.py
+import json
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from toolkit.metrics import record_cache
+
+DEFAULT_HISTORY_PATH = ".neutrofi_cache/history.sqlite"
+
+# Data ending less than this long ago may still be revised upstream; it is never cached
+SETTLED_AFTER = 86400
+
+
+def as_of_date(trade_date, point_in_time):
+    """
+    The point-in-time date for a run: `trade_date` as a date if the run asked for
+    point-in-time data and the date is before today (UTC); None means live data.
+    """
+    if not point_in_time or not trade_date:
+        return None
+    try:
+        day = datetime.strptime(str(trade_date), "%Y-%m-%d").date()
+    except ValueError:
+        return None
+    return day if day < datetime.now(timezone.utc).date() else None
+
+
+def end_of_day(day: date) -> float:
+    """Unix timestamp of the last second of `day` (UTC)."""
+    return datetime(day.year, day.month, day.day, 23, 59, 59, tzinfo=timezone.utc).timestamp()
+
+
+class HistoryCache:
+    """
+    Upstream responses for settled, point-in-time queries (price ranges, daily snapshots),
+    kept in SQLite with no expiry: history does not change, so a repeated backtest reads
+    everything from disk. Error payloads are never stored.
+    """
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS history (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+
+    def get_or_fetch(self, key: str, fetch, settled_at: float):
+        """
+        The cached value for `key`, else `fetch()`. The result is stored only if the data
+        ends at `settled_at` (unix time) at least SETTLED_AFTER ago and is not an error.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM history WHERE key = ?", (key,)).fetchone()
+        record_cache("history", row is not None)
+        if row is not None:
+            return json.loads(row[0])
+
+        value = fetch()
+        settled = settled_at <= time.time() - SETTLED_AFTER
+        if settled and not (isinstance(value, dict) and "error" in value):
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO history VALUES (?, ?, ?)",
+                    (key, json.dumps(value), time.time()),
+                )
+        return value
@@ -0,0 +1,132 @@
+# toolkit/jobs.py
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from toolkit.metrics import REGISTRY
+
+ACTIVE = ("queued", "running")
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when the number of queued + running jobs is at `max_queue`."""
+
+
+class JobManager:
+    """
+    Runs `runner(**kwargs, on_token=..., on_progress=...)` on a bounded thread pool
+    and tracks each run by job id, so a UI can poll progress and pick up the result
+    later (even from a new session). At most `max_workers` jobs run at once and
+    `max_queue` are accepted (queued + running); identical submissions (same `key`)
+    while one is active share its job. Finished jobs are kept for `retention` seconds.
+    """
+
+    def __init__(self, runner, max_workers=2, max_queue=8, retention=3600):
+        self.runner = runner
+        self.max_queue = max_queue
+        self.retention = retention
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._active_keys = {}  # key -> job id while queued/running
+        self._lock = threading.Lock()
+
+    def submit(self, key=None, meta=None, **kwargs) -> str:
+        return self.submit_many([(key, meta, kwargs)])[0]
+
+    def submit_many(self, requests) -> list:
+        """
+        Submit several `(key, meta, kwargs)` jobs all-or-nothing: if the new ones would
+        not fit under `max_queue`, none is queued and JobQueueFull is raised.
+        """
+        with self._lock:
+            self._prune()
+            new = [r for r in requests if r[0] is None or r[0] not in self._active_keys]
+            new_keys = {r[0] for r in new if r[0] is not None}
+            needed = len(new_keys) + sum(1 for r in new if r[0] is None)
+            active = sum(1 for job in self._jobs.values() if job["status"] in ACTIVE)
+            if active + needed > self.max_queue:
+                REGISTRY.inc("neutrofi_jobs_total", needed, outcome="rejected")
+                raise JobQueueFull(f"{active} analyses already queued or running")
+
+            job_ids, started = [], []
+            for key, meta, kwargs in requests:
+                if key is not None and key in self._active_keys:
+                    job_ids.append(self._active_keys[key])
+                    continue
+                job_id = uuid.uuid4().hex[:12]
+                self._jobs[job_id] = {
+                    "id": job_id,
+                    "key": key,
+                    "meta": meta or {},
+                    "status": "queued",
+                    "stage": None,
+                    "progress": 0.0,
+                    "partial": {},  # report_key -> text streamed so far
+                    "events": [],  # {"stage", "progress", "at"} per finished node, in order
+                    "result": None,
+                    "error": None,
+                    "submitted_at": time.time(),
+                    "started_at": None,
+                    "finished_at": None,
+                }
+                if key is not None:
+                    self._active_keys[key] = job_id
+                job_ids.append(job_id)
+                started.append((job_id, kwargs))
+        if started:
+            REGISTRY.inc("neutrofi_jobs_total", len(started), outcome="submitted")
+        for job_id, kwargs in started:
+            self._pool.submit(self._run, job_id, kwargs)
+        return job_ids
+
+    def _run(self, job_id, kwargs):
+        job = self._jobs[job_id]
+
+        def on_token(report_key, text):
+            with self._lock:
+                job["partial"][report_key] = job["partial"].get(report_key, "") + text
+
+        def on_progress(stage, fraction):
+            with self._lock:
+                job["stage"], job["progress"] = stage, fraction
+                job["events"].append({"stage": stage, "progress": fraction, "at": time.time()})
+
+        with self._lock:
+            job["status"], job["started_at"] = "running", time.time()
+        try:
+            result = self.runner(**kwargs, on_token=on_token, on_progress=on_progress)
+            with self._lock:
+                job["status"], job["result"], job["progress"] = "done", result, 1.0
+            REGISTRY.inc("neutrofi_jobs_total", outcome="done")
+        except Exception as e:
+            print(f"[ERROR] Job {job_id} failed: {e}")
+            with self._lock:
+                job["status"], job["error"] = "error", str(e)
+            REGISTRY.inc("neutrofi_jobs_total", outcome="error")
+        finally:
+            with self._lock:
+                job["finished_at"] = time.time()
+                job["partial"] = {}
+                self._active_keys.pop(job["key"], None)
+
+    def get(self, job_id):
+        """A snapshot of the job (safe to read while it runs), or None if unknown/expired."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job, partial=dict(job["partial"]), events=list(job["events"])) if job else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return counts
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        for job_id in [
+            j for j, job in self._jobs.items()
+            if job["finished_at"] is not None and job["finished_at"] < cutoff
+        ]:
+            del self._jobs[job_id]
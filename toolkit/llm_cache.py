@@ -0,0 +1,152 @@
+# toolkit/llm_cache.py
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumpd, load
+from langchain_core._api import LangChainBetaWarning
+
+from toolkit.metrics import record_cache
+
+DEFAULT_CACHE_PATH = ".neutrofi_cache/llm_cache.sqlite"
+
+_bypass = ContextVar("llm_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_llm_cache():
+    """Skip the LLM cache (no lookup, no store) for calls made inside this block."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def _normalise(prompt: str) -> str:
+    return re.sub(r"\s+", " ", prompt).strip()
+
+
+class SQLiteLLMCache(BaseCache):
+    """
+    Exact-match LLM response cache keyed on (model + parameters, normalised prompt).
+    Entries expire after `ttl` seconds; past `max_entries` the least recently used are evicted.
+    Plug in with `ChatGoogleGenerativeAI(..., cache=SQLiteLLMCache())`.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=6 * 3600, max_entries=5000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "saved_input_tokens": 0,
+            "saved_output_tokens": 0,
+        }
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    input_tokens INTEGER DEFAULT 0,
+                    output_tokens INTEGER DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\0{_normalise(prompt)}".encode()).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str):
+        if _bypass.get():
+            return None
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, input_tokens, output_tokens, created_at FROM llm_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None or now - row[3] > self.ttl:
+                if row is not None:
+                    with self._conn:
+                        self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._stats["misses"] += 1
+                record_cache("llm", False)
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+            self._stats["hits"] += 1
+            self._stats["saved_input_tokens"] += row[1]
+            self._stats["saved_output_tokens"] += row[2]
+        record_cache("llm", True)
+        # `load` is marked beta and would warn on every hit
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", LangChainBetaWarning)
+            return [load(g) for g in json.loads(row[0])]
+
+    def update(self, prompt: str, llm_string: str, return_val) -> None:
+        if _bypass.get():
+            return
+        input_tokens = output_tokens = 0
+        for gen in return_val:
+            usage = getattr(getattr(gen, "message", None), "usage_metadata", None) or {}
+            input_tokens += usage.get("input_tokens", 0)
+            output_tokens += usage.get("output_tokens", 0)
+
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self._key(prompt, llm_string),
+                    json.dumps([dumpd(g) for g in return_val]),
+                    input_tokens,
+                    output_tokens,
+                    now,
+                    now,
+                ),
+            )
+            self._evict(now)
+
+    def _evict(self, now):
+        self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+        self._conn.execute(
+            """
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+
+    def clear(self, **kwargs) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        total = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / total, 3) if total else 0.0
+        return stats
+
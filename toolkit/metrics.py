@@ -0,0 +1,307 @@
+# toolkit/metrics.py
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from langchain_core.callbacks import BaseCallbackHandler
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+HELP = {
+    "neutrofi_node_seconds": ("histogram", "Wall time per graph node."),
+    "neutrofi_tool_seconds": ("histogram", "Wall time per tool call."),
+    "neutrofi_llm_seconds": ("histogram", "Latency per LLM call."),
+    "neutrofi_llm_tokens_total": ("counter", "LLM tokens by direction."),
+    "neutrofi_http_seconds": ("histogram", "Latency per upstream HTTP call."),
+    "neutrofi_http_requests_total": ("counter", "Upstream HTTP calls by status code."),
+    "neutrofi_http_response_bytes_total": ("counter", "Upstream HTTP response bytes."),
+    "neutrofi_cache_requests_total": ("counter", "Cache lookups by result."),
+    "neutrofi_runs_total": ("counter", "Pipeline runs."),
+    "neutrofi_singleflight_total": ("counter", "Coalesced calls by role (leader runs, follower waits)."),
+    "neutrofi_hedge_total": ("counter", "Hedged requests by outcome (fired, won, budget_exhausted)."),
+    "neutrofi_hedge_call_seconds": ("histogram", "Caller-observed latency of hedge-eligible calls."),
+    "neutrofi_jobs_total": ("counter", "Background jobs by outcome (submitted, rejected, done, error)."),
+}
+
+
+# === Process-wide counters and histograms ===
+class Registry:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._counters = {}  # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self._histograms.setdefault(key, [0] * (len(self.buckets) + 2))
+            hist[bisect.bisect_left(self.buckets, value)] += 1
+            hist[-2] += value
+            hist[-1] += 1
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+
+        def fmt(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            body = ",".join(f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in pairs)
+            return "{" + body + "}"
+
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: list(v) for k, v in self._histograms.items()}
+
+        lines, described = [], set()
+        for (name, labels), value in sorted(counters.items()):
+            if name not in described:
+                kind, text = HELP.get(name, ("counter", name))
+                lines += [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+                described.add(name)
+            lines.append(f"{name}{fmt(labels)} {value}")
+
+        for (name, labels), hist in sorted(histograms.items()):
+            if name not in described:
+                kind, text = HELP.get(name, ("histogram", name))
+                lines += [f"# HELP {name} {text}", f"# TYPE {name} {kind}"]
+                described.add(name)
+            cumulative = 0
+            for bound, count in zip(list(self.buckets) + ["+Inf"], hist[:-2]):
+                cumulative += count
+                lines.append(f"{name}_bucket{fmt(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_sum{fmt(labels)} {round(hist[-2], 6)}")
+            lines.append(f"{name}_count{fmt(labels)} {hist[-1]}")
+
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# === Per-run trace ===
+class RunTrace:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.nodes = {}
+        self.tools = []
+        self.llm_calls = []
+        self.http_calls = []
+        self.cache = {}
+        self._lock = threading.Lock()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "total_seconds": round(time.perf_counter() - self.started, 3),
+                "nodes": dict(self.nodes),
+                "tools": list(self.tools),
+                "llm_calls": list(self.llm_calls),
+                "llm_tokens": {
+                    "input": sum(c["input_tokens"] for c in self.llm_calls),
+                    "output": sum(c["output_tokens"] for c in self.llm_calls),
+                },
+                "http_calls": list(self.http_calls),
+                "cache": {k: dict(v) for k, v in self.cache.items()},
+            }
+
+    def merge(self, other: dict):
+        """Add another run's trace (a to_dict() snapshot), e.g. an analysis shared with this run."""
+        with self._lock:
+            for node, seconds in other["nodes"].items():
+                self.nodes[node] = round(self.nodes.get(node, 0) + seconds, 3)
+            self.tools.extend(other["tools"])
+            self.llm_calls.extend(other["llm_calls"])
+            self.http_calls.extend(other["http_calls"])
+            for cache, counts in other["cache"].items():
+                mine = self.cache.setdefault(cache, {"hit": 0, "miss": 0})
+                for result, count in counts.items():
+                    mine[result] = mine.get(result, 0) + count
+
+
+_current_trace = ContextVar("neutrofi_run_trace", default=None)
+
+
+@contextmanager
+def trace_run():
+    """Collect a per-run trace for everything recorded in this context."""
+    trace = RunTrace()
+    token = _current_trace.set(trace)
+    REGISTRY.inc("neutrofi_runs_total")
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def _trace_append(attr, entry):
+    trace = _current_trace.get()
+    if trace is not None:
+        with trace._lock:
+            getattr(trace, attr).append(entry)
+
+
+def record_node(node, seconds):
+    REGISTRY.observe("neutrofi_node_seconds", seconds, node=node)
+    trace = _current_trace.get()
+    if trace is not None:
+        with trace._lock:
+            trace.nodes[node] = round(trace.nodes.get(node, 0) + seconds, 3)
+
+
+def record_tool(tool, seconds):
+    REGISTRY.observe("neutrofi_tool_seconds", seconds, tool=tool)
+    _trace_append("tools", {"tool": tool, "seconds": round(seconds, 3)})
+
+
+def record_llm(model, input_tokens, output_tokens, seconds):
+    REGISTRY.observe("neutrofi_llm_seconds", seconds, model=model)
+    REGISTRY.inc("neutrofi_llm_tokens_total", input_tokens, model=model, direction="input")
+    REGISTRY.inc("neutrofi_llm_tokens_total", output_tokens, model=model, direction="output")
+    _trace_append(
+        "llm_calls",
+        {
+            "model": model,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "seconds": round(seconds, 3),
+        },
+    )
+
+
+def record_http(upstream, status, nbytes, seconds):
+    REGISTRY.observe("neutrofi_http_seconds", seconds, upstream=upstream)
+    REGISTRY.inc("neutrofi_http_requests_total", upstream=upstream, status=status)
+    REGISTRY.inc("neutrofi_http_response_bytes_total", nbytes, upstream=upstream)
+    _trace_append(
+        "http_calls",
+        {"upstream": upstream, "status": status, "bytes": nbytes, "seconds": round(seconds, 3)},
+    )
+
+
+def record_cache(cache, hit):
+    result = "hit" if hit else "miss"
+    REGISTRY.inc("neutrofi_cache_requests_total", cache=cache, result=result)
+    trace = _current_trace.get()
+    if trace is not None:
+        with trace._lock:
+            counts = trace.cache.setdefault(cache, {"hit": 0, "miss": 0})
+            counts[result] += 1
+
+
+@contextmanager
+def timed(recorder, name):
+    """`with timed(record_node, "news"):` — time a block and hand the seconds to a recorder."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder(name, time.perf_counter() - start)
+
+
+def http_get(upstream, url, session=None, **kwargs):
+    """requests.get with per-upstream latency, status and byte accounting."""
+    start = time.perf_counter()
+    status = "error"
+    nbytes = 0
+    try:
+        response = (session or requests).get(url, **kwargs)
+        status = response.status_code
+        nbytes = len(response.content or b"")
+        return response
+    finally:
+        record_http(upstream, status, nbytes, time.perf_counter() - start)
+
+
+class MeteredSession:
+    """
+    A view of a requests.Session whose get() goes through `http_get` under one upstream
+    label. The toolkit hands one to each data client, so tools/ only ever sees a session
+    and never imports this module; views share the underlying connection pool.
+    """
+
+    def __init__(self, session, upstream):
+        self.session = session
+        self.upstream = upstream
+
+    def get(self, url, **kwargs):
+        return http_get(self.upstream, url, session=self.session, **kwargs)
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """Records latency and token usage for every chat model call it is attached to."""
+
+    def __init__(self):
+        self._starts = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._starts[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._starts[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        start = self._starts.pop(run_id, None)
+        seconds = time.perf_counter() - start if start else 0.0
+        input_tokens = output_tokens = 0
+        model = "unknown"
+        for generations in response.generations:
+            for gen in generations:
+                message = getattr(gen, "message", None)
+                usage = getattr(message, "usage_metadata", None) or {}
+                input_tokens += usage.get("input_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+                meta = getattr(message, "response_metadata", None) or {}
+                model = meta.get("model_name", model)
+        record_llm(model, input_tokens, output_tokens, seconds)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._starts.pop(run_id, None)
+
+
+# === Prometheus scrape endpoint ===
+_server = None
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1"):
+    """Serve REGISTRY at http://host:port/metrics from a daemon thread (idempotent)."""
+    global _server
+    if _server is not None:
+        return _server
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = REGISTRY.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    try:
+        _server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        print(f"[ERROR] Could not start metrics server on {host}:{port}: {e}")
+        return None
+    threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+    return _server
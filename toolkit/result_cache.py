@@ -0,0 +1,97 @@
+# toolkit/result_cache.py
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from toolkit.metrics import record_cache
+
+
+class ResultCache:
+    """
+    Finished pipeline results shared across sessions, keyed on
+    (coin, trader_position, duration, trade_date).
+    Entries older than `ttl` seconds are stale; memory holds at most `max_entries`
+    (least recently used evicted). With `path`, results also persist in SQLite so
+    they survive restarts and are shared between processes.
+    """
+
+    def __init__(self, ttl=900, max_entries=200, path=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (created_at, result JSON)
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            if path != ":memory:":
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._lock, self._conn:
+                self._conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS results (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL,
+                        created_at REAL NOT NULL
+                    )
+                    """
+                )
+
+    @staticmethod
+    def key(coin, trader_position, duration, trade_date, point_in_time=False) -> str:
+        parts = [coin.strip().lower(), trader_position, duration, trade_date]
+        # Point-in-time and live runs for the same date see different data
+        return "|".join(parts + ["pit"] if point_in_time else parts)
+
+    def get(self, key):
+        """A fresh copy of the cached result, or None if absent or older than the TTL."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT created_at, value FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                entry = tuple(row) if row else None
+            if entry is None or now - entry[0] > self.ttl:
+                self._drop(key)
+                hit = False
+            else:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                self._trim()
+                hit = True
+        record_cache("result", hit)
+        # Stored as JSON so every caller gets its own copy to mutate
+        return json.loads(entry[1]) if hit else None
+
+    def put(self, key, result: dict, created_at=None):
+        entry = (created_at or time.time(), json.dumps(result, default=str))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._trim()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO results VALUES (?, ?, ?)", (key, entry[1], entry[0])
+                    )
+                    self._conn.execute(
+                        "DELETE FROM results WHERE created_at < ?", (time.time() - self.ttl,)
+                    )
+
+    def invalidate(self, key):
+        with self._lock:
+            self._drop(key)
+
+    def _drop(self, key):
+        self._entries.pop(key, None)
+        if self._conn is not None:
+            with self._conn:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+
+    def _trim(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
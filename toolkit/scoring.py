@@ -0,0 +1,170 @@
+# toolkit/scoring.py
+import numpy as np
+
+DAY_MS = 86400 * 1000
+
+# Final actions as a position: Buy/Add long, Hold flat, Sell/Avoid short (or out)
+DECISION_CODES = {"buy": 1.0, "add": 1.0, "hold": 0.0, "sell": -1.0, "avoid": -1.0}
+DECISION_LABELS = {1.0: "Buy", 0.0: "Hold", -1.0: "Sell"}
+
+# Research horizons and the longest forward window (days) each covers, as in the research prompt
+HORIZON_WINDOWS = (("short_term", 14), ("medium_term", 60), ("long_term", float("inf")))
+
+
+def decision_code(decision) -> float:
+    words = str(decision or "").strip().lower().split()
+    return DECISION_CODES.get(words[0], np.nan) if words else np.nan
+
+
+def research_horizon(days) -> str:
+    """The research horizon whose call a forward window of `days` days scores."""
+    return next(key for key, longest in HORIZON_WINDOWS if days <= longest)
+
+
+def decision_matrix(results, coins, dates, horizon="short_term"):
+    """
+    (decisions, confidence), each shaped (len(coins), len(dates)), from the research
+    call for `horizon` in each pipeline result. Cells without a run or call are NaN.
+    """
+    coin_index = {c.strip().lower(): i for i, c in enumerate(coins)}
+    date_index = {d: j for j, d in enumerate(dates)}
+    decisions = np.full((len(coins), len(dates)), np.nan)
+    confidence = np.full_like(decisions, np.nan)
+    for result in results:
+        i = coin_index.get(str(result.get("coin", "")).strip().lower())
+        j = date_index.get(result.get("trade_date"))
+        if i is None or j is None:
+            continue
+        call = (result.get("research") or {}).get(horizon) or {}
+        decisions[i, j] = decision_code(call.get("recommendation"))
+        if call.get("confidence") is not None:
+            confidence[i, j] = float(call["confidence"])
+    return decisions, confidence
+
+
+def horizon_matrices(results, coins, dates, horizons):
+    """
+    (decisions, confidence), each shaped (len(horizons), len(coins), len(dates)): per
+    forward window (days), the calls for the research horizon that covers it.
+    """
+    pairs = [decision_matrix(results, coins, dates, research_horizon(h)) for h in horizons]
+    return np.stack([d for d, _ in pairs]), np.stack([c for _, c in pairs])
+
+
+def price_at(timestamps, prices, when, tolerance=DAY_MS):
+    """
+    Last price at or before each time in `when` (ms, any shape). NaN before the series
+    starts or more than `tolerance` past its last point.
+    """
+    timestamps, prices = np.asarray(timestamps, dtype=float), np.asarray(prices, dtype=float)
+    when = np.asarray(when, dtype=float)
+    idx = np.searchsorted(timestamps, when, side="right") - 1
+    valid = (idx >= 0) & (when <= timestamps[-1] + tolerance)
+    return np.where(valid, prices[np.clip(idx, 0, len(prices) - 1)], np.nan)
+
+
+def forward_returns(series, coins, start_times, horizons):
+    """
+    Simple returns from each start time (ms) to `h` days later, shaped
+    (len(horizons), len(coins), len(start_times)). `series` maps coin -> [[ms, price], ...].
+    """
+    start_times = np.asarray(start_times, dtype=float)
+    horizons = np.asarray(horizons, dtype=float)
+    returns = np.full((len(horizons), len(coins), len(start_times)), np.nan)
+    ends = start_times[None, :] + horizons[:, None] * DAY_MS
+    for i, coin in enumerate(coins):
+        points = np.asarray(series.get(coin) or [], dtype=float)
+        if points.size == 0:
+            continue
+        p0 = price_at(points[:, 0], points[:, 1], start_times)
+        returns[:, i, :] = price_at(points[:, 0], points[:, 1], ends) / p0 - 1.0
+    return returns
+
+
+def hits(decisions, returns, hold_band=0.05):
+    """
+    1.0 where a call was right, 0.0 where wrong, NaN where either side is missing.
+    Buy is right if the price rose, Sell if it fell, Hold if it stayed within ±hold_band.
+    """
+    with np.errstate(invalid="ignore"):
+        hit = np.where(
+            decisions > 0,
+            returns > 0,
+            np.where(decisions < 0, returns < 0, np.abs(returns) <= hold_band),
+        ).astype(float)
+    hit[np.isnan(decisions + returns)] = np.nan
+    return hit
+
+
+def _mean(values):
+    values = values[~np.isnan(values)]
+    return round(float(values.mean()), 4) if values.size else None
+
+
+def calibration(confidence, hit, bins=5) -> dict:
+    """Hit rate per confidence bin, plus Brier score and expected calibration error."""
+    mask = ~np.isnan(confidence + hit)
+    conf, outcome = confidence[mask], hit[mask]
+    if not conf.size:
+        return {"bins": [], "brier": None, "ece": None}
+
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    idx = np.clip(np.digitize(conf, edges[1:-1]), 0, bins - 1)
+    counts = np.bincount(idx, minlength=bins)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_conf = np.bincount(idx, weights=conf, minlength=bins) / counts
+        hit_rate = np.bincount(idx, weights=outcome, minlength=bins) / counts
+    ece = np.nansum(counts / conf.size * np.abs(hit_rate - mean_conf))
+    return {
+        "bins": [
+            {
+                "range": [round(float(edges[b]), 2), round(float(edges[b + 1]), 2)],
+                "count": int(counts[b]),
+                "mean_confidence": round(float(mean_conf[b]), 4),
+                "hit_rate": round(float(hit_rate[b]), 4),
+            }
+            for b in range(bins)
+            if counts[b]
+        ],
+        "brier": round(float(np.mean((conf - outcome) ** 2)), 4),
+        "ece": round(float(ece), 4),
+    }
+
+
+def score(decisions, confidence, returns, horizons, coins, hold_band=0.05, bins=5) -> dict:
+    """
+    Hit rates, mean forward return per call and calibration, per horizon (in days).
+    `decisions` and `confidence` hold one matrix per horizon (see horizon_matrices).
+    """
+    report = {}
+    for k, horizon in enumerate(horizons):
+        fwd, decided = returns[k], decisions[k]
+        hit = hits(decided, fwd, hold_band)
+        scored = ~np.isnan(hit)
+        directional = scored & (decided != 0)
+        by_decision = {}
+        for code, label in DECISION_LABELS.items():
+            cell = scored & (decided == code)
+            if cell.any():
+                by_decision[label] = {
+                    "count": int(cell.sum()),
+                    "hit_rate": _mean(hit[cell]),
+                    "mean_return": _mean(fwd[cell]),
+                }
+        with np.errstate(invalid="ignore"):
+            coin_hits = np.where(scored, hit, 0.0).sum(axis=1) / scored.sum(axis=1)
+        report[f"{horizon}d"] = {
+            "scored": int(scored.sum()),
+            "hit_rate": _mean(hit[scored]),
+            "directional_hit_rate": _mean(hit[directional]),
+            # Mean return of holding each call's position (+1 / 0 / -1) over the horizon
+            "strategy_return": _mean((decided * fwd)[scored]),
+            "by_decision": by_decision,
+            "by_coin": {
+                coin: round(float(rate), 4)
+                for coin, rate in zip(coins, coin_hits)
+                if not np.isnan(rate)
+            },
+            "calibration": calibration(confidence[k], hit, bins),
+        }
+    return report
@@ -0,0 +1,135 @@
+# toolkit/sentiment_store.py
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_STORE_PATH = ".neutrofi_cache/sentiment.sqlite"
+
+# Index moves smaller than this (on the -1..+1 scale) read as "steady"
+TREND_THRESHOLD = 0.05
+
+
+class SentimentStore:
+    """
+    Numeric sentiment aggregates per coin and source ("social", "news") over time:
+    the lexicon index, counts by polarity and volume, one row per analysis.
+    Rows older than `retention_days` are dropped on write.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, retention_days=180):
+        self.retention = retention_days * 86400
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sentiment (
+                    coin TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    recorded_at REAL NOT NULL,
+                    trade_date TEXT,
+                    sentiment_index REAL NOT NULL,
+                    positive INTEGER NOT NULL,
+                    negative INTEGER NOT NULL,
+                    neutral INTEGER NOT NULL,
+                    volume INTEGER NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS sentiment_coin_time ON sentiment (coin, source, recorded_at)"
+            )
+
+    @staticmethod
+    def _coin(coin: str) -> str:
+        return coin.strip().lower()
+
+    def append(self, coin, source, aggregate: dict, trade_date=None, recorded_at=None):
+        """
+        Record one `sentiment_index()`-shaped aggregate. Empty aggregates, and repeats of
+        the coin's latest reading (a rerun over the same cached data), are skipped.
+        """
+        if not aggregate or not aggregate.get("posts"):
+            return
+        now = recorded_at or time.time()
+        row = (
+            self._coin(coin),
+            source,
+            now,
+            trade_date,
+            aggregate["index"],
+            aggregate["positive"],
+            aggregate["negative"],
+            aggregate["neutral"],
+            aggregate["posts"],
+        )
+        try:
+            with self._lock, self._conn:
+                latest = self._conn.execute(
+                    "SELECT sentiment_index, positive, negative, neutral, volume FROM sentiment "
+                    "WHERE coin = ? AND source = ? ORDER BY recorded_at DESC LIMIT 1",
+                    row[:2],
+                ).fetchone()
+                if latest == row[4:]:
+                    return
+                self._conn.execute("INSERT INTO sentiment VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+                self._conn.execute(
+                    "DELETE FROM sentiment WHERE recorded_at < ?", (now - self.retention,)
+                )
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to record {source} sentiment for {coin}: {e}")
+
+    def series(self, coin, source=None, days=30) -> list:
+        """Rows for `coin` over the last `days`, oldest first, as dicts."""
+        query = (
+            "SELECT source, recorded_at, trade_date, sentiment_index, positive, negative, neutral, volume "
+            "FROM sentiment WHERE coin = ? AND recorded_at >= ?"
+        )
+        params = [self._coin(coin), time.time() - days * 86400]
+        if source:
+            query += " AND source = ?"
+            params.append(source)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY recorded_at", params).fetchall()
+        columns = ("source", "recorded_at", "trade_date", "index", "positive", "negative", "neutral", "volume")
+        return [dict(zip(columns, row)) for row in rows]
+
+    def trend(self, coin, source, days=7):
+        """Latest reading vs the mean of the earlier ones in the window (None without history)."""
+        rows = self.series(coin, source, days)
+        if len(rows) < 2:
+            return None
+        latest, earlier = rows[-1], rows[:-1]
+        mean_index = sum(r["index"] for r in earlier) / len(earlier)
+        delta = latest["index"] - mean_index
+        direction = (
+            "improving" if delta > TREND_THRESHOLD
+            else "deteriorating" if delta < -TREND_THRESHOLD
+            else "steady"
+        )
+        return {
+            "latest": latest["index"],
+            "mean": round(mean_index, 4),
+            "delta": round(delta, 4),
+            "direction": direction,
+            "volume": latest["volume"],
+            "mean_volume": round(sum(r["volume"] for r in earlier) / len(earlier), 1),
+            "runs": len(earlier),
+        }
+
+    def trend_summary(self, coin, days=7) -> str:
+        """A few lines describing how social and news sentiment moved over the window."""
+        lines = []
+        for source, label in (("social", "Social"), ("news", "News")):
+            t = self.trend(coin, source, days)
+            if t is None:
+                continue
+            lines.append(
+                f"{label}: index {t['latest']:+.2f} vs {days}-day mean {t['mean']:+.2f} "
+                f"over {t['runs']} earlier runs ({t['direction']}); "
+                f"volume {t['volume']} vs {t['mean_volume']:.0f} average."
+            )
+        return "\n".join(lines) or f"No sentiment history for {coin} yet."
@@ -0,0 +1,75 @@
+# toolkit/serialization.py
+import json
+
+# Approximate prompt-token budget per tool result (Gemini averages ~4 chars per token)
+TOOL_BUDGETS = {
+    "get_crypto_news": 700,
+    "get_crypto_fundamentals": 150,
+    "get_crypto_technicals": 80,
+    "get_reddit_sentiment_posts": 2500,
+}
+
+CHARS_PER_TOKEN = 4
+MAX_HEADLINE_CHARS = 120
+MAX_CATEGORIES = 5
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _compact(data) -> str:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def _trim_fundamentals(data: dict) -> dict:
+    data = dict(data)
+    # Contract addresses per chain are noise for the LLM; the count is the signal
+    platforms = data.pop("Token Platforms", None)
+    if isinstance(platforms, dict):
+        data["Token Platforms Count"] = len([p for p in platforms if p])
+    categories = data.get("Token Categories")
+    if isinstance(categories, list):
+        data["Token Categories"] = categories[:MAX_CATEGORIES]
+    return {k: v for k, v in data.items() if v not in (None, "", [], {})}
+
+
+def _trim_news_item(item: dict) -> dict:
+    # URLs are long and never cited in the report; keep what the analysis uses
+    return {
+        "Title": item.get("Title", "")[:MAX_HEADLINE_CHARS],
+        "Source": item.get("Source", ""),
+        "Published": item.get("Published", ""),
+    }
+
+
+def encode_tool_result(tool_name: str, data) -> str:
+    """Serialize a tool result once, minified, trimmed to the tool's token budget."""
+    if isinstance(data, dict) and "error" in data:
+        return _compact(data)
+
+    if tool_name == "get_crypto_fundamentals" and isinstance(data, dict):
+        data = _trim_fundamentals(data)
+    elif tool_name == "get_crypto_news" and isinstance(data, list):
+        data = [_trim_news_item(item) for item in data]
+
+    budget = TOOL_BUDGETS.get(tool_name)
+    text = _compact(data)
+    # Lists are ranked (newest/strongest first), so drop from the tail until within budget
+    while budget and isinstance(data, list) and len(data) > 1 and estimate_tokens(text) > budget:
+        data = data[:-1]
+        text = _compact(data)
+    return text
+
+
+def encode_posts(header: str, posts: list, tool_name="get_reddit_sentiment_posts") -> str:
+    """Join a header line and ranked posts, dropping the weakest posts past the token budget."""
+    budget = TOOL_BUDGETS.get(tool_name)
+    kept, used = [], estimate_tokens(header)
+    for post in posts:
+        cost = estimate_tokens(post) + 1
+        if budget and kept and used + cost > budget:
+            break
+        kept.append(post)
+        used += cost
+    return "\n\n".join([header] + kept)
@@ -0,0 +1,83 @@
+# toolkit/singleflight.py
+import threading
+
+from toolkit.metrics import REGISTRY
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.listeners = []
+        self.events = []  # everything emitted so far, replayed to callers that join late
+        self.events_lock = threading.Lock()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key: the first caller runs the work,
+    callers arriving while it is in flight wait for and share its result (or exception).
+    Nothing is cached once the call completes.
+
+    Callers may pass a `listener`; whatever the work reports through `emit(key, ...)`
+    reaches every caller's listener, including events from before a follower joined.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, listener=None, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        REGISTRY.inc(
+            "neutrofi_singleflight_total",
+            flight=self.name,
+            role="leader" if leader else "follower",
+        )
+        if listener is not None:
+            with call.events_lock:
+                for event in call.events:
+                    self._deliver(listener, event)
+                call.listeners.append(listener)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def emit(self, key, *event):
+        """Pass `event` to the listeners of the call in flight for `key`, in order."""
+        with self._lock:
+            call = self._calls.get(key)
+        if call is None:
+            return
+        with call.events_lock:
+            call.events.append(event)
+            for listener in call.listeners:
+                self._deliver(listener, event)
+
+    def _deliver(self, listener, event):
+        try:
+            listener(*event)
+        except Exception as e:
+            # One caller's broken listener must not fail the shared work or the other callers
+            print(f"[ERROR] {self.name} flight listener failed: {e}")
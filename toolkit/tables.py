@@ -0,0 +1,136 @@
+# toolkit/tables.py
+import json
+import math
+from datetime import datetime
+
+from tools.sentiment_lexicon import score_post, NEUTRAL_BAND
+
+MAX_HEADLINE_CHARS = 50
+MAX_NEWS_ROWS = 10
+SIGNIFICANT_DIGITS = 6
+
+FUNDAMENTAL_ROWS = [
+    ("Price (USD)", "usd"),
+    ("Market Cap (USD)", "usd"),
+    ("24h Volume (USD)", "usd"),
+    ("Circulating Supply", "number"),
+    ("Total Supply", "number"),
+    ("TVL (USD)", "usd"),
+    ("Exchange Listings Count", "number"),
+    ("Token Platforms Count", "number"),
+]
+
+
+def parse_tool_json(content):
+    """Decode a tool's compact JSON output; None if it is an error or not JSON."""
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        return None
+    if isinstance(data, dict) and "error" in data:
+        return None
+    return data
+
+
+def _significant(value: float, digits=SIGNIFICANT_DIGITS) -> str:
+    """Fixed-point (never exponent) text with `digits` significant figures, trailing zeros dropped."""
+    if value == 0 or not math.isfinite(value):
+        return f"{value:,.2f}"
+    decimals = max(0, digits - 1 - math.floor(math.log10(abs(value))))
+    text = f"{value:,.{decimals}f}"
+    return text.rstrip("0").rstrip(".") if "." in text else text
+
+
+def _fmt(value, kind="number"):
+    if value is None:
+        return "N/A"
+    if isinstance(value, int):
+        text = f"{value:,}"
+        return f"${text}" if kind == "usd" else text
+    if isinstance(value, float):
+        # Large counts read better whole; prices and indicators keep their significant
+        # figures, so sub-dollar prices and small MACD values do not collapse to 0.00
+        text = f"{value:,.0f}" if abs(value) >= 1_000_000 else _significant(value)
+        return f"${text}" if kind == "usd" else text
+    return str(value)
+
+
+def _table(header, rows):
+    lines = [
+        "| " + " | ".join(header) + " |",
+        "|" + "|".join("-" * (len(h) + 2) for h in header) + "|",
+    ]
+    lines += ["| " + " | ".join(str(c).replace("|", "/") for c in row) + " |" for row in rows]
+    return "\n".join(lines)
+
+
+def render_fundamentals_table(data: dict) -> str:
+    rows = [(label, _fmt(data.get(label), kind)) for label, kind in FUNDAMENTAL_ROWS if label in data]
+    categories = data.get("Token Categories")
+    if categories:
+        rows.append(("Categories", ", ".join(categories)))
+    return _table(("Metric", "Value"), rows) if rows else ""
+
+
+def _interpret_technicals(ind: dict) -> dict:
+    notes = {}
+    rsi = ind.get("rsi")
+    if rsi is not None:
+        notes["rsi"] = "Overbought" if rsi >= 70 else "Oversold" if rsi <= 30 else "Neutral"
+    macd, signal = ind.get("macd"), ind.get("macd_signal")
+    if macd is not None and signal is not None:
+        notes["macd"] = "Bullish (above signal)" if macd > signal else "Bearish (below signal)"
+        notes["macd_signal"] = "Signal line"
+    close, lower, upper = ind.get("close"), ind.get("bb_lower"), ind.get("bb_upper")
+    if close is not None and lower is not None and upper is not None:
+        if close > upper:
+            notes["close"] = "Above upper band (stretched)"
+        elif close < lower:
+            notes["close"] = "Below lower band (stretched)"
+        else:
+            notes["close"] = "Inside bands"
+        notes["bb_upper"] = "Resistance"
+        notes["bb_middle"] = "20-period mean"
+        notes["bb_lower"] = "Support"
+    return notes
+
+
+TECHNICAL_LABELS = [
+    ("close", "Close"),
+    ("rsi", "RSI (14)"),
+    ("macd", "MACD"),
+    ("macd_signal", "MACD Signal"),
+    ("bb_upper", "Bollinger Upper"),
+    ("bb_middle", "Bollinger Middle"),
+    ("bb_lower", "Bollinger Lower"),
+]
+
+
+def render_technicals_table(ind: dict) -> str:
+    notes = _interpret_technicals(ind)
+    rows = [
+        (label, _fmt(ind.get(key)), notes.get(key, "—"))
+        for key, label in TECHNICAL_LABELS
+        if key in ind
+    ]
+    return _table(("Indicator", "Value", "Interpretation"), rows) if rows else ""
+
+
+def _news_date(published: str) -> str:
+    try:
+        return datetime.strptime(published, "%b %d %Y %H:%M UTC").strftime("%b %d %Y")
+    except (TypeError, ValueError):
+        return published or ""
+
+
+def render_news_table(news: list) -> str:
+    rows = []
+    for item in news[:MAX_NEWS_ROWS]:
+        title = item.get("Title", "")
+        score = score_post(title)
+        sentiment = (
+            "Positive" if score > NEUTRAL_BAND else "Negative" if score < -NEUTRAL_BAND else "Neutral"
+        )
+        headline = title if len(title) <= MAX_HEADLINE_CHARS else title[: MAX_HEADLINE_CHARS - 1] + "…"
+        rows.append((_news_date(item.get("Published")), headline, sentiment))
+    return _table(("Date", "Headline", "Sentiment"), rows) if rows else ""
@@ -0,0 +1,69 @@
+# tools/downsample.py
+import numpy as np
+
+# Points per chart series sent to the browser, whatever the history length
+CHART_POINTS = 300
+# Precision of the values sent (trims the payload without flattening sub-cent coins)
+SIGNIFICANT_DIGITS = 6
+
+
+def lttb(x, y, threshold: int = CHART_POINTS) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the
+    visual shape of (x, y). The first and last points are always kept; each bucket
+    contributes the point forming the largest triangle with its neighbours.
+    Series at or below the threshold are returned whole.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        # Average of the next bucket (the last point for the final bucket)
+        next_start, next_end = end, min(int((i + 2) * every) + 1, n)
+        if i == threshold - 3:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def round_significant(values, digits: int = SIGNIFICANT_DIGITS) -> np.ndarray:
+    """Round finite values to `digits` significant figures, so sub-cent prices keep their shape."""
+    values = np.asarray(values, dtype=float)
+    magnitude = np.floor(np.log10(np.abs(np.where(values == 0, 1.0, values))))
+    scale = 10.0 ** (digits - 1 - magnitude)
+    return np.round(values * scale) / scale
+
+
+def downsample(x, columns: dict, key: str, threshold: int = CHART_POINTS) -> dict:
+    """
+    Downsample aligned series with LTTB on `columns[key]`; NaN rows (e.g. indicator
+    warm-up) are dropped first. Returns plain lists: {"x": [...], name: [...], ...}.
+    """
+    x = np.asarray(x, dtype=float)
+    arrays = {name: np.asarray(values, dtype=float) for name, values in columns.items()}
+    mask = np.isfinite(arrays[key])
+    for values in arrays.values():
+        mask &= np.isfinite(values)
+    x = x[mask]
+    arrays = {name: values[mask] for name, values in arrays.items()}
+
+    keep = lttb(x, arrays[key], threshold)
+    result = {"x": x[keep].tolist()}
+    result.update({name: round_significant(values[keep]).tolist() for name, values in arrays.items()})
+    return result
@@ -1,9 +1,13 @@
 import requests
 
+from toolkit.history_cache import end_of_day
+
 
 class FundamentalAnalystAgent:
-    def __init__(self, coingecko_api_key: str = None):
+    def __init__(self, coingecko_api_key: str = None, session=None, history=None):
         self.coingecko_api_key = coingecko_api_key
+        self.session = session  # session-like .get() from the owning toolkit (None = plain requests)
+        self.history = history  # HistoryCache for point-in-time snapshots (None = no caching)
         self.base_url = "https://api.coingecko.com/api/v3"
         # Map common coin names to CoinGecko IDs
         self.coin_id_map = {
@@ -48,14 +52,24 @@ class FundamentalAnalystAgent:
             "dot": "polkadot",
         }
 
-    def fetch_data(self, coin_id: str) -> dict:
-        """Return fundamental metrics from CoinGecko."""
+    def fetch_data(self, coin_id: str, as_of=None) -> dict:
+        """Return fundamental metrics from CoinGecko (as of the `as_of` date, if given)."""
         # Normalize coin_id
         coin_id = self.coin_id_map.get(coin_id.lower(), coin_id.lower())
+        if as_of is not None:
+            if self.history is None:
+                return self._fetch_snapshot(coin_id, as_of)
+            return self.history.get_or_fetch(
+                f"coingecko:history:{coin_id}:{as_of.isoformat()}",
+                lambda: self._fetch_snapshot(coin_id, as_of),
+                settled_at=end_of_day(as_of),
+            )
         params = {"localization": "false", "x_cg_demo_api_key": self.coingecko_api_key}
         try:
-            coin_resp = requests.get(f"{self.base_url}/coins/{coin_id}", params=params)
-            tickers_resp = requests.get(
+            coin_resp = (self.session or requests).get(
+                f"{self.base_url}/coins/{coin_id}", params=params
+            )
+            tickers_resp = (self.session or requests).get(
                 f"{self.base_url}/coins/{coin_id}/tickers", params=params
             )
 
@@ -87,3 +101,38 @@ class FundamentalAnalystAgent:
 
         except Exception as e:
             return {"error": f"Failed to fetch data: {str(e)}"}
+
+    def _fetch_snapshot(self, coin_id: str, as_of) -> dict:
+        """
+        Point-in-time metrics from CoinGecko's daily snapshot (00:00 UTC on `as_of`).
+        Supply, TVL and listings have no history there, so they are left out rather
+        than filled with today's values.
+        """
+        params = {
+            "date": as_of.strftime("%d-%m-%Y"),
+            "localization": "false",
+            "x_cg_demo_api_key": self.coingecko_api_key,
+        }
+        try:
+            resp = (self.session or requests).get(
+                f"{self.base_url}/coins/{coin_id}/history",
+                params=params,
+            )
+            if resp.status_code != 200:
+                return {"error": f"Coin history failed: {resp.status_code}"}
+
+            coin_data = resp.json()
+            market_data = coin_data.get("market_data")
+            if not market_data:
+                return {"error": f"No market data for {coin_id} on {as_of.isoformat()}"}
+            return {
+                "Name": coin_data.get("name", "Unknown"),
+                "Symbol": coin_data.get("symbol", "").upper(),
+                "As Of": as_of.isoformat(),
+                "Price (USD)": market_data.get("current_price", {}).get("usd"),
+                "Market Cap (USD)": market_data.get("market_cap", {}).get("usd", 0),
+                "24h Volume (USD)": market_data.get("total_volume", {}).get("usd"),
+            }
+
+        except Exception as e:
+            return {"error": f"Failed to fetch data: {str(e)}"}
@@ -1,4 +1,5 @@
 import requests
+import threading
 from datetime import datetime
 
 # ✅ Mapping coin names to symbols for CryptoPanic
@@ -27,10 +28,79 @@ COIN_SYMBOL_MAP = {
 }
 
 
+def coin_terms(coin: str) -> set:
+    """
+    Lowercase names and symbols a coin goes by, from either side of COIN_SYMBOL_MAP,
+    so "eth" and "ethereum" both give {"eth", "ethereum"}.
+    """
+    coin = coin.strip().lower()
+    symbol = COIN_SYMBOL_MAP.get(coin, coin.upper()).lower()
+    names = {name for name, sym in COIN_SYMBOL_MAP.items() if sym.lower() == symbol}
+    return {coin, symbol} | names
+
+
+def parse_post(post: dict):
+    """Normalise a raw CryptoPanic post to {Title, Source, Published, URL}; None if unusable."""
+    title = post.get("title", "").strip()
+    published = post.get("published_at")
+    url = post.get("url") or post.get("original_url") or "https://cryptopanic.com/"
+    source = (post.get("source") or {}).get("title", "Unknown")
+
+    if not title or not published:
+        return None
+
+    pub_time = datetime.fromisoformat(published.replace("Z", "+00:00")).strftime(
+        "%b %d %Y %H:%M UTC"
+    )
+    return {"Title": title, "Source": source, "Published": pub_time, "URL": url}
+
+
+def post_currencies(post: dict) -> list:
+    """Currency codes a CryptoPanic post is tagged with (v2 'instruments', v1 'currencies')."""
+    tags = post.get("instruments") or post.get("currencies") or []
+    return [t["code"].upper() for t in tags if isinstance(t, dict) and t.get("code")]
+
+
 class FinanceNewsAnalystAgent:
-    def __init__(self, cryptopanic_api_key: str):
+    def __init__(self, cryptopanic_api_key: str, ring_size: int = 50, session=None):
         self.api_key = cryptopanic_api_key
+        self.session = session  # session-like .get() from the owning toolkit (None = plain requests)
         self.base_url = "https://cryptopanic.com/api/developer/v2/posts/"
+        self.ring_size = ring_size
+        # Per-query polling state: ETag, seen ids and a bounded ring of articles
+        self._feeds = {}
+        self._lock = threading.Lock()
+
+    def _feed(self, key):
+        return self._feeds.setdefault(
+            key, {"seen": {}, "ring": [], "etag": None}
+        )
+
+    def _merge(self, feed, results):
+        """Parse only posts not seen before and merge them into the feed's ring (newest first)."""
+        ring = feed["ring"]
+        floor = ring[-1][0] if len(ring) >= self.ring_size else ""
+        fresh = []
+        for post in results:
+            post_id = post.get("id") or post.get("url")
+            published = post.get("published_at") or ""
+            if post_id in feed["seen"] or (floor and published < floor):
+                continue
+            feed["seen"][post_id] = published
+            parsed = parse_post(post)
+            if parsed:
+                fresh.append((published, parsed))
+
+        if not fresh:
+            return
+        ring.extend(fresh)
+        ring.sort(key=lambda item: item[0], reverse=True)
+        del ring[self.ring_size :]
+
+        # Ids below the ring's low-water mark can never re-enter it
+        floor = ring[-1][0]
+        if len(ring) >= self.ring_size:
+            feed["seen"] = {i: p for i, p in feed["seen"].items() if p >= floor}
 
     def fetch_news(self, currencies=None, filter_type="hot", kind="news", public=True):
         """Fetch news articles for specific coin(s) or the whole market."""
@@ -48,40 +118,26 @@ class FinanceNewsAnalystAgent:
             symbol = COIN_SYMBOL_MAP.get(currencies.lower(), currencies.upper())
             params["currencies"] = symbol
 
+        key = (params.get("currencies"), filter_type, kind, public)
+        with self._lock:
+            feed = self._feed(key)
+            etag = feed["etag"]
+
         try:
-            response = requests.get(self.base_url, params=params)
+            # Conditional request: an unchanged feed answers 304 with no body
+            headers = {"If-None-Match": etag} if etag else {}
+            response = (self.session or requests).get(
+                self.base_url, params=params, headers=headers
+            )
 
-            if response.status_code != 200:
+            if response.status_code not in (200, 304):
                 return {"error": f"API Error {response.status_code}: {response.text}"}
 
-            results = response.json().get("results", [])
-            parsed_news = []
-
-            for post in results:
-                title = post.get("title", "").strip()
-                published = post.get("published_at")
-                url = (
-                    post.get("url")
-                    or post.get("original_url")
-                    or "https://cryptopanic.com/"
-                )
-                source = post.get("source", {}).get("title", "Unknown")
-
-                if not title or not published:
-                    continue
-
-                pub_time = datetime.fromisoformat(
-                    published.replace("Z", "+00:00")
-                ).strftime("%b %d %Y %H:%M UTC")
-
-                parsed_news.append(
-                    {
-                        "Title": title,
-                        "Source": source,
-                        "Published": pub_time,
-                        "URL": url,
-                    }
-                )
+            with self._lock:
+                if response.status_code == 200:
+                    feed["etag"] = response.headers.get("ETag")
+                    self._merge(feed, response.json().get("results", []))
+                parsed_news = [parsed for _, parsed in feed["ring"]]
 
             return (
                 parsed_news
@@ -91,3 +147,47 @@ class FinanceNewsAnalystAgent:
 
         except Exception as e:
             return {"error": f"Failed to fetch news: {str(e)}"}
+
+    def fetch_market_posts(
+        self, filter_type="hot", kind="news", pages=3, public=True, since=None
+    ):
+        """
+        Fetch raw posts from the market-wide feed, following `next` pages. On the
+        chronological feed (`filter_type` None or "latest"), paging stops early once a page
+        holds nothing newer than `since` (a published_at cursor).
+        """
+        params = {
+            "auth_token": self.api_key,
+            "kind": kind,
+        }
+        chronological = filter_type in (None, "", "latest")
+        if not chronological:
+            params["filter"] = filter_type
+        if public:
+            params["public"] = "true"
+
+        url = self.base_url
+        posts = []
+        try:
+            for _ in range(pages):
+                response = (self.session or requests).get(url, params=params)
+                if response.status_code != 200:
+                    if not posts:
+                        return {"error": f"API Error {response.status_code}: {response.text}"}
+                    break
+                body = response.json()
+                results = body.get("results", [])
+                posts.extend(results)
+                # Ranked feeds (hot, rising, ...) are not ordered by date, so only the
+                # chronological one can be cut off at the cursor
+                if since and chronological and all((p.get("published_at") or "") <= since for p in results):
+                    break
+                # `next` already carries the query string
+                url, params = body.get("next"), None
+                if not url:
+                    break
+            return posts
+        except Exception as e:
+            if posts:
+                return posts
+            return {"error": f"Failed to fetch market news: {str(e)}"}
@@ -0,0 +1,117 @@
+# tools/news_index.py
+import threading
+import time
+from collections import defaultdict
+
+from tools.news import COIN_SYMBOL_MAP, parse_post, post_currencies
+
+
+class NewsIndex:
+    """
+    Market-wide CryptoPanic feed parsed once and indexed by currency code.
+    `get_news(coin)` is an index lookup; per-coin API calls happen only on a miss.
+    """
+
+    def __init__(self, news_agent, refresh_interval=300, pages=3, max_posts=1000, record_cache=None):
+        self.news_agent = news_agent
+        self.record_cache = record_cache or (lambda cache, hit: None)  # hit/miss hook
+        self.refresh_interval = refresh_interval
+        self.pages = pages
+        self.max_posts = max_posts
+
+        self.posts = {}  # post id -> (published_at, parsed post)
+        self.by_currency = defaultdict(list)  # currency code -> post ids, newest first
+        self.last_refresh = None  # monotonic time of the last pull
+        self.cursor = ""  # newest published_at indexed so far
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    # === Ingestion ===
+    def refresh(self):
+        """Pull the market-wide feed and merge it into the store and index."""
+        raw = self.news_agent.fetch_market_posts(filter_type=None, pages=self.pages, since=self.cursor)
+        if isinstance(raw, dict) and "error" in raw:
+            print(f"[ERROR] News index refresh failed: {raw['error']}")
+            # Back off until the next interval instead of retrying on every lookup
+            self.last_refresh = time.monotonic()
+            return
+
+        with self._lock:
+            try:
+                for post in raw:
+                    post_id = post.get("id")
+                    if post_id is None or post_id in self.posts:
+                        continue
+                    try:
+                        parsed = parse_post(post)
+                    except Exception as e:
+                        print(f"[ERROR] Skipping unparseable news post {post_id}: {e}")
+                        continue
+                    if not parsed:
+                        continue
+                    published = post.get("published_at", "")
+                    self.posts[post_id] = (published, parsed)
+                    self.cursor = max(self.cursor, published)
+                    for code in post_currencies(post):
+                        self.by_currency[code].append(post_id)
+
+                self._evict()
+                for code, ids in self.by_currency.items():
+                    ids.sort(key=lambda i: self.posts[i][0], reverse=True)
+            finally:
+                # A bad batch must not make every lookup retry the refresh
+                self.last_refresh = time.monotonic()
+
+    def _evict(self):
+        if len(self.posts) <= self.max_posts:
+            return
+        by_age = sorted(self.posts, key=lambda i: self.posts[i][0])
+        stale = set(by_age[: len(self.posts) - self.max_posts])
+        for post_id in stale:
+            del self.posts[post_id]
+        for code in list(self.by_currency):
+            ids = [i for i in self.by_currency[code] if i not in stale]
+            if ids:
+                self.by_currency[code] = ids
+            else:
+                del self.by_currency[code]
+
+    def ensure_fresh(self):
+        if (
+            self.last_refresh is not None
+            and time.monotonic() - self.last_refresh < self.refresh_interval
+        ):
+            return
+        # Only one caller refreshes; the rest read the current index
+        if self._refresh_lock.acquire(blocking=False):
+            try:
+                self.refresh()
+            finally:
+                self._refresh_lock.release()
+
+    def start(self):
+        """Refresh in a daemon thread every `refresh_interval` seconds."""
+
+        def loop():
+            while not self._stop.is_set():
+                self.ensure_fresh()
+                self._stop.wait(self.refresh_interval)
+
+        threading.Thread(target=loop, name="news-index", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    # === Lookup ===
+    def get_news(self, coin: str, limit=20):
+        symbol = COIN_SYMBOL_MAP.get(coin.lower(), coin.upper())
+        self.ensure_fresh()
+        with self._lock:
+            ids = self.by_currency.get(symbol, [])[:limit]
+            hits = [self.posts[i][1] for i in ids]
+        self.record_cache("news_index", bool(hits))
+        if hits:
+            return hits
+        # Index miss: coin not covered by the market-wide pull
+        return self.news_agent.fetch_news(currencies=coin)
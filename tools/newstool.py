@@ -0,0 +1,250 @@
+# tools/newstool.py
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextvars import copy_context
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import partial
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+from tools.news import coin_terms
+
+# Market-wide RSS/Atom feeds; override with MyCryptoToolKit(news_feeds=...)
+DEFAULT_FEEDS = {
+    "CoinDesk": "https://www.coindesk.com/arc/outboundfeeds/rss/",
+    "Cointelegraph": "https://cointelegraph.com/rss",
+    "Decrypt": "https://decrypt.co/feed",
+}
+
+PUBLISHED_FORMAT = "%b %d %Y %H:%M UTC"  # same as FinanceNewsAnalystAgent.fetch_news
+
+# An extra outlet covering the same story counts as this many seconds fresher
+COVERAGE_BONUS = 6 * 3600
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_TRACKING_PARAMS = re.compile(r"^(utm_\w+|ref|source|fbclid|gclid|mc_\w+)$", re.IGNORECASE)
+
+
+def canonical_url(url: str) -> str:
+    """Lowercase scheme/host, drop www., tracking params, fragments and trailing slashes."""
+    parts = urlsplit((url or "").strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(
+        [(k, v) for k, v in parse_qsl(parts.query) if not _TRACKING_PARAMS.match(k)]
+    )
+    return urlunsplit(("https", host, parts.path.rstrip("/"), query, ""))
+
+
+def title_fingerprint(title: str) -> str:
+    """Order-insensitive fingerprint of a headline's significant words."""
+    words = re.findall(r"[a-z0-9]+", (title or "").lower())
+    return " ".join(sorted({w for w in words if len(w) > 2}))
+
+
+def _parse_date(text):
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        dt = parsedate_to_datetime(text)  # RSS (RFC 822)
+    except (TypeError, ValueError):
+        try:
+            dt = datetime.fromisoformat(text.replace("Z", "+00:00"))  # Atom (RFC 3339)
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def parse_feed(content: bytes, source: str) -> list:
+    """Parse an RSS 2.0 or Atom document into normalised news items."""
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError as e:
+        print(f"[ERROR] Could not parse feed {source}: {e}")
+        return []
+
+    items = []
+    for node in root.iter("item"):
+        items.append(
+            (
+                node.findtext("title"),
+                node.findtext("link"),
+                node.findtext("pubDate") or node.findtext("{http://purl.org/dc/elements/1.1/}date"),
+            )
+        )
+    for node in root.iter(f"{_ATOM}entry"):
+        # Element truthiness is "has children", so compare against None explicitly
+        link = node.find(f"{_ATOM}link[@rel='alternate']")
+        if link is None:
+            link = node.find(f"{_ATOM}link")
+        items.append(
+            (
+                node.findtext(f"{_ATOM}title"),
+                link.get("href") if link is not None else None,
+                node.findtext(f"{_ATOM}published") or node.findtext(f"{_ATOM}updated"),
+            )
+        )
+
+    parsed = []
+    for title, url, published in items:
+        dt = _parse_date(published)
+        title = (title or "").strip()
+        if not title or not url or dt is None:
+            continue
+        parsed.append(
+            {
+                "Title": title,
+                "Source": source,
+                "Published": dt.strftime(PUBLISHED_FORMAT),
+                "URL": url.strip(),
+                "_ts": dt.timestamp(),
+            }
+        )
+    return parsed
+
+
+def _default_fetcher(url: str, timeout: float, session=None) -> bytes:
+    # Plain paths and file:// URLs make local feed fixtures work without a server
+    if url.startswith("file://"):
+        return Path(url[len("file://") :]).read_bytes()
+    if "://" not in url:
+        return Path(url).read_bytes()
+    response = (session or requests).get(
+        url, timeout=timeout, headers={"accept": "application/xml"}
+    )
+    response.raise_for_status()
+    return response.content
+
+
+class NewsAggregator:
+    """
+    Fetch CryptoPanic plus RSS/Atom feeds concurrently under one deadline,
+    normalise to {Title, Source, Published, URL}, dedupe and rank by recency.
+    Sources that miss the deadline are skipped for this call.
+    """
+
+    def __init__(
+        self,
+        cryptopanic=None,
+        feeds=None,
+        deadline: float = 6.0,
+        feed_ttl: float = 300,
+        max_items: int = 30,
+        fetcher=None,
+        session=None,
+        record_cache=None,
+    ):
+        self.cryptopanic = cryptopanic  # callable coin -> list | {"error": ...}
+        self.feeds = DEFAULT_FEEDS if feeds is None else feeds
+        self.deadline = deadline
+        self.feed_ttl = feed_ttl
+        self.max_items = max_items
+        self.fetcher = fetcher or partial(_default_fetcher, session=session)
+        self.record_cache = record_cache or (lambda cache, hit: None)  # hit/miss hook
+        self._feed_cache = {}  # feed url -> (fetched_at, items)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="newsfeed")
+
+    def _fetch_feed(self, source, url):
+        with self._lock:
+            cached = self._feed_cache.get(url)
+        hit = cached is not None and time.monotonic() - cached[0] < self.feed_ttl
+        self.record_cache("news_feed", hit)
+        if hit:
+            return cached[1]
+        items = parse_feed(self.fetcher(url, self.deadline), source)
+        with self._lock:
+            self._feed_cache[url] = (time.monotonic(), items)
+        return items
+
+    def _fetch_cryptopanic(self, coin):
+        news = self.cryptopanic(coin)
+        if isinstance(news, dict):
+            return []
+        items = []
+        for post in news:
+            try:
+                ts = (
+                    datetime.strptime(post["Published"], PUBLISHED_FORMAT)
+                    .replace(tzinfo=timezone.utc)
+                    .timestamp()
+                )
+            except (KeyError, ValueError):
+                continue
+            items.append({**post, "_ts": ts})
+        return items
+
+    @staticmethod
+    def _mentions(item, terms):
+        title = item["Title"].lower()
+        return any(re.search(rf"\b{re.escape(t)}\b", title) for t in terms)
+
+    def fetch(self, coin: str):
+        terms = coin_terms(coin)
+
+        futures = {}
+        if self.cryptopanic is not None:
+            futures[
+                self._pool.submit(copy_context().run, self._fetch_cryptopanic, coin)
+            ] = "CryptoPanic"
+        for source, url in self.feeds.items():
+            futures[
+                self._pool.submit(copy_context().run, self._fetch_feed, source, url)
+            ] = source
+
+        done, pending = wait(futures, timeout=self.deadline)
+        for future in pending:
+            future.cancel()
+            print(f"[ERROR] News source {futures[future]} missed the deadline")
+
+        items = []
+        for future in done:
+            try:
+                batch = future.result()
+            except Exception as e:
+                print(f"[ERROR] News source {futures[future]} failed: {e}")
+                continue
+            # CryptoPanic is already coin-filtered; RSS feeds are market-wide
+            if futures[future] != "CryptoPanic":
+                batch = [item for item in batch if self._mentions(item, terms)]
+            items.extend(batch)
+
+        ranked = self._dedupe(items)
+        if not ranked:
+            return {"error": f"No news found for {coin}"}
+        return [
+            {k: item[k] for k in ("Title", "Source", "Published", "URL")}
+            for item in ranked[: self.max_items]
+        ]
+
+    @staticmethod
+    def _dedupe(items):
+        """Collapse items sharing a canonical URL or title fingerprint; rank by recency and coverage."""
+        by_url, by_title, stories = {}, {}, []
+        for item in sorted(items, key=lambda i: i["_ts"], reverse=True):
+            url_key = canonical_url(item["URL"])
+            title_key = title_fingerprint(item["Title"])
+            story = by_url.get(url_key) or by_title.get(title_key)
+            if story is None:
+                story = {"item": item, "coverage": 0}
+                stories.append(story)
+            story["coverage"] += 1
+            by_url.setdefault(url_key, story)
+            if title_key:
+                by_title.setdefault(title_key, story)
+
+        stories.sort(
+            key=lambda s: s["item"]["_ts"] + COVERAGE_BONUS * (s["coverage"] - 1),
+            reverse=True,
+        )
+        return [s["item"] for s in stories]
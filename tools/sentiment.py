@@ -3,6 +3,19 @@ import re
 import prawcore
 
 
+def merge_posts(*streams):
+    """Merge post lists from several sources, dropping near-identical duplicates (cross-posts, retweets)."""
+    seen = set()
+    merged = []
+    for posts in streams:
+        for text in posts:
+            key = re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()[:200]
+            if key and key not in seen:
+                seen.add(key)
+                merged.append(text)
+    return merged
+
+
 class RedditSentimentScraper:
     def __init__(self, client_id, client_secret, user_agent):
         try:
@@ -53,7 +66,7 @@ class RedditSentimentScraper:
                 cleaned.append(text)
         return cleaned
 
-    def get_cleaned_posts(self, coin_symbol):
-        posts = self.fetch_posts(coin_symbol)
+    def get_cleaned_posts(self, coin_symbol, limit=10):
+        posts = self.fetch_posts(coin_symbol, limit=limit)
         cleaned = self.clean_posts(posts)
         return cleaned if cleaned else ["No recent posts found for this coin."]
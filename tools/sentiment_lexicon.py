@@ -0,0 +1,255 @@
+# tools/sentiment_lexicon.py
+import math
+import re
+
+# Word-level polarity weights tuned for crypto chatter (roughly -4..+4, VADER-style)
+CRYPTO_LEXICON = {
+    # bullish
+    "bullish": 2.5,
+    "bull": 1.5,
+    "moon": 2.5,
+    "mooning": 3.0,
+    "pump": 1.5,
+    "pumping": 2.0,
+    "rally": 2.0,
+    "breakout": 2.0,
+    "ath": 2.0,
+    "hodl": 1.5,
+    "accumulate": 1.5,
+    "accumulating": 1.5,
+    "undervalued": 2.0,
+    "adoption": 1.5,
+    "approved": 2.0,
+    "approval": 1.5,
+    "etf": 0.5,
+    "inflows": 1.5,
+    "gains": 1.5,
+    "profit": 1.5,
+    "profits": 1.5,
+    "green": 1.0,
+    "surge": 2.0,
+    "soar": 2.0,
+    "soaring": 2.0,
+    "strong": 1.5,
+    "support": 0.5,
+    "upgrade": 1.5,
+    "partnership": 1.5,
+    "wagmi": 2.0,
+    "lfg": 2.0,
+    "gem": 1.5,
+    "good": 1.0,
+    "great": 2.0,
+    "love": 2.0,
+    "optimistic": 2.0,
+    "buy": 0.8,
+    "buying": 0.8,
+    "long": 0.5,
+    "recovery": 1.5,
+    "recover": 1.0,
+    # bearish
+    "bearish": -2.5,
+    "bear": -1.5,
+    "dump": -2.0,
+    "dumping": -2.5,
+    "crash": -3.0,
+    "crashing": -3.0,
+    "rekt": -3.0,
+    "scam": -3.5,
+    "rug": -3.0,
+    "rugged": -3.5,
+    "ponzi": -3.5,
+    "fud": -1.5,
+    "capitulation": -2.5,
+    "liquidated": -2.5,
+    "liquidation": -2.0,
+    "liquidations": -2.0,
+    "hack": -3.0,
+    "hacked": -3.5,
+    "exploit": -3.0,
+    "lawsuit": -2.0,
+    "sec": -0.5,
+    "ban": -2.5,
+    "banned": -2.5,
+    "outflows": -1.5,
+    "losses": -2.0,
+    "loss": -1.5,
+    "red": -1.0,
+    "plunge": -2.5,
+    "plunging": -2.5,
+    "selloff": -2.0,
+    "sell": -0.8,
+    "selling": -0.8,
+    "short": -0.5,
+    "overvalued": -2.0,
+    "bubble": -2.0,
+    "ngmi": -2.0,
+    "weak": -1.5,
+    "fear": -1.5,
+    "panic": -2.5,
+    "bad": -1.5,
+    "terrible": -2.5,
+    "worried": -1.5,
+    "risky": -1.0,
+    "dead": -2.5,
+    "bagholder": -2.0,
+    "bagholders": -2.0,
+}
+
+# Multi-word expressions, matched before tokenisation
+PHRASES = {
+    "to the moon": 3.0,
+    "buy the dip": 1.5,
+    "all time high": 2.0,
+    "higher highs": 1.5,
+    "diamond hands": 1.5,
+    "short squeeze": 1.5,
+    "rug pull": -3.5,
+    "paper hands": -1.0,
+    "lower lows": -1.5,
+    "death cross": -2.0,
+    "golden cross": 2.0,
+    "going to zero": -3.0,
+    "bear market": -1.5,
+    "bull market": 1.5,
+    "not financial advice": 0.0,
+}
+
+EMOJI = {
+    "🚀": 2.0,
+    "🌕": 2.0,
+    "💎": 1.0,
+    "📈": 1.5,
+    "🔥": 1.0,
+    "🟢": 1.0,
+    "📉": -1.5,
+    "🩸": -2.0,
+    "💀": -2.0,
+    "🔴": -1.0,
+    "😱": -1.5,
+}
+
+NEGATIONS = {"not", "no", "never", "isn't", "isnt", "don't", "dont", "won't", "wont", "can't", "cant", "aint", "ain't"}
+
+INTENSIFIERS = {
+    "very": 1.3,
+    "super": 1.4,
+    "extremely": 1.5,
+    "massive": 1.4,
+    "massively": 1.4,
+    "huge": 1.3,
+    "totally": 1.2,
+    "slightly": 0.6,
+    "somewhat": 0.7,
+    "kinda": 0.7,
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+|[^\w\s]", re.UNICODE)
+_PHRASE_RE = re.compile("|".join(re.escape(p) for p in sorted(PHRASES, key=len, reverse=True)))
+
+# Posts scoring inside this band are treated as neutral
+NEUTRAL_BAND = 0.05
+
+
+def _normalize(total: float, alpha: float = 15.0) -> float:
+    """Squash a raw score into [-1, 1] (same normalisation as VADER's compound score)."""
+    return total / math.sqrt(total * total + alpha)
+
+
+def score_post(text: str) -> float:
+    """Return a compound sentiment score in [-1, 1] for a single post."""
+    lowered = text.lower()
+    total = 0.0
+
+    for match in _PHRASE_RE.finditer(lowered):
+        total += PHRASES[match.group(0)]
+    lowered = _PHRASE_RE.sub(" ", lowered)
+
+    for char, weight in EMOJI.items():
+        if char in lowered:
+            total += weight * min(lowered.count(char), 3)
+
+    tokens = _TOKEN_RE.findall(lowered)
+    for i, token in enumerate(tokens):
+        weight = CRYPTO_LEXICON.get(token)
+        if weight is None:
+            continue
+        window = tokens[max(0, i - 3) : i]
+        if any(t in NEGATIONS for t in window):
+            weight *= -0.75
+        if i > 0 and tokens[i - 1] in INTENSIFIERS:
+            weight *= INTENSIFIERS[tokens[i - 1]]
+        total += weight
+
+    # Exclamation marks amplify whatever polarity is already there
+    if total:
+        total *= 1 + min(text.count("!"), 4) * 0.05
+
+    return round(_normalize(total), 4)
+
+
+def _terms(text: str) -> set:
+    return {t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 2}
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def sentiment_index(scores) -> dict:
+    """Aggregate per-post scores into counts by polarity and a mean index in [-1, 1]."""
+    positive = sum(1 for s in scores if s > NEUTRAL_BAND)
+    negative = sum(1 for s in scores if s < -NEUTRAL_BAND)
+    neutral = len(scores) - positive - negative
+    index = round(sum(scores) / len(scores), 4) if scores else 0.0
+    return {
+        "index": index,
+        "positive": positive,
+        "negative": negative,
+        "neutral": neutral,
+        "posts": len(scores),
+    }
+
+
+def select_posts(posts, scores, k=20, coin_terms=None, diversity=0.6):
+    """
+    Pick a diverse, high-signal top-k: strong polarity and on-topic posts first,
+    penalising near-duplicates of posts already chosen (greedy MMR).
+    """
+    coin_terms = {t.lower() for t in (coin_terms or []) if t}
+    candidates = []
+    for text, score in zip(posts, scores):
+        terms = _terms(text)
+        relevance = 1.0 if coin_terms & terms else 0.0
+        signal = abs(score) * (1.0 + relevance) + 0.1 * relevance
+        candidates.append((signal, text, terms))
+
+    selected = []
+    while candidates and len(selected) < k:
+        best_i, best_val = 0, None
+        for i, (signal, _, terms) in enumerate(candidates):
+            overlap = max((_jaccard(terms, s[2]) for s in selected), default=0.0)
+            value = signal - diversity * overlap
+            if best_val is None or value > best_val:
+                best_i, best_val = i, value
+        selected.append(candidates.pop(best_i))
+
+    return [text for _, text, _ in selected]
+
+
+def prescore_posts(posts, k=20, coin_terms=None) -> dict:
+    """Score every post locally and return the aggregate index plus the top-k posts for the LLM."""
+    scores = [score_post(p) for p in posts]
+    result = sentiment_index(scores)
+    result["selected"] = select_posts(posts, scores, k=k, coin_terms=coin_terms)
+    return result
+
+
+def format_index_header(result: dict) -> str:
+    return (
+        f"Sentiment index: {result['index']:+.2f} "
+        f"(positive {result['positive']}, negative {result['negative']}, "
+        f"neutral {result['neutral']}, posts {result['posts']})"
+    )
+
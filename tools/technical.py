@@ -1,11 +1,29 @@
-import requests
+from toolkit.history_cache import end_of_day
+from tools.downsample import CHART_POINTS, downsample
+import threading
+import time
 import pandas as pd
+import requests
 import pandas_ta as ta
 
 
 class TechnicalAnalystAgent:
-    def __init__(self, coingecko_api_key: str = None):
+    def __init__(
+        self,
+        coingecko_api_key: str = None,
+        session=None,
+        ohlc_ttl: float = 300,
+        history=None,
+        record_cache=None,
+    ):
         self.coingecko_api_key = coingecko_api_key
+        self.session = session  # session-like .get() from the owning toolkit (None = plain requests)
+        self.record_cache = record_cache or (lambda cache, hit: None)  # hit/miss hook
+        self.history = history  # HistoryCache for point-in-time price ranges (None = no caching)
+        # The indicator tool and the chart panel read the same series; fetch it once per TTL
+        self.ohlc_ttl = ohlc_ttl
+        self._ohlc_cache = {}  # (coin_id, vs_currency, days, as_of) -> (fetched_at, DataFrame)
+        self._lock = threading.Lock()
         self.base_url = "https://api.coingecko.com/api/v3"
         # Map common coin names to CoinGecko IDs
         self.coin_id_map = {
@@ -21,32 +39,72 @@ class TechnicalAnalystAgent:
             "ada": "cardano",
         }
 
-    def fetch_ohlc_data(self, coin_id="bitcoin", vs_currency="usd", days=30):
-        """Fetch OHLC data from CoinGecko."""
+    def fetch_ohlc_data(self, coin_id="bitcoin", vs_currency="usd", days=30, as_of=None):
+        """
+        Fetch OHLC data from CoinGecko: the last `days` days, or for point-in-time runs the
+        `days` days up to the end of `as_of` (a date). Cached for `ohlc_ttl` seconds;
+        callers get a copy.
+        """
         coin_id = self.coin_id_map.get(coin_id.lower(), coin_id.lower())
-        url = f"{self.base_url}/coins/{coin_id}/market_chart"
-        params = {
-            "vs_currency": vs_currency,
-            "days": days,
-            "x_cg_demo_api_key": self.coingecko_api_key,
-        }
+        key = (coin_id, vs_currency, days, as_of)
+        with self._lock:
+            cached = self._ohlc_cache.get(key)
+        hit = cached is not None and time.monotonic() - cached[0] < self.ohlc_ttl
+        self.record_cache("ohlc", hit)
+        if hit:
+            return cached[1].copy()
+
+        if as_of is None:
+            prices = self._fetch_prices(
+                f"{self.base_url}/coins/{coin_id}/market_chart",
+                {"vs_currency": vs_currency, "days": days},
+            )
+        else:
+            end = end_of_day(as_of)
+            prices = self.price_history(coin_id, end - days * 86400, end, vs_currency)
+        if isinstance(prices, dict):
+            return prices
+
+        df = pd.DataFrame(prices, columns=["timestamp", "close"])
+        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+        df.set_index("timestamp", inplace=True)
+        with self._lock:
+            self._ohlc_cache[key] = (time.monotonic(), df)
+        return df.copy()
+
+    def price_history(self, coin_id, start, end, vs_currency="usd"):
+        """
+        [timestamp_ms, price] pairs between two unix times (hourly up to 90 days, daily
+        beyond), or an error dict. Settled ranges are served from the history cache.
+        """
+        coin_id = self.coin_id_map.get(coin_id.lower(), coin_id.lower())
+        start, end = int(start), int(end)
+
+        def fetch():
+            return self._fetch_prices(
+                f"{self.base_url}/coins/{coin_id}/market_chart/range",
+                {"vs_currency": vs_currency, "from": start, "to": end},
+            )
+
+        if self.history is None:
+            return fetch()
+        return self.history.get_or_fetch(
+            f"coingecko:range:{coin_id}:{vs_currency}:{start}:{end}", fetch, settled_at=end
+        )
+
+    def _fetch_prices(self, url, params):
+        params = dict(params, x_cg_demo_api_key=self.coingecko_api_key)
         headers = {"accept": "application/json"}
 
         try:
-            response = requests.get(url, params=params, headers=headers)
+            response = (self.session or requests).get(url, params=params, headers=headers)
             if response.status_code != 200:
                 return {"error": f"Failed to fetch OHLC: {response.status_code}"}
 
-            data = response.json()
-            prices = data.get("prices", [])
+            prices = response.json().get("prices", [])
             if not prices:
                 return {"error": "No OHLC price data found."}
-
-            df = pd.DataFrame(prices, columns=["timestamp", "close"])
-            df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-            df.set_index("timestamp", inplace=True)
-
-            return df
+            return prices
         except Exception as e:
             return {"error": f"Failed to fetch OHLC data: {str(e)}"}
 
@@ -101,4 +159,35 @@ class TechnicalAnalystAgent:
             return indicators
 
         except Exception as e:
-            return {"error": f"Failed to compute indicators: {str(e)}"}
\ No newline at end of file
+            return {"error": f"Failed to compute indicators: {str(e)}"}
+
+    def chart_series(self, coin_id="bitcoin", points=CHART_POINTS, as_of=None):
+        """
+        Close price with Bollinger Bands, and RSI, for the dashboard chart panel.
+        Each series is LTTB-downsampled to at most `points` points, so the payload
+        stays the same size however long the fetched history is.
+        Timestamps are epoch milliseconds.
+        """
+        df = self.fetch_ohlc_data(coin_id, as_of=as_of)
+        if not isinstance(df, pd.DataFrame):
+            return df
+        try:
+            x = (df.index - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)
+            bb = ta.bbands(df["close"], length=20, std=2)
+            price = downsample(
+                x,
+                {
+                    "close": df["close"],
+                    "bb_upper": bb["BBU_20_2.0"],
+                    "bb_middle": bb["BBM_20_2.0"],
+                    "bb_lower": bb["BBL_20_2.0"],
+                },
+                key="close",
+                threshold=points,
+            )
+            rsi = downsample(
+                x, {"rsi": ta.rsi(df["close"], length=14)}, key="rsi", threshold=points
+            )
+            return {"price": price, "rsi": rsi, "source_points": len(df)}
+        except Exception as e:
+            return {"error": f"Failed to build chart series: {str(e)}"}
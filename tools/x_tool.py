@@ -1,7 +1,13 @@
 # tools/x_tool.py
 import re
+import threading
+import time
 from datetime import datetime, timedelta
-import snscrape.modules.twitter as sntwitter
+
+try:
+    import snscrape.modules.twitter as sntwitter
+except ImportError:  # optional dependency; scraper fails soft without it
+    sntwitter = None
 
 def _clean(text: str) -> str:
     text = re.sub(r"http\S+|www\S+|https\S+", "", text)
@@ -13,7 +19,14 @@ class TwitterSentimentScraper:
     """
     Free Twitter (X) scraper using snscrape. No API key needed.
     Use coin name/symbol and optional since/until window.
+    Results are cached per (query, since, until, limit) for `cache_ttl` seconds.
     """
+    def __init__(self, cache_ttl: float = 900, record_cache=None):
+        self.cache_ttl = cache_ttl
+        self.record_cache = record_cache or (lambda cache, hit: None)  # hit/miss hook
+        self._cache = {}  # (query, since, until, limit) -> (fetched_at, posts)
+        self._lock = threading.Lock()
+
     def fetch_posts(
         self,
         query: str,
@@ -21,7 +34,23 @@ class TwitterSentimentScraper:
         until: str | None = None,  # "YYYY-MM-DD"
         limit: int = 50,
         lang: str | None = "en",
+        timeout: float | None = None,  # hard wall-clock budget in seconds
     ) -> list[str]:
+        if sntwitter is None:
+            print("[ERROR] snscrape is not installed; skipping X posts")
+            return []
+
+        # A smaller earlier fetch must not cap a later, larger one
+        key = (query, since, until, limit)
+        with self._lock:
+            cached = self._cache.get(key)
+        hit = cached is not None and time.monotonic() - cached[0] < self.cache_ttl
+        self.record_cache("x_posts", hit)
+        if hit:
+            return cached[1]
+
+        deadline = time.monotonic() + timeout if timeout else None
+
         # Build snscrape query
         parts = [query]
         if lang: parts.append(f"lang:{lang}")
@@ -30,9 +59,13 @@ class TwitterSentimentScraper:
         q = " ".join(parts)
 
         results = []
+        timed_out = False
         try:
             for i, tweet in enumerate(sntwitter.TwitterSearchScraper(q).get_items()):
                 if i >= limit: break
+                if deadline and time.monotonic() > deadline:
+                    timed_out = True
+                    break
                 # combine full text-like fields
                 content = getattr(tweet, "rawContent", None) or getattr(tweet, "content", "")
                 if content and len(content.strip()) > 20:
@@ -41,6 +74,11 @@ class TwitterSentimentScraper:
             # keep it quiet but fail soft
             print(f"[ERROR] snscrape failed: {e}")
             return []
+
+        # Don't pin a window to a partial result cut short by the time budget
+        if not timed_out:
+            with self._lock:
+                self._cache[key] = (time.monotonic(), results)
         return results
 
     def get_cleaned_posts(
@@ -49,6 +87,7 @@ class TwitterSentimentScraper:
         trade_date: str | None = None,  # "YYYY-MM-DD"
         window_days: int = 7,
         limit: int = 50,
+        timeout: float | None = None,
     ) -> list[str]:
         # Narrow to a recent window around trade_date if provided
         if trade_date:
@@ -62,6 +101,8 @@ class TwitterSentimentScraper:
         since = (d - timedelta(days=window_days)).isoformat()
         until = (d + timedelta(days=1)).isoformat()  # inclusive-ish
 
-        raw = self.fetch_posts(query=coin_symbol_or_name, since=since, until=until, limit=limit)
+        raw = self.fetch_posts(
+            query=coin_symbol_or_name, since=since, until=until, limit=limit, timeout=timeout
+        )
         cleaned = [_clean(t) for t in raw if t]
         return cleaned if cleaned else ["No recent tweets found for this coin."]
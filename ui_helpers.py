@@ -0,0 +1,21 @@
+# ui_helpers.py
+from base64 import b64encode
+from pathlib import Path
+
+import streamlit as st
+
+
+# Static assets are read and encoded once per server process, not on every rerun
+@st.cache_resource(show_spinner=False)
+def embed_image(path: str) -> str:
+    """Local image as a base64 data URI ("" if the file is missing)."""
+    path = Path(path)
+    if path.exists():
+        return f"data:image/png;base64,{b64encode(path.read_bytes()).decode()}"
+    return ""
+
+
+@st.cache_resource(show_spinner=False)
+def load_css(*paths: str) -> str:
+    """The given stylesheets concatenated into one <style> block."""
+    return "<style>" + "\n".join(Path(p).read_text() for p in paths) + "</style>"